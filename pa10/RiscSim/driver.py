@@ -5,10 +5,58 @@ import timingmodel
 import program
 import config
 import machine
+import argparse
+import os
+import shlex
 import sys
 
 if __name__ == '__main__' :
+    parser = argparse.ArgumentParser(description = 'Run a program on the RISC simulator')
+    parser.add_argument('file', help = 'assembly file to run')
+    parser.add_argument('--microc', action = 'store_true', help = 'file is MicroC source: compile it in-process and run the generated code directly')
+    parser.add_argument('--cflags', default = '', help = 'compiler flags for --microc, as given to main.py, e.g. --cflags="-O -fno-inline"')
+    parser.add_argument('--harts', type = int, default = 1, help = 'number of harts sharing memory (default 1)')
+    parser.add_argument('--quantum', type = int, default = 100, help = 'instructions a hart runs before the next hart is scheduled (default 100)')
+    parser.add_argument('--registers', type = int, help = 'number of integer and of floating point registers (default from config.py)')
+    parser.add_argument('--pipeline', action = 'store_true', help = 'time with the pipelined model, where only dependent instructions wait for a latency')
+    parser.add_argument('--stats', action = 'store_true', help = 'print per-hart instruction counts, cycles and heap statistics to stderr')
+    args = parser.parse_args()
+    if (args.cflags != '' and not args.microc) :
+        parser.error('--cflags needs --microc')
+
+    if (args.harts != 1 or args.quantum != 100 or args.registers is not None or args.pipeline) :
+        old = config.machine
+        numIntRegisters = args.registers if args.registers is not None else old.numIntRegisters
+        numFloatRegisters = args.registers if args.registers is not None else old.numFloatRegisters
+        config.machine = machine.Machine(numIntRegisters = numIntRegisters, numFloatRegisters = numFloatRegisters, timingModel = timingmodel.pipelinedTimingModel if args.pipeline else type(old.timingModel),
+                                         numHarts = args.harts, quantum = args.quantum)
+
     p = program.Program()
-    p.buildCodeFromFile(sys.argv[1])
+    if (args.microc) :
+        #the compiler and its generated parser live next to the simulator in pa10
+        pa10 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        sys.path.insert(0, os.path.join(pa10, 'python'))
+        sys.path.insert(0, os.path.join(pa10, 'build', 'python'))
+        from MicroCCompiler.compiler import Compiler
+        from MicroCCompiler.compiler.Options import Options
+
+        #the same flags main.py takes, so the in-process build matches the one being benchmarked
+        options, rest = Options.parse(shlex.split(args.cflags))
+        if (len(rest) > 0) :
+            parser.error('--cflags takes only compiler flags, not ' + ' '.join(rest))
+        co, st = Compiler.compileFile(args.file, options)
+        p.buildCodeFromInstructions(co.getCode(), Compiler.getStringEntries(st))
+    else :
+        p.buildCodeFromFile(args.file)
     
-    config.machine.execProgram(p)
\ No newline at end of file
+    config.machine.execProgram(p)
+
+    if (args.stats) :
+        for h in config.machine.harts :
+            print('hart ' + str(h.hartId) + ': ' + str(h.instructionCount) + ' instructions, ' + str(h.timingModel.getTotalTime()) + ' cycles', file = sys.stderr)
+        if (config.machine.bus is not None) :
+            print('bus contention: ' + str(config.machine.bus.contentionCycles) + ' cycles', file = sys.stderr)
+        if (config.machine.heap.numMallocs > 0) :
+            for k, v in config.machine.heap.stats().items() :
+                print('heap ' + k + ': ' + (('%.3f' % v) if type(v) == float else str(v)), file = sys.stderr)
+        print('total: ' + str(config.machine.getInstructionCount()) + ' instructions, ' + str(config.machine.getTotalTime()) + ' cycles', file = sys.stderr)
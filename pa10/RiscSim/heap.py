@@ -0,0 +1,128 @@
+#size-class allocator for the heap segment
+#small requests are rounded up to a power of two and served from a per-class free list, or carved from a page
+#dedicated to that class; requests bigger than a page get whole pages. Every operation is O(1).
+#Block bookkeeping lives here, not in simulated memory, so programs cannot corrupt it.
+class Heap :
+    def __init__(self, segment, pageSize = 4096, minBlock = 8) :
+        self.base = segment[0]
+        self.limit = segment[1]
+        self.pageSize = pageSize
+        self.minBlock = minBlock
+
+        #power-of-two block sizes from minBlock up to a full page
+        self.sizeClasses = []
+        c = minBlock
+        while (c <= pageSize) :
+            self.sizeClasses.append(c)
+            c *= 2
+
+        self.freeLists = {c : [] for c in self.sizeClasses}
+        self.carve = {c : (0, 0) for c in self.sizeClasses} #next free address and end of the page being carved
+        self.largeFree = {} #page count -> free runs of that many pages
+        self.brk = self.base #start of the next page to hand out; the first one begins at the segment base
+
+        self.blocks = {} #address -> (block size, requested size) for every live block
+
+        self.liveBytes = 0 #bytes requested by live blocks
+        self.allocatedBytes = 0 #bytes reserved by live blocks, including rounding
+        self.peakLiveBytes = 0
+        self.numMallocs = 0
+        self.numFrees = 0
+        self.numFailed = 0
+
+    def malloc(self, size) :
+        assert size >= 0, "Allocating a negative number of bytes"
+
+        if (size > self.pageSize) :
+            blockSize = -(-size // self.pageSize) * self.pageSize
+            addr = self.__allocLarge(blockSize // self.pageSize)
+        else :
+            blockSize = max(self.minBlock, 1 << (size - 1).bit_length()) if size > 0 else self.minBlock
+            addr = self.__allocSmall(blockSize)
+
+        #out of heap: hand back a null pointer like C's malloc
+        if (addr == 0) :
+            self.numFailed += 1
+            return 0
+
+        self.blocks[addr] = (blockSize, size)
+        self.liveBytes += size
+        self.allocatedBytes += blockSize
+        self.peakLiveBytes = max(self.peakLiveBytes, self.liveBytes)
+        self.numMallocs += 1
+        return addr
+
+    def free(self, addr) :
+        #freeing null is a no-op, as in C
+        if (addr == 0) :
+            return
+
+        assert addr in self.blocks, "Freeing an address that is not a live heap block: " + hex(addr)
+        blockSize, size = self.blocks.pop(addr)
+
+        if (blockSize > self.pageSize) :
+            self.largeFree.setdefault(blockSize // self.pageSize, []).append(addr)
+        else :
+            self.freeLists[blockSize].append(addr)
+
+        self.liveBytes -= size
+        self.allocatedBytes -= blockSize
+        self.numFrees += 1
+
+    def __allocSmall(self, blockSize) :
+        freeList = self.freeLists[blockSize]
+        if (len(freeList) > 0) :
+            return freeList.pop()
+
+        nextAddr, end = self.carve[blockSize]
+        if (nextAddr == end) :
+            nextAddr = self.__newPages(1)
+            if (nextAddr == 0) :
+                return 0
+            end = nextAddr + self.pageSize
+
+        self.carve[blockSize] = (nextAddr + blockSize, end)
+        return nextAddr
+
+    def __allocLarge(self, numPages) :
+        runs = self.largeFree.get(numPages)
+        if (runs) :
+            return runs.pop()
+        return self.__newPages(numPages)
+
+    def __newPages(self, numPages) :
+        if (self.brk + numPages * self.pageSize > self.limit) :
+            return 0
+        addr = self.brk
+        self.brk += numPages * self.pageSize
+        return addr
+
+    def stats(self) :
+        footprint = self.brk - self.base
+        #unused space in the heap: free-listed blocks plus the uncarved tails of partially used pages
+        freeBytes = footprint - self.allocatedBytes
+
+        return {
+            'mallocs' : self.numMallocs,
+            'frees' : self.numFrees,
+            'failed' : self.numFailed,
+            'live blocks' : len(self.blocks),
+            'live bytes' : self.liveBytes,
+            'peak live bytes' : self.peakLiveBytes,
+            'allocated bytes' : self.allocatedBytes,
+            'footprint bytes' : footprint,
+            'internal fragmentation' : (self.allocatedBytes - self.liveBytes) / self.allocatedBytes if self.allocatedBytes > 0 else 0.0,
+            'external fragmentation' : freeBytes / footprint if footprint > 0 else 0.0,
+        }
+
+
+if __name__ == '__main__' :
+    heap = Heap((0x40000000, 0x80000000))
+
+    a = heap.malloc(12)
+    b = heap.malloc(12)
+    print(hex(a), hex(b)) #should be 16 bytes apart
+    heap.free(a)
+    print(hex(heap.malloc(9))) #should reuse a
+    print(hex(heap.malloc(10000))) #should start on a fresh page
+    print(heap.stats())
@@ -2,6 +2,7 @@ from util import parseint
 import re
 import timingmodel
 import config
+import registers
 
 #base class for instructions
 class Instruction :
@@ -15,6 +16,18 @@ class Instruction :
     def exec(self) :
         raise NotImplementedError('exec not implemented for ' + self.opcode)
 
+    #build an instruction from already-separated operands instead of parsing text
+    #operands follow the MicroC assembly instruction fields: dest, src1, src2, and label, which holds
+    #whatever is not a register (branch target, immediate, or load/store offset)
+    @classmethod
+    def fromOperands(cls, opcode, dest, src1, src2, label) :
+        raise NotImplementedError('fromOperands not implemented for ' + opcode)
+
+    #registers the instruction reads and writes, for timing models that track dependences
+    #None means the instruction's operands are not described, so it is treated as depending on everything
+    def registers(self) :
+        return None
+
     def __repr__(self) :
         return str(self)
 
@@ -27,6 +40,10 @@ class UInstruction(Instruction) :
         match = re.match(r'(\S+) (\S+), (\S+)', instr)
         return cls(match[2], match[3], match[1])
 
+    @classmethod
+    def fromOperands(cls, opcode, dest, src1, src2, label) :
+        return cls(dest, label, opcode)
+
     def __init__(self, dst, imm, opcode) :
         super().__init__(opcode)
         self.dst = dst
@@ -59,6 +76,9 @@ class UInstruction(Instruction) :
     def funcExec(self, imm) :
         raise NotImplementedError("funcExec not implemented for u-type instruction " + self.opcode)
 
+    def registers(self) :
+        return ([], [self.dst])
+
     def __str__(self) :
         return str(self.opcode + " " + self.dst + " " + str(self.imm))
 
@@ -103,6 +123,10 @@ class ORInstruction(Instruction) :
         match = re.match(r'(\S+) (\S+), (\S+)', instr)
         return cls(match[3], match[2], match[1])
 
+    @classmethod
+    def fromOperands(cls, opcode, dest, src1, src2, label) :
+        return cls(src1, dest, opcode)
+
     def __init__(self, src1, dst, opcode) :
         super().__init__(opcode)
         self.src1 = src1
@@ -134,6 +158,9 @@ class ORInstruction(Instruction) :
     def funcExec(self, s1) :
         raise NotImplementedError("funcExec not implemented for 2-operand r-type instruction " + self.opcode)
 
+    def registers(self) :
+        return ([self.src1], [self.dst])
+
     def __str__(self) :
         return str(self.opcode + " " + self.dst + " " + self.src1)    
 
@@ -165,6 +192,10 @@ class RInstruction(Instruction) :
         match = re.match(r'(\S+) (\S+), (\S+), (\S+)', instr)
         return cls(match[3], match[4], match[2], match[1])
 
+    @classmethod
+    def fromOperands(cls, opcode, dest, src1, src2, label) :
+        return cls(src1, src2, dest, opcode)
+
     def __init__(self, src1, src2, dst, opcode) :
         super().__init__(opcode)
         self.src1 = src1
@@ -201,6 +232,9 @@ class RInstruction(Instruction) :
     def funcExec(self, s1, s2) :
         raise NotImplementedError("funcExec not implemented for r-type instruction " + self.opcode)
 
+    def registers(self) :
+        return ([self.src1, self.src2], [self.dst])
+
     def __str__(self) :
         return str(self.opcode + " " + self.dst + " " + self.src1 + " " + self.src2)
 
@@ -242,6 +276,11 @@ class IInstruction(Instruction) :
     def parse(cls, instr) :
         match = re.match(r'(\S+) (\S+), (\S+), (\S+)', instr)
         return cls(match[3], match[4], match[2], match[1])
+
+    #MicroC keeps the immediate of an i-type instruction in its second source slot
+    @classmethod
+    def fromOperands(cls, opcode, dest, src1, src2, label) :
+        return cls(src1, src2, dest, opcode)
         
     def __init__(self, src1, imm, dst, opcode) :
         super().__init__(opcode)
@@ -270,6 +309,9 @@ class IInstruction(Instruction) :
     def funcExec(self, s1, imm) :
         raise NotImplementedError("funcExec not implemented for i-type instruction " + self.opcode)
 
+    def registers(self) :
+        return ([self.src1], [self.dst])
+
     def __str__(self) :
         # print("here")
         return str(self.opcode + " " + self.dst + " " + self.src1 + " " + self.imm)
@@ -284,6 +326,10 @@ class MemInstruction(Instruction) :
     def parse(cls, instr) :
         match = re.match(r'(\S+) (\S+), (\S+)\((\S+)\)', instr)
         return cls(match[2], match[4], match[3], match[1])
+
+    @classmethod
+    def fromOperands(cls, opcode, dest, src1, src2, label) :
+        return cls(dest, src1, label, opcode)
         
     def __init__(self, reg1, reg2, imm, opcode) :
         super().__init__(opcode)
@@ -325,6 +371,9 @@ class LDInstruction(MemInstruction) :
 
         config.machine.pc += 4
 
+    def registers(self) :
+        return ([self.reg2], [self.reg1])
+
     def funcExec(self, addr, memory) :
         return memory[addr]
 
@@ -353,6 +402,9 @@ class STInstruction(MemInstruction) :
 
         config.machine.pc += 4
 
+    def registers(self) :
+        return ([self.reg1, self.reg2], [])
+
     def funcExec(self, addr, val, memory) :
         # print("updating memory location: " + hex(addr))
         memory[addr] = val
@@ -361,6 +413,220 @@ class STInstruction(MemInstruction) :
     def srctype(self) :
         raise NotImplementedError("Specialize type in derived class")
 
+#base class for atomic memory operations
+class AMOInstruction(Instruction) :
+
+    #AMO reg1, reg2, (reg3) : reg1 = *(reg3); *(reg3) = op(*(reg3), reg2)
+    #harts are interleaved at instruction granularity, so the read-modify-write is atomic
+
+    @classmethod
+    def parse(cls, instr) :
+        match = re.match(r'(\S+) (\S+), (\S+), \((\S+)\)', instr)
+        return cls(match[2], match[3], match[4], match[1])
+
+    def __init__(self, dst, src, addr, opcode) :
+        super().__init__(opcode)
+        self.dst = dst
+        self.src = src
+        self.addr = addr
+
+    def exec(self) :
+        addr = config.machine.registerFile[self.addr].read()
+
+        srcReg = config.machine.registerFile[self.src]
+        assert srcReg.type == int, "Source register is not an integer"
+        val = srcReg.read()
+
+        old = config.machine.memory[addr]
+        assert type(old) == int, "Atomic operations only work on integer memory"
+
+        config.machine.memory[addr] = self.funcExec(old, val)
+
+        destReg = config.machine.registerFile[self.dst]
+        assert destReg.type == int, "Destination register is not an integer"
+        destReg.write(old)
+
+        config.machine.timingModel.cacheExec(self, addr)
+
+        config.machine.pc += 4
+
+    def funcExec(self, old, val) :
+        raise NotImplementedError("funcExec not implemented for atomic instruction " + self.opcode)
+
+    def __str__(self) :
+        return str(self.opcode + " " + self.dst + ", " + self.src + ", (" + self.addr + ")")
+
+#base class for vector instructions
+#vector registers hold numpy arrays; each instruction works on the first vl elements as a whole
+class VInstruction(Instruction) :
+
+    def _checkVectorUnit(self) :
+        assert registers.numpy is not None, "Vector instructions need numpy"
+
+    def _vl(self) :
+        self._checkVectorUnit()
+        return config.machine.registerFile['vl'].read()
+
+    def _readVector(self, name, vl) :
+        reg = config.machine.registerFile[name]
+        assert reg.type == registers.numpy.ndarray, name + " is not a vector register"
+        val = reg.read()
+        assert len(val) >= vl, "Vector register " + name + " holds fewer than vl elements"
+        return val[:vl]
+
+    def _checkKind(self, val) :
+        assert val.dtype.kind == self.kind, "Vector elements are not of type " + str(self.elemtype)
+
+    @property
+    def kind(self) :
+        return 'i' if self.elemtype == int else 'f'
+
+    @property
+    def elemtype(self) :
+        raise NotImplementedError("Define element type in derived class")
+
+#sets vl = min(src, vlmax) and returns it in dst
+class VSetInstruction(VInstruction) :
+
+    @classmethod
+    def parse(cls, instr) :
+        match = re.match(r'(\S+) (\S+), (\S+)', instr)
+        return cls(match[2], match[3], match[1])
+
+    def __init__(self, dst, src1, opcode) :
+        super().__init__(opcode)
+        self.dst = dst
+        self.src1 = src1
+
+    def exec(self) :
+        config.machine.timingModel.exec(self)
+        srcReg = config.machine.registerFile[self.src1]
+        assert srcReg.type == int, "Requested vector length is not an integer"
+        requested = srcReg.read()
+        assert requested >= 0, "Requested vector length is negative"
+
+        self._checkVectorUnit()
+        vl = min(requested, config.machine.vlmax)
+        config.machine.registerFile['vl'].write(vl)
+        config.machine.registerFile[self.dst].write(vl)
+
+        config.machine.pc += 4
+
+    def __str__(self) :
+        return str(self.opcode + " " + self.dst + ", " + self.src1)
+
+#base class for element-wise vector-vector instructions
+#OP vd, vs2, vs1 : vd[i] = vs2[i] op vs1[i]
+class VRInstruction(VInstruction) :
+
+    @classmethod
+    def parse(cls, instr) :
+        match = re.match(r'(\S+) (\S+), (\S+), (\S+)', instr)
+        return cls(match[3], match[4], match[2], match[1])
+
+    def __init__(self, src2, src1, dst, opcode) :
+        super().__init__(opcode)
+        self.src2 = src2
+        self.src1 = src1
+        self.dst = dst
+
+    def exec(self) :
+        vl = self._vl()
+        config.machine.timingModel.vecExec(self, vl)
+
+        a = self._readVector(self.src2, vl)
+        b = self._readVector(self.src1, vl)
+        self._checkKind(a)
+        self._checkKind(b)
+
+        d = self.funcExec(a, b)
+
+        config.machine.registerFile[self.dst].write(d)
+
+        config.machine.pc += 4
+
+    def funcExec(self, a, b) :
+        raise NotImplementedError("funcExec not implemented for vector instruction " + self.opcode)
+
+    def __str__(self) :
+        return str(self.opcode + " " + self.dst + ", " + self.src2 + ", " + self.src1)
+
+class IVRInstruction(VRInstruction) :
+    @property
+    def elemtype(self) :
+        return int
+
+class FVRInstruction(VRInstruction) :
+    @property
+    def elemtype(self) :
+        return float
+
+#base class for reductions
+#OP vd, vs2, vs1 : vd[0] = vs1[0] + sum(vs2[0:vl])
+class VRedInstruction(VRInstruction) :
+
+    def exec(self) :
+        vl = self._vl()
+        config.machine.timingModel.vecExec(self, vl)
+
+        a = self._readVector(self.src2, vl)
+        b = self._readVector(self.src1, 1)
+        self._checkKind(a)
+        self._checkKind(b)
+
+        d = registers.numpy.array([b[0] + a.sum()], dtype = b.dtype)
+
+        config.machine.registerFile[self.dst].write(d)
+
+        config.machine.pc += 4
+
+class IVRedInstruction(VRedInstruction) :
+    @property
+    def elemtype(self) :
+        return int
+
+class FVRedInstruction(VRedInstruction) :
+    @property
+    def elemtype(self) :
+        return float
+
+#base class for unit-stride vector loads and stores
+#VLE32.V vd, (reg) : vd[i] = *(reg + 4 * i)
+#VSE32.V vs, (reg) : *(reg + 4 * i) = vs[i]
+class VMemInstruction(VInstruction) :
+
+    @classmethod
+    def parse(cls, instr) :
+        match = re.match(r'(\S+) (\S+), \((\S+)\)', instr)
+        return cls(match[2], match[3], match[1])
+
+    def __init__(self, vreg, reg, opcode) :
+        super().__init__(opcode)
+        self.vreg = vreg
+        self.reg = reg
+
+    def _calculateAddress(self) :
+        return config.machine.registerFile[self.reg].read()
+
+    def __str__(self) :
+        return str(self.opcode + " " + self.vreg + ", (" + self.reg + ")")
+
+#moves element 0 of a vector register to/from a scalar register
+class VMoveInstruction(VInstruction) :
+
+    @classmethod
+    def parse(cls, instr) :
+        match = re.match(r'(\S+) (\S+), (\S+)', instr)
+        return cls(match[2], match[3], match[1])
+
+    def __init__(self, dst, src1, opcode) :
+        super().__init__(opcode)
+        self.dst = dst
+        self.src1 = src1
+
+    def __str__(self) :
+        return str(self.opcode + " " + self.dst + ", " + self.src1)
+
 #base class for IO magic instructions
 class IOInstruction(Instruction) :
 
@@ -369,6 +635,11 @@ class IOInstruction(Instruction) :
         match = re.match(r'(\S+) (\S+)', instr)
         return cls(match[2], match[1])
 
+    #reads name their register as dest, writes as src1
+    @classmethod
+    def fromOperands(cls, opcode, dest, src1, src2, label) :
+        return cls(dest if dest is not None else src1, opcode)
+
     def __init__(self, reg, opcode) :
         super().__init__(opcode)
         self.reg = reg
@@ -424,6 +695,10 @@ class ImmControlInstruction(Instruction) :
         match = re.match(r'(\S+) (\S+)', instr)
         return cls(match[1], match[2])
 
+    @classmethod
+    def fromOperands(cls, opcode, dest, src1, src2, label) :
+        return cls(opcode, label)
+
     def __init__(self, opcode, label) :
         self.opcode = opcode
         self.label = label
@@ -443,6 +718,10 @@ class BranchInstruction(Instruction) :
         match = re.match(r'(\S+) (\S+), (\S+), (\S+)', instr)
         return cls(match[1], match[2], match[3], match[4])
 
+    @classmethod
+    def fromOperands(cls, opcode, dest, src1, src2, label) :
+        return cls(opcode, src1, src2, label)
+
     def __init__(self, opcode, src1, src2, label) :
         self.opcode = opcode
         self.src1 = src1
@@ -466,6 +745,9 @@ class BranchInstruction(Instruction) :
     def funcExec(self, val1, val2) :
         raise NotImplementedError("Implement funcExec in derived class")
         
+    def registers(self) :
+        return ([self.src1, self.src2], [])
+
     def __str__(self) :
         return str(self.opcode + " " + self.src1 + " " + self.src2 + " " + self.label);
 
@@ -506,6 +788,9 @@ class JalInstruction(Instruction) :
         dstreg.write(config.machine.pc + 4)
         config.machine.pc = config.machine.prog.labels[self.label]
 
+    def registers(self) :
+        return ([], [self.reg])
+
     def __str__(self) :
         return str(self.opcode + " " + self.reg + ", " + self.label)
 
@@ -537,6 +822,10 @@ class RetInstruction(Instruction) :
         match = re.match(r'(\S+)', instr)
         return cls(match[1])
 
+    @classmethod
+    def fromOperands(cls, opcode, dest, src1, src2, label) :
+        return cls(opcode)
+
     def __init__(self, opcode) :
         self.opcode = opcode
         self._jalr = JalrInstruction('x1', 0, 'x0', 'JALR')
@@ -623,6 +912,11 @@ class SrlInstruction(IRInstruction) :
     def funcExec(self, s1, s2) :
         return s1 >> (s2 % 32)        
 
+@concreteInstruction('SRA')
+class SraInstruction(IRInstruction) :
+    def funcExec(self, s1, s2) :
+        return s1 >> (s2 % 32)
+
 @concreteInstruction('ADDI')
 class AddiInstruction(IInstruction) :
     def funcExec(self, s1, imm) :
@@ -651,12 +945,17 @@ class SltiInstruction(IInstruction) :
 @concreteInstruction('SLLI')
 class SlliInstruction(IInstruction) :
     def funcExec(self, s1, imm) :
-        return s1 << (imm % 5)
+        return s1 << (imm % 32)
 
 @concreteInstruction('SRLI')
 class SrliInstruction(IInstruction) :
     def funcExec(self, s1, imm) :
-        return s1 >> (imm % 5)
+        return s1 >> (imm % 32)
+
+@concreteInstruction('SRAI')
+class SraiInstruction(IInstruction) :
+    def funcExec(self, s1, imm) :
+        return s1 >> (imm % 32)
 
 @concreteInstruction('LUI')
 class LuiInstruction(IUInstruction) :
@@ -811,6 +1110,156 @@ class BneInstruction(BranchInstruction) :
     def funcExec(self, val1, val2) :
         return True if val1 != val2 else False
 
+@concreteInstruction('AMOADD.W')
+class AmoaddInstruction(AMOInstruction) :
+    def funcExec(self, old, val) :
+        return old + val
+
+@concreteInstruction('AMOSWAP.W')
+class AmoswapInstruction(AMOInstruction) :
+    def funcExec(self, old, val) :
+        return val
+
+#### Vector instructions -- a small subset of the RISC-V V extension, 32-bit elements only ####
+
+@concreteInstruction('VSETVL')
+class VsetvlInstruction(VSetInstruction) :
+    pass
+
+@concreteInstruction('VLE32.V')
+class Vle32Instruction(VMemInstruction) :
+    def exec(self) :
+        vl = self._vl()
+        addr = self._calculateAddress()
+
+        vals = config.machine.memory.readRange(addr, vl)
+        assert all(type(v) == type(vals[0]) for v in vals), "Vector load from memory holding mixed types"
+        assert (vl == 0 or type(vals[0]) in (int, float)), "Vector load from memory that does not hold numbers"
+
+        reg = config.machine.registerFile[self.vreg]
+        assert reg.type == registers.numpy.ndarray, self.vreg + " is not a vector register"
+        reg.write(registers.numpy.array(vals) if vl > 0 else registers.numpy.zeros(0, dtype = registers.numpy.int64))
+
+        config.machine.timingModel.vecCacheExec(self, addr, vl)
+
+        config.machine.pc += 4
+
+@concreteInstruction('VSE32.V')
+class Vse32Instruction(VMemInstruction) :
+    def exec(self) :
+        vl = self._vl()
+        addr = self._calculateAddress()
+
+        vals = self._readVector(self.vreg, vl)
+
+        #tolist hands memory plain python ints/floats, which is what scalar loads expect
+        config.machine.memory.writeRange(addr, vals.tolist())
+
+        config.machine.timingModel.vecCacheExec(self, addr, vl)
+
+        config.machine.pc += 4
+
+@concreteInstruction('VADD.VV')
+class VaddInstruction(IVRInstruction) :
+    def funcExec(self, a, b) :
+        return a + b
+
+@concreteInstruction('VSUB.VV')
+class VsubInstruction(IVRInstruction) :
+    def funcExec(self, a, b) :
+        return a - b
+
+@concreteInstruction('VMUL.VV')
+class VmulInstruction(IVRInstruction) :
+    def funcExec(self, a, b) :
+        return a * b
+
+@concreteInstruction('VDIV.VV')
+class VdivInstruction(IVRInstruction) :
+    def funcExec(self, a, b) :
+        #numpy would quietly produce 0; keep the scalar DIV behavior instead
+        assert (b != 0).all(), "Integer division by zero"
+        return a // b
+
+@concreteInstruction('VFADD.VV')
+class VfaddInstruction(FVRInstruction) :
+    def funcExec(self, a, b) :
+        return a + b
+
+@concreteInstruction('VFSUB.VV')
+class VfsubInstruction(FVRInstruction) :
+    def funcExec(self, a, b) :
+        return a - b
+
+@concreteInstruction('VFMUL.VV')
+class VfmulInstruction(FVRInstruction) :
+    def funcExec(self, a, b) :
+        return a * b
+
+@concreteInstruction('VFDIV.VV')
+class VfdivInstruction(FVRInstruction) :
+    def funcExec(self, a, b) :
+        assert (b != 0).all(), "Floating point division by zero"
+        return a / b
+
+@concreteInstruction('VREDSUM.VS')
+class VredsumInstruction(IVRedInstruction) :
+    pass
+
+@concreteInstruction('VFREDUSUM.VS')
+class VfredusumInstruction(FVRedInstruction) :
+    pass
+
+#vd[0] = int register
+@concreteInstruction('VMV.S.X')
+class VmvsxInstruction(VMoveInstruction) :
+    def exec(self) :
+        self._checkVectorUnit()
+        config.machine.timingModel.exec(self)
+        srcReg = config.machine.registerFile[self.src1]
+        assert srcReg.type == int, "Source register is not an integer"
+        config.machine.registerFile[self.dst].write(registers.numpy.array([srcReg.read()], dtype = registers.numpy.int64))
+        config.machine.pc += 4
+
+#vd[0] = float register
+@concreteInstruction('VFMV.S.F')
+class VfmvsfInstruction(VMoveInstruction) :
+    def exec(self) :
+        self._checkVectorUnit()
+        config.machine.timingModel.exec(self)
+        srcReg = config.machine.registerFile[self.src1]
+        assert srcReg.type == float, "Source register is not a float"
+        config.machine.registerFile[self.dst].write(registers.numpy.array([srcReg.read()], dtype = registers.numpy.float64))
+        config.machine.pc += 4
+
+#int register = vs[0]
+@concreteInstruction('VMV.X.S')
+class VmvxsInstruction(VMoveInstruction) :
+    def exec(self) :
+        config.machine.timingModel.exec(self)
+        val = self._readVector(self.src1, 1)
+        self._checkKind(val)
+        config.machine.registerFile[self.dst].write(int(val[0]))
+        config.machine.pc += 4
+
+    @property
+    def elemtype(self) :
+        return int
+
+#float register = vs[0]
+@concreteInstruction('VFMV.F.S')
+class VfmvfsInstruction(VMoveInstruction) :
+    def exec(self) :
+        config.machine.timingModel.exec(self)
+        val = self._readVector(self.src1, 1)
+        self._checkKind(val)
+        config.machine.registerFile[self.dst].write(float(val[0]))
+        config.machine.pc += 4
+
+    @property
+    def elemtype(self) :
+        return float
+
 #### Custom instructions -- not actually part of RISC-V instruction set ####
 
 #Load address to register
@@ -851,6 +1300,68 @@ class ImovfInstruction(FORInstruction) :
     def srctype(self) :
         return float
 
+#start an idle hart at label with a0 = src; the new hart's id goes in dst
+@concreteInstruction('SPAWN')
+class SpawnInstruction(Instruction) :
+
+    @classmethod
+    def parse(cls, instr) :
+        #SPAWN dst, src, label
+        match = re.match(r'(\S+) (\S+), (\S+), (\S+)', instr)
+        return cls(match[1], match[2], match[3], match[4])
+
+    def __init__(self, opcode, dst, src, label) :
+        self.opcode = opcode
+        self.dst = dst
+        self.src = src
+        self.label = label
+
+    def exec(self) :
+        config.machine.timingModel.exec(self)
+        srcReg = config.machine.registerFile[self.src]
+        assert srcReg.type == int, "Spawn argument must be an integer"
+
+        destReg = config.machine.registerFile[self.dst]
+        assert destReg.type == int, "Destination register is not an integer"
+
+        hartId = config.machine.spawn(config.machine.prog.labels[self.label], srcReg.read())
+        destReg.write(hartId)
+
+        config.machine.pc += 4
+
+    def __str__(self) :
+        return str(self.opcode + " " + self.dst + ", " + self.src + ", " + self.label)
+
+#wait for the hart whose id is in reg to halt
+@concreteInstruction('JOIN')
+class JoinInstruction(IOInstruction) :
+
+    def exec(self) :
+        srcReg = config.machine.registerFile[self.reg]
+        assert srcReg.type == int, "Hart id must be an integer"
+
+        if (config.machine.join(srcReg.read())) :
+            config.machine.timingModel.exec(self)
+            config.machine.pc += 4
+
+#allocate src bytes from the heap; dst gets the block address, or 0 if the heap is exhausted
+@concreteInstruction('MALLOC')
+class MallocInstruction(IORInstruction) :
+    def funcExec(self, s1) :
+        return config.machine.heap.malloc(s1)
+
+#return the heap block whose address is in reg
+@concreteInstruction('FREE')
+class FreeInstruction(IOInstruction) :
+    def exec(self) :
+        config.machine.timingModel.exec(self)
+        srcReg = config.machine.registerFile[self.reg]
+        assert srcReg.type == int, "Freeing an address held in a non-integer register"
+
+        config.machine.heap.free(srcReg.read())
+
+        config.machine.pc += 4
+
 #read integer from stdin
 @concreteInstruction('GETI')
 class GetiInstruction(InputInstruction) :
@@ -898,6 +1409,10 @@ class HaltInstruction(Instruction) :
         match = re.match(r'(\S+)', inst)
         return cls(match[1])
 
+    @classmethod
+    def fromOperands(cls, opcode, dest, src1, src2, label) :
+        return cls(opcode)
+
     def exec(self) :
         #HALT by moving pc to -1
         config.machine.pc = -1
@@ -914,18 +1429,10 @@ class AuipcInstruction(IUInstruction) :
 class SltiuInstruction(IInstruction) :
     pass
 
-@concreteInstruction('SRAI')
-class SraiInstruction(IInstruction) :
-    pass
-
 @concreteInstruction('SLTU')
 class SltuInstruction(IRInstruction) :
     pass
 
-@concreteInstruction('SRA')
-class SraInstruction(IRInstruction) :
-    pass
-
 @concreteInstruction('MULH')
 class MulhInstruction(IRInstruction) :
     pass
@@ -955,6 +1462,15 @@ def parseInstruction(inst) :
     opcode = re.match(r'(\S+)', base)[0]
     return opCodeMap[opcode].parse(base)
 
+#Generate the derived instruction for a MicroC compiler instruction object, without going through text
+#Only the operand fields are read, so the compiler does not need to be importable here
+def buildInstruction(inst) :
+    opcode = str(inst.oc)
+    operands = [getattr(inst, field, None) for field in ('dest', 'src1', 'src2', 'label')]
+    #operands are kept as the same strings the text path would have parsed
+    operands = [str(o) if o is not None else None for o in operands]
+    return opCodeMap[opcode].fromOperands(opcode, *operands)
+
 ####### Test #######
 
 def testAdd() :
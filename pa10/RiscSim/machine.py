@@ -1,105 +1,161 @@
 from memory import Memory
-from registers import IRegister
-from registers import FRegister
+from hart import Hart
+from heap import Heap
 import timingmodel
 import program
 import config
 
 class Machine :
-    def __init__(self, numIntRegisters = 32, numFloatRegisters = 32, timingModel = timingmodel.defaultTimingModel) :
-        self.memory = Memory()
-        
-        self.registerFile = {}
+    def __init__(self, numIntRegisters = 32, numFloatRegisters = 32, timingModel = timingmodel.defaultTimingModel, numHarts = 1, quantum = 100, vlmax = 32) :
+        assert numHarts >= 1, "Machine needs at least one hart"
+        assert quantum >= 1, "Scheduling quantum must be at least one instruction"
+
         self.numIntRegisters = numIntRegisters
         self.numFloatRegisters = numFloatRegisters
-        self.__createRegisterFile()
+        self.numHarts = numHarts
+        self.quantum = quantum
+        self.vlmax = vlmax #maximum number of elements in a vector register
+        self.timingModelClass = timingModel
 
-        self.timingModel = timingModel()
-        # print(self.timingModel)
+        self.reset()
+
+    def reset(self) :
+        #start over with empty memory, a fresh heap and fresh harts, so one machine can run many programs
+        self.memory = Memory()
+        self.heap = Heap(self.memory.heap)
+
+        #every hart has its own register file, pc and timing model; memory is shared
+        self.harts = [Hart(i, self.numIntRegisters, self.numFloatRegisters, self.timingModelClass) for i in range(self.numHarts)]
+
+        #harts contend for a single memory bus, which only matters once there is more than one of them
+        self.bus = None
+        if (self.numHarts > 1) :
+            self.bus = timingmodel.Bus()
+            for hart in self.harts :
+                hart.timingModel.bus = self.bus
 
         self.prog = None
 
+        #registerFile, timingModel and pc always refer to the hart that is currently executing
+        self.hart = None
+        self.__switchTo(self.harts[0])
+        # print(self.timingModel)
+
         self.pc = self.memory.text[0]
         self.registerFile['sp'].write(self.memory.text[1] - 4) #initialize the stack pointer
 
-    def __createRegisterFile(self) :
-        #initialize integer registers
-        for i in range(self.numIntRegisters) :
-            name = 'x' + str(i)
-            self.registerFile[name] = IRegister(name)
-
-        #Standard integer register aliases
-        self.registerFile['zero'] = self.registerFile['x0']
-        self.registerFile['ra'] = self.registerFile['x1']
-        self.registerFile['sp'] = self.registerFile['x2']
-        self.registerFile['gp'] = self.registerFile['x3']
-        self.registerFile['tp'] = self.registerFile['x4']
-        self.registerFile['t0'] = self.registerFile['x5']
-        self.registerFile['t1'] = self.registerFile['x6']
-        self.registerFile['t2'] = self.registerFile['x7']
-        self.registerFile['s0'] = self.registerFile['x8']
-        self.registerFile['fp'] = self.registerFile['x8']
-        self.registerFile['s1'] = self.registerFile['x9']
-        self.registerFile['a0'] = self.registerFile['x10']
-        self.registerFile['a1'] = self.registerFile['x11']
-        self.registerFile['a2'] = self.registerFile['x12']
-        self.registerFile['a3'] = self.registerFile['x13']
-        self.registerFile['a4'] = self.registerFile['x14']
-        self.registerFile['a5'] = self.registerFile['x15']
-        self.registerFile['a6'] = self.registerFile['x16']
-        self.registerFile['a7'] = self.registerFile['x17']
-        self.registerFile['s2'] = self.registerFile['x18']
-        self.registerFile['s3'] = self.registerFile['x19']
-        self.registerFile['s4'] = self.registerFile['x20']
-        self.registerFile['s5'] = self.registerFile['x21']
-        self.registerFile['s6'] = self.registerFile['x22']
-        self.registerFile['s7'] = self.registerFile['x23']
-        self.registerFile['s8'] = self.registerFile['x24']
-        self.registerFile['s9'] = self.registerFile['x25']
-        self.registerFile['s10'] = self.registerFile['x26']
-        self.registerFile['s11'] = self.registerFile['x27']
-        self.registerFile['t3'] = self.registerFile['x28']
-        self.registerFile['t4'] = self.registerFile['x29']
-        self.registerFile['t5'] = self.registerFile['x30']
-        self.registerFile['t6'] = self.registerFile['x31']
-
-        #alias any extra integer registers
-        for i in range(self.numIntRegisters - 32) :
-            self.registerFile['t' + str(7 + i)] = self.registerFile['x' + str(32 + i)]
-
-        #initialize floating point registers
-        for f in range(self.numFloatRegisters) :
-            name = 'f' + str(f)
-            self.registerFile[name] = FRegister(name)    
-
-        #standard floating point register aliases
-        for i in range(0, 8) :
-            self.registerFile['ft' + str(i)] = self.registerFile['f' + str(i)]
-
-        self.registerFile['fs0'] = self.registerFile['f8']
-        self.registerFile['fs1'] = self.registerFile['f9']
-
-        for i in range(0, 8) :
-            self.registerFile['fa' + str(i)] = self.registerFile['f1' + str(i)]
-
-        for i in range(2, 12) :
-            self.registerFile['fs' + str(i)] = self.registerFile['f' + str(16 + i)]
-
-        for i in range(8, 12) :
-            self.registerFile['ft' + str(i)] = self.registerFile['f' + str(20 + i)]
-
-        #alias any extra floating point registers
-        for f in range(self.numFloatRegisters - 32) :
-            self.registerFile['ft' + str(12 + f)] = self.registerFile['f' + str(32 + f)]
+        #set by SPAWN/JOIN to end the current quantum early
+        self.yielded = False
+        self.blocked = False
+
+    def __switchTo(self, hart) :
+        self.hart = hart
+        self.registerFile = hart.registerFile
+        self.timingModel = hart.timingModel
+        self.pc = hart.pc
+
+    def __switchOut(self) :
+        hart = self.hart
+        hart.pc = self.pc
+        if (self.pc == -1) :
+            hart.state = Hart.HALTED
+
+    def stackTop(self, hartId) :
+        #hart 0 keeps the original stack; the stack segment is split evenly among the remaining harts
+        if (hartId == 0) :
+            return self.memory.text[1] - 4
+        stackSize = (self.memory.stack[1] - self.memory.stack[0]) // (self.numHarts - 1)
+        return self.memory.stack[1] - (hartId - 1) * stackSize - 4
+
+    def spawn(self, pc, arg) :
+        for hart in self.harts :
+            if (hart.state == Hart.IDLE) :
+                hart.start(pc, self.stackTop(hart.hartId), arg)
+                #a spawned hart starts at its parent's current time
+                hart.timingModel.elapsedTime = self.timingModel.elapsedTime
+                self.yielded = True
+                return hart.hartId
+        assert False, "No idle hart available to spawn"
+
+    def join(self, hartId) :
+        assert (hartId >= 0 and hartId < self.numHarts), "Joining a hart that does not exist: " + str(hartId)
+        hart = self.harts[hartId]
+        assert hart is not self.hart, "A hart cannot join itself"
+        assert hart.state != Hart.IDLE, "Joining hart " + str(hartId) + " which was never spawned"
+
+        if (hart.state == Hart.RUNNING) :
+            #not done yet: leave the pc on the JOIN and let the other harts run
+            self.yielded = True
+            self.blocked = True
+            return False
+
+        #the joining hart cannot continue before the joined hart finished
+        finish = hart.timingModel.elapsedTime
+        if (finish > self.timingModel.elapsedTime) :
+            self.timingModel.elapsedTime = finish
+        hart.state = Hart.IDLE
+        return True
 
     def execProgram(self, p) :
         self.prog = p
+
+        #execution always begins on hart 0
+        self.__switchTo(self.harts[0])
         self.pc = self.memory.text[0]
+        self.hart.pc = self.pc
+        self.hart.state = Hart.RUNNING
+
+        #round-robin over the running harts, one quantum at a time
+        while True :
+            running = [h for h in self.harts if h.state == Hart.RUNNING]
+            if (len(running) == 0) :
+                break
+
+            progress = False
+            for hart in running :
+                if (hart.state != Hart.RUNNING) :
+                    continue
+                if (self.__runQuantum(hart, p, len(running) > 1)) :
+                    progress = True
+
+            assert progress, "Deadlock: every running hart is blocked on a JOIN"
+
+            if (self.bus is not None) :
+                self.bus.retire(min([h.timingModel.elapsedTime for h in self.harts if h.state == Hart.RUNNING], default = 0))
+
+        self.__switchTo(self.harts[0])
+
+    def __runQuantum(self, hart, p, shared) :
+        self.__switchTo(hart)
+
+        #a lone hart runs until it halts or spawns another one
+        limit = self.quantum if shared else -1
+        code = p.code
+        n = 0
+        self.yielded = False
+        self.blocked = False
         while (self.pc != -1) :
             # print(self.pc)
-            inst = p.code[self.pc]
+            inst = code[self.pc]
             inst.exec()
-        
+            n += 1
+            if (n == limit or self.yielded) :
+                break
+
+        #a JOIN that has to wait did not retire
+        if (self.blocked) :
+            n -= 1
+        hart.instructionCount += n
+
+        self.__switchOut()
+        return n > 0
+
+    def getTotalTime(self) :
+        #the harts run in parallel, so the program takes as long as the slowest one
+        return max([h.timingModel.getTotalTime() for h in self.harts])
+
+    def getInstructionCount(self) :
+        return sum([h.instructionCount for h in self.harts])
 
 # machine = Machine(numIntRegisters = 64, numFloatRegisters = 64)
 
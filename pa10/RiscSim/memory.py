@@ -23,6 +23,28 @@ class Memory(dict) :
         self.__validateAddress(key)
         super().__setitem__(key, value)
 
+    #read/write count consecutive words starting at addr, validating the range once rather than every word
+    def readRange(self, addr, count) :
+        self.__validateRange(addr, count)
+        get = super().__getitem__
+        return [get(a) for a in range(addr, addr + 4 * count, 4)]
+
+    def writeRange(self, addr, values) :
+        self.__validateRange(addr, len(values))
+        put = super().__setitem__
+        for i, v in enumerate(values) :
+            put(addr + 4 * i, v)
+
+    def __validateRange(self, addr, count) :
+        if (count == 0) :
+            return
+        self.__validateAddress(addr)
+        last = addr + 4 * (count - 1)
+        self.__validateAddress(last)
+        for s in [self.globs, self.stack, self.heap, self.strings] :
+            if (addr >= s[0] and addr < s[1]) :
+                assert last < s[1], "Address range crosses a segment boundary"
+
     def __missing__(self, key) :
         assert False, "Reading from uninitialized memory location: " + hex(key)
 
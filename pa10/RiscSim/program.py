@@ -56,9 +56,28 @@ class Program :
 
     def addString(self, l) :
         match = re.match(r'(\S+) (.+)', l)
-        addr = parseint(match[1])
-        string = bytes(match[2][1:-1], 'utf-8').decode('unicode_escape')
+        self.storeString(parseint(match[1]), match[2])
+
+    def storeString(self, addr, literal) :
+        #literal is the quoted string exactly as written in the source program
+        string = bytes(literal[1:-1], 'utf-8').decode('unicode_escape')
         config.machine.memory[addr] = string
+
+    #build the program straight from the compiler's instruction objects, skipping the text round trip
+    #instrs is the InstructionList of a CodeObject; strings is a list of (address, quoted literal) pairs
+    def buildCodeFromInstructions(self, instrs, strings) :
+        currAddr = config.machine.memory.text[0]
+        for inst in instrs :
+            if (getattr(inst, 'oc', None) is None) :
+                #labels have no opcode; blank lines have nothing at all
+                if (getattr(inst, 'label', None) is not None) :
+                    self.labels[inst.label] = currAddr
+                continue
+            self.code[currAddr] = instructions.buildInstruction(inst)
+            currAddr += 4
+
+        for addr, literal in strings :
+            self.storeString(addr, literal)
                 
 
 ### TEST ###
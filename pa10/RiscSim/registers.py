@@ -1,3 +1,9 @@
+try :
+    import numpy
+except ImportError :
+    #vector registers need numpy; everything else works without it
+    numpy = None
+
 numIntRegisters = 64 #TODO: make this a configurable number, at least 32
 numFloatRegisters = 64 #TODO: make this a configurable number, at least 32
 numRegisters = numIntRegisters + numFloatRegisters
@@ -39,6 +45,14 @@ class FRegister(Register) :
         self.name = name
         self.type = float
 
+#vector registers hold a numpy array of elements; only the first vl of them are meaningful
+class VRegister(Register) :
+    def __init__(self, name) :
+        super().__init__()
+        self.value = numpy.zeros(0, dtype = numpy.int64)
+        self.name = name
+        self.type = numpy.ndarray
+
 
 if __name__ == '__main__' :
     print(numRegisters)
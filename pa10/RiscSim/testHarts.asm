@@ -0,0 +1,36 @@
+.section .text
+;sum 1..400 split across four harts, accumulating into a shared word with AMOADD
+main:
+    LA s1, 0x20000000
+    SW x0, 0(s1)
+    LI a0, 0
+    SPAWN s2, a0, worker
+    LI a0, 100
+    SPAWN s3, a0, worker
+    LI a0, 200
+    SPAWN s4, a0, worker
+    LI a0, 300
+    SPAWN s5, a0, worker
+    JOIN s2
+    JOIN s3
+    JOIN s4
+    JOIN s5
+    LW t0, 0(s1)
+    PUTI t0
+    HALT
+
+;a0 = first index of this hart's slice
+worker:
+    LA t0, 0x20000000
+    ADDI t1, a0, 100
+    LI t2, 0
+loop:
+    BGE a0, t1, done
+    ADDI a0, a0, 1
+    ADD t2, t2, a0
+    J loop
+done:
+    AMOADD.W t3, t2, (t0)
+    RET
+
+.section .strings
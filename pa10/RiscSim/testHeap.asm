@@ -0,0 +1,30 @@
+.section .text
+;build a 50-node linked list of (value, next) nodes on the heap, sum it, then free it
+main:
+    LI s1, 0
+    LI t0, 1
+    LI t1, 51
+    LI t2, 8
+build:
+    BGE t0, t1, walk
+    MALLOC t3, t2
+    SW t0, 0(t3)
+    SW s1, 4(t3)
+    MV s1, t3
+    ADDI t0, t0, 1
+    J build
+walk:
+    LI a0, 0
+sum:
+    BEQ s1, x0, done
+    LW t4, 0(s1)
+    ADD a0, a0, t4
+    LW t5, 4(s1)
+    FREE s1
+    MV s1, t5
+    J sum
+done:
+    PUTI a0
+    HALT
+
+.section .strings
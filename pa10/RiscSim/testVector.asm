@@ -0,0 +1,47 @@
+.section .text
+;a[i] = i, b[i] = 2.5 * i for i in 0..39, then sum(a * a) and sum(b + b) with vector instructions
+main:
+    LA s1, 0x20000000
+    LA s2, 0x20001000
+    LI t0, 0
+    LI t1, 40
+    FIMM.S ft0, 0.0
+    FIMM.S ft1, 2.5
+    MV t2, s1
+    MV t3, s2
+init:
+    BGE t0, t1, vec
+    SW t0, 0(t2)
+    FSW ft0, 0(t3)
+    FADD.S ft0, ft0, ft1
+    ADDI t0, t0, 1
+    ADDI t2, t2, 4
+    ADDI t3, t3, 4
+    J init
+;strip-mined loop: each pass handles vl <= vlmax elements
+vec:
+    VMV.S.X v8, x0
+    FIMM.S ft2, 0.0
+    VFMV.S.F v9, ft2
+strip:
+    BEQ t1, x0, done
+    VSETVL t4, t1
+    VLE32.V v1, (s1)
+    VMUL.VV v2, v1, v1
+    VREDSUM.VS v8, v2, v8
+    VLE32.V v3, (s2)
+    VFADD.VV v4, v3, v3
+    VFREDUSUM.VS v9, v4, v9
+    SUB t1, t1, t4
+    SLLI t5, t4, 2
+    ADD s1, s1, t5
+    ADD s2, s2, t5
+    J strip
+done:
+    VMV.X.S a0, v8
+    PUTI a0
+    VFMV.F.S fa0, v9
+    PUTF fa0
+    HALT
+
+.section .strings
@@ -1,6 +1,30 @@
+#shared memory bus: every memory access occupies the bus for a cycle, and a hart whose
+#access finds the bus busy stalls until the next free cycle
+class Bus :
+    def __init__(self, occupancy = 1) :
+        self.occupancy = occupancy
+        self.busy = set()
+        self.contentionCycles = 0
+
+    def acquire(self, now) :
+        start = now
+        while (start in self.busy) :
+            start += 1
+        for c in range(start, start + self.occupancy) :
+            self.busy.add(c)
+
+        stall = start - now
+        self.contentionCycles += stall
+        return stall
+
+    def retire(self, now) :
+        #no hart can issue an access before now, so older cycles can be forgotten
+        self.busy = {c for c in self.busy if c >= now}
+
 class defaultTimingModel :
     def __init__(self) :
         self.elapsedTime = 0
+        self.bus = None
         pass
 
     def exec(self, inst) :
@@ -9,6 +33,12 @@ class defaultTimingModel :
     def cacheExec(self, inst, address) :
         pass
 
+    def vecExec(self, inst, vl) :
+        pass
+
+    def vecCacheExec(self, inst, address, vl) :
+        pass
+
     def getTotalTime(self) :
         return self.elapsedTime
 
@@ -17,6 +47,8 @@ class basicTimingModel(defaultTimingModel) :
         self.timingMap = {}
         self.__initTimingMap()
         self.elapsedTime = 0
+        self.bus = None
+        self.vectorLanes = 4 #elements a vector instruction processes per step
 
     def exec(self, inst) :
         try :
@@ -25,8 +57,21 @@ class basicTimingModel(defaultTimingModel) :
             self.elapsedTime += 1
 
     def cacheExec(self, inst, address) :
+        if (self.bus is not None) :
+            self.elapsedTime += self.bus.acquire(self.elapsedTime)
         self.exec(inst)
 
+    #vector instructions pay their latency once per group of vectorLanes elements
+    def vecExec(self, inst, vl) :
+        groups = max(1, -(-vl // self.vectorLanes))
+        for _ in range(groups) :
+            self.exec(inst)
+
+    def vecCacheExec(self, inst, address, vl) :
+        groups = max(1, -(-vl // self.vectorLanes))
+        for g in range(groups) :
+            self.cacheExec(inst, address + 4 * self.vectorLanes * g)
+
     def __initTimingMap(self) :
         self.timingMap['SUB'] = 2
         self.timingMap['MUL'] = 3
@@ -50,7 +95,56 @@ class basicTimingModel(defaultTimingModel) :
         self.timingMap['FMOVI.S'] = 4
         self.timingMap['IMOVF.S'] = 4
         self.timingMap['HALT'] = 0
+        self.timingMap['AMOADD.W'] = 3
+        self.timingMap['AMOSWAP.W'] = 3
+        self.timingMap['SPAWN'] = 4
+        self.timingMap['MALLOC'] = 8
+        self.timingMap['FREE'] = 4
+        self.timingMap['VLE32.V'] = 2
+        self.timingMap['VSE32.V'] = 1
+        self.timingMap['VSUB.VV'] = 2
+        self.timingMap['VMUL.VV'] = 3
+        self.timingMap['VDIV.VV'] = 4
+        self.timingMap['VFADD.VV'] = 4
+        self.timingMap['VFSUB.VV'] = 4
+        self.timingMap['VFMUL.VV'] = 5
+        self.timingMap['VFDIV.VV'] = 6
+        self.timingMap['VREDSUM.VS'] = 2
+        self.timingMap['VFREDUSUM.VS'] = 4
+
+
+
+        
+#in-order, single-issue pipeline: an instruction issues the cycle after the one before it, or later if one
+#of the registers it reads is still being computed; its result is ready once the basicTimingModel latency
+#has passed. A consumer right behind a load or a long float operation stalls, independent work in between does not.
+class pipelinedTimingModel(basicTimingModel) :
+    def __init__(self) :
+        super().__init__()
+        self.ready = {} #register -> cycle its value becomes available
+        self.stallCycles = 0
+
+    def exec(self, inst) :
+        latency = self.timingMap.get(inst.opcode, 1)
+        operands = inst.registers()
+        if (operands is None) :
+            #operands unknown: wait until everything in flight is done
+            reads, writes = [], []
+            start = max([self.elapsedTime] + list(self.ready.values()))
+        else :
+            reads, writes = operands
+            start = max([self.elapsedTime] + [self.ready.get(self.register(r), 0) for r in reads])
 
+        self.stallCycles += start - self.elapsedTime
+        self.elapsedTime = start + min(latency, 1)
+        for w in writes :
+            self.ready[self.register(w)] = start + latency
 
+    def register(self, name) :
+        #aliases such as ra and x1 name the same register object; imported here because config imports this module
+        import config
+        return config.machine.registerFile[name]
 
-        
\ No newline at end of file
+    def getTotalTime(self) :
+        #the program is done once its last result is written
+        return max([self.elapsedTime] + list(self.ready.values()))
@@ -0,0 +1,152 @@
+#Simulation throughput benchmarks for RiscSim
+#Every workload runs in its own python process so that peak RSS belongs to that workload alone.
+#Results are compared against baseline.json; run with --update to record a new baseline.
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKLOAD_DIR = os.path.join(BENCH_DIR, 'workloads')
+RISCSIM_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'RiscSim')
+BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+#workload name -> what it exercises; each has workloads/<name>.asm and optionally workloads/<name>.in for stdin
+WORKLOADS = {
+    'intloop' : 'nested integer loops: ADD/SUB/MUL/DIV, branches, local loads and stores',
+    'poly' : 'deep recursion in the style of test5 poly: call/return and register save/restore',
+    'floatmix' : 'float-heavy Newton iterations: FADD/FMUL/FDIV and FLW/FSW',
+    'iostress' : 'GETI/GETF/PUTI/PUTF/PUTS on every iteration',
+}
+
+#relative slack allowed before a metric counts as a regression
+DEFAULT_TOLERANCE = 0.15
+
+#loading takes about a millisecond, so it is timed as the fastest of this many loads
+LOAD_REPEAT = 25
+
+def runOne(name) :
+    #child process: load and run one workload, report metrics as json on the real stdout
+    sys.path.insert(0, RISCSIM_DIR)
+    import config
+    import program
+
+    out = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+
+    inFile = os.path.join(WORKLOAD_DIR, name + '.in')
+    if (os.path.exists(inFile)) :
+        sys.stdin = open(inFile, 'r')
+    else :
+        sys.stdin = open(os.devnull, 'r')
+
+    asmFile = os.path.join(WORKLOAD_DIR, name + '.asm')
+    loadSeconds = None
+    for _ in range(LOAD_REPEAT) :
+        start = time.perf_counter()
+        p = program.Program()
+        p.buildCodeFromFile(asmFile)
+        loaded = time.perf_counter()
+        if (loadSeconds is None or loaded - start < loadSeconds) :
+            loadSeconds = loaded - start
+
+    loaded = time.perf_counter()
+    config.machine.execProgram(p)
+    done = time.perf_counter()
+
+    instructions = config.machine.getInstructionCount()
+    result = {
+        'instructions' : instructions,
+        'cycles' : config.machine.getTotalTime(),
+        'load_seconds' : loadSeconds,
+        'exec_seconds' : done - loaded,
+        'ips' : instructions / (done - loaded),
+        'peak_rss_kb' : resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    print(json.dumps(result), file = out)
+
+def measure(name, repeat) :
+    #best of repeat runs: the fastest run is the least disturbed by the rest of the system
+    best = None
+    for _ in range(repeat) :
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name], stdout = subprocess.PIPE, check = True)
+        r = json.loads(proc.stdout.decode().strip().splitlines()[-1])
+        if (best is None) :
+            best = r
+            continue
+        assert r['instructions'] == best['instructions'], name + " is not deterministic"
+        best['ips'] = max(best['ips'], r['ips'])
+        best['exec_seconds'] = min(best['exec_seconds'], r['exec_seconds'])
+        best['load_seconds'] = min(best['load_seconds'], r['load_seconds'])
+        best['peak_rss_kb'] = min(best['peak_rss_kb'], r['peak_rss_kb'])
+    return best
+
+def compare(name, result, base, tolerance) :
+    problems = []
+    #the simulated work itself must not change: a different count means the workload or the interpreter semantics did
+    if (result['instructions'] != base['instructions']) :
+        problems.append('instructions ' + str(base['instructions']) + ' -> ' + str(result['instructions']))
+    if (result['cycles'] != base['cycles']) :
+        problems.append('cycles ' + str(base['cycles']) + ' -> ' + str(result['cycles']))
+    if (result['ips'] < base['ips'] * (1 - tolerance)) :
+        problems.append('ips %.0f -> %.0f' % (base['ips'], result['ips']))
+    if (result['load_seconds'] > base['load_seconds'] * (1 + tolerance)) :
+        problems.append('load %.4fs -> %.4fs' % (base['load_seconds'], result['load_seconds']))
+    if (result['peak_rss_kb'] > base['peak_rss_kb'] * (1 + tolerance)) :
+        problems.append('rss %dKB -> %dKB' % (base['peak_rss_kb'], result['peak_rss_kb']))
+    return problems
+
+def main() :
+    parser = argparse.ArgumentParser(description = 'Measure RiscSim simulation throughput against a committed baseline')
+    parser.add_argument('workloads', nargs = '*', help = 'workloads to run (default: all)')
+    parser.add_argument('--repeat', type = int, default = 3, help = 'runs per workload; the best one counts (default 3)')
+    parser.add_argument('--tolerance', type = float, default = DEFAULT_TOLERANCE, help = 'allowed relative regression (default %.2f)' % DEFAULT_TOLERANCE)
+    parser.add_argument('--baseline', default = BASELINE, help = 'baseline json file')
+    parser.add_argument('--update', action = 'store_true', help = 'record the results as the new baseline instead of comparing')
+    parser.add_argument('--child', help = argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if (args.child is not None) :
+        runOne(args.child)
+        return 0
+
+    names = args.workloads if len(args.workloads) > 0 else list(WORKLOADS)
+    for name in names :
+        assert name in WORKLOADS, "Unknown workload " + name
+
+    baseline = {}
+    if (os.path.exists(args.baseline)) :
+        with open(args.baseline, 'r') as f :
+            baseline = json.load(f)
+
+    results = {}
+    failed = False
+    print('%-10s %12s %10s %12s %10s %10s  %s' % ('workload', 'instructions', 'cycles', 'inst/sec', 'load(s)', 'rss(KB)', 'status'))
+    for name in names :
+        r = measure(name, args.repeat)
+        results[name] = r
+
+        if (args.update) :
+            status = 'recorded'
+        elif (name not in baseline) :
+            status = 'no baseline'
+        else :
+            problems = compare(name, r, baseline[name], args.tolerance)
+            status = 'ok' if len(problems) == 0 else 'REGRESSION: ' + ', '.join(problems)
+            failed = failed or len(problems) > 0
+
+        print('%-10s %12d %10d %12.0f %10.4f %10d  %s' % (name, r['instructions'], r['cycles'], r['ips'], r['load_seconds'], r['peak_rss_kb'], status))
+
+    if (args.update) :
+        baseline.update(results)
+        with open(args.baseline, 'w') as f :
+            json.dump(baseline, f, indent = 2, sort_keys = True)
+            f.write('\n')
+
+    return 1 if failed else 0
+
+if __name__ == '__main__' :
+    exit(main())
@@ -0,0 +1,266 @@
+; Symbol table GLOBAL
+; Function: Type.FLOAT newton([<Type.FLOAT: 3>])
+; Function: Type.INT main([])
+
+; Symbol table main
+; name i type Type.INT location -4
+; name a type Type.FLOAT location -8
+; name sum type Type.FLOAT location -12
+
+; Symbol table newton
+; name a type Type.FLOAT location 12
+; name x type Type.FLOAT location -4
+; name k type Type.INT location -8
+
+.section .text
+;Current temp: 
+;IR Code: 
+MV fp, sp
+JR func_main
+HALT
+
+func_main:
+SW fp, 0(sp)
+MV fp, sp
+ADDI sp, sp, -4
+ADDI sp, sp, -12
+SW t1, 0(sp)
+ADDI sp, sp, -4
+SW t2, 0(sp)
+ADDI sp, sp, -4
+SW t3, 0(sp)
+ADDI sp, sp, -4
+SW t4, 0(sp)
+ADDI sp, sp, -4
+SW t5, 0(sp)
+ADDI sp, sp, -4
+SW t6, 0(sp)
+ADDI sp, sp, -4
+SW t7, 0(sp)
+ADDI sp, sp, -4
+FSW f1, 0(sp)
+ADDI sp, sp, -4
+FSW f2, 0(sp)
+ADDI sp, sp, -4
+FSW f3, 0(sp)
+ADDI sp, sp, -4
+FSW f4, 0(sp)
+ADDI sp, sp, -4
+FSW f5, 0(sp)
+ADDI sp, sp, -4
+FSW f6, 0(sp)
+ADDI sp, sp, -4
+FSW f7, 0(sp)
+ADDI sp, sp, -4
+FSW f8, 0(sp)
+ADDI sp, sp, -4
+FSW f9, 0(sp)
+ADDI sp, sp, -4
+FSW f10, 0(sp)
+ADDI sp, sp, -4
+FSW f11, 0(sp)
+ADDI sp, sp, -4
+FSW f12, 0(sp)
+ADDI sp, sp, -4
+FSW f13, 0(sp)
+ADDI sp, sp, -4
+FSW f14, 0(sp)
+ADDI sp, sp, -4
+FSW f15, 0(sp)
+ADDI sp, sp, -4
+FSW f16, 0(sp)
+ADDI sp, sp, -4
+FIMM.S f1, 1.0
+FSW f1, -8(fp)
+FIMM.S f2, 0.0
+FSW f2, -12(fp)
+LI t1, 0
+SW t1, -4(fp)
+loop_1:
+LW t3, -4(fp)
+LI t2, 300
+BGE t3, t2, out_1
+FLW f7, -12(fp)
+FLW f3, -8(fp)
+FSW f3, 0(sp)
+ADDI sp, sp, -4
+ADDI sp, sp, -4
+SW ra, 0(sp)
+ADDI sp, sp, -4
+JR func_newton
+ADDI sp, sp, 4
+LW ra, 0(sp)
+ADDI sp, sp, 4
+FLW f4, 0(sp)
+ADDI sp, sp, 4
+FIMM.S f5, 0.5
+FMUL.S f6, f4, f5
+FADD.S f8, f7, f6
+FLW f10, -8(fp)
+FIMM.S f9, 1024.0
+FDIV.S f11, f10, f9
+FSUB.S f12, f8, f11
+FSW f12, -12(fp)
+FLW f14, -8(fp)
+FIMM.S f13, 1.25
+FADD.S f15, f14, f13
+FSW f15, -8(fp)
+LW t5, -4(fp)
+LI t4, 1
+ADD t6, t5, t4
+SW t6, -4(fp)
+J loop_1
+out_1:
+FLW f16, -12(fp)
+PUTF f16
+LI t7, 0
+SW t7, 8(fp)
+J func_ret_main
+func_ret_main:
+ADDI sp, sp, 4
+FLW f16, 0(sp)
+ADDI sp, sp, 4
+FLW f15, 0(sp)
+ADDI sp, sp, 4
+FLW f14, 0(sp)
+ADDI sp, sp, 4
+FLW f13, 0(sp)
+ADDI sp, sp, 4
+FLW f12, 0(sp)
+ADDI sp, sp, 4
+FLW f11, 0(sp)
+ADDI sp, sp, 4
+FLW f10, 0(sp)
+ADDI sp, sp, 4
+FLW f9, 0(sp)
+ADDI sp, sp, 4
+FLW f8, 0(sp)
+ADDI sp, sp, 4
+FLW f7, 0(sp)
+ADDI sp, sp, 4
+FLW f6, 0(sp)
+ADDI sp, sp, 4
+FLW f5, 0(sp)
+ADDI sp, sp, 4
+FLW f4, 0(sp)
+ADDI sp, sp, 4
+FLW f3, 0(sp)
+ADDI sp, sp, 4
+FLW f2, 0(sp)
+ADDI sp, sp, 4
+FLW f1, 0(sp)
+ADDI sp, sp, 4
+LW t7, 0(sp)
+ADDI sp, sp, 4
+LW t6, 0(sp)
+ADDI sp, sp, 4
+LW t5, 0(sp)
+ADDI sp, sp, 4
+LW t4, 0(sp)
+ADDI sp, sp, 4
+LW t3, 0(sp)
+ADDI sp, sp, 4
+LW t2, 0(sp)
+ADDI sp, sp, 4
+LW t1, 0(sp)
+MV sp, fp
+LW fp, 0(fp)
+RET
+
+func_newton:
+SW fp, 0(sp)
+MV fp, sp
+ADDI sp, sp, -4
+ADDI sp, sp, -8
+SW t1, 0(sp)
+ADDI sp, sp, -4
+SW t2, 0(sp)
+ADDI sp, sp, -4
+SW t3, 0(sp)
+ADDI sp, sp, -4
+SW t4, 0(sp)
+ADDI sp, sp, -4
+SW t5, 0(sp)
+ADDI sp, sp, -4
+SW t6, 0(sp)
+ADDI sp, sp, -4
+FSW f1, 0(sp)
+ADDI sp, sp, -4
+FSW f2, 0(sp)
+ADDI sp, sp, -4
+FSW f3, 0(sp)
+ADDI sp, sp, -4
+FSW f4, 0(sp)
+ADDI sp, sp, -4
+FSW f5, 0(sp)
+ADDI sp, sp, -4
+FSW f6, 0(sp)
+ADDI sp, sp, -4
+FSW f7, 0(sp)
+ADDI sp, sp, -4
+FSW f8, 0(sp)
+ADDI sp, sp, -4
+FSW f9, 0(sp)
+ADDI sp, sp, -4
+FLW f1, 12(fp)
+FSW f1, -4(fp)
+LI t1, 0
+SW t1, -8(fp)
+loop_2:
+LW t3, -8(fp)
+LI t2, 12
+BGE t3, t2, out_2
+FLW f5, -4(fp)
+FLW f2, 12(fp)
+FLW f3, -4(fp)
+FDIV.S f4, f2, f3
+FADD.S f6, f5, f4
+FIMM.S f7, 0.5
+FMUL.S f8, f6, f7
+FSW f8, -4(fp)
+LW t5, -8(fp)
+LI t4, 1
+ADD t6, t5, t4
+SW t6, -8(fp)
+J loop_2
+out_2:
+FLW f9, -4(fp)
+FSW f9, 8(fp)
+J func_ret_newton
+func_ret_newton:
+ADDI sp, sp, 4
+FLW f9, 0(sp)
+ADDI sp, sp, 4
+FLW f8, 0(sp)
+ADDI sp, sp, 4
+FLW f7, 0(sp)
+ADDI sp, sp, 4
+FLW f6, 0(sp)
+ADDI sp, sp, 4
+FLW f5, 0(sp)
+ADDI sp, sp, 4
+FLW f4, 0(sp)
+ADDI sp, sp, 4
+FLW f3, 0(sp)
+ADDI sp, sp, 4
+FLW f2, 0(sp)
+ADDI sp, sp, 4
+FLW f1, 0(sp)
+ADDI sp, sp, 4
+LW t6, 0(sp)
+ADDI sp, sp, 4
+LW t5, 0(sp)
+ADDI sp, sp, 4
+LW t4, 0(sp)
+ADDI sp, sp, 4
+LW t3, 0(sp)
+ADDI sp, sp, 4
+LW t2, 0(sp)
+ADDI sp, sp, 4
+LW t1, 0(sp)
+MV sp, fp
+LW fp, 0(fp)
+RET
+
+
+.section .strings
@@ -0,0 +1,233 @@
+; Symbol table GLOBAL
+; name n type Type.INT location 0x20000000
+; Function: Type.INT main([])
+
+; Symbol table main
+; name i type Type.INT location -4
+; name j type Type.INT location -8
+; name acc type Type.INT location -12
+; name t type Type.INT location -16
+
+.section .text
+;Current temp: 
+;IR Code: 
+MV fp, sp
+JR func_main
+HALT
+
+func_main:
+SW fp, 0(sp)
+MV fp, sp
+ADDI sp, sp, -4
+ADDI sp, sp, -16
+SW t1, 0(sp)
+ADDI sp, sp, -4
+SW t2, 0(sp)
+ADDI sp, sp, -4
+SW t3, 0(sp)
+ADDI sp, sp, -4
+SW t4, 0(sp)
+ADDI sp, sp, -4
+SW t5, 0(sp)
+ADDI sp, sp, -4
+SW t6, 0(sp)
+ADDI sp, sp, -4
+SW t7, 0(sp)
+ADDI sp, sp, -4
+SW t8, 0(sp)
+ADDI sp, sp, -4
+SW t9, 0(sp)
+ADDI sp, sp, -4
+SW t10, 0(sp)
+ADDI sp, sp, -4
+SW t11, 0(sp)
+ADDI sp, sp, -4
+SW t12, 0(sp)
+ADDI sp, sp, -4
+SW t13, 0(sp)
+ADDI sp, sp, -4
+SW t14, 0(sp)
+ADDI sp, sp, -4
+SW t15, 0(sp)
+ADDI sp, sp, -4
+SW t16, 0(sp)
+ADDI sp, sp, -4
+SW t17, 0(sp)
+ADDI sp, sp, -4
+SW t18, 0(sp)
+ADDI sp, sp, -4
+SW t19, 0(sp)
+ADDI sp, sp, -4
+SW t20, 0(sp)
+ADDI sp, sp, -4
+SW t21, 0(sp)
+ADDI sp, sp, -4
+SW t22, 0(sp)
+ADDI sp, sp, -4
+SW t23, 0(sp)
+ADDI sp, sp, -4
+SW t24, 0(sp)
+ADDI sp, sp, -4
+SW t25, 0(sp)
+ADDI sp, sp, -4
+SW t26, 0(sp)
+ADDI sp, sp, -4
+SW t27, 0(sp)
+ADDI sp, sp, -4
+SW t28, 0(sp)
+ADDI sp, sp, -4
+SW t29, 0(sp)
+ADDI sp, sp, -4
+SW t30, 0(sp)
+ADDI sp, sp, -4
+SW t31, 0(sp)
+ADDI sp, sp, -4
+SW t32, 0(sp)
+ADDI sp, sp, -4
+SW t33, 0(sp)
+ADDI sp, sp, -4
+SW t34, 0(sp)
+ADDI sp, sp, -4
+SW t35, 0(sp)
+ADDI sp, sp, -4
+SW t36, 0(sp)
+ADDI sp, sp, -4
+SW t37, 0(sp)
+ADDI sp, sp, -4
+LI t1, 60
+LA t2, 0x20000000
+SW t1, 0(t2)
+LI t3, 0
+SW t3, -12(fp)
+LI t4, 0
+SW t4, -4(fp)
+loop_2:
+LW t5, -4(fp)
+LA t6, 0x20000000
+LW t7, 0(t6)
+BGE t5, t7, out_2
+LI t8, 0
+SW t8, -8(fp)
+loop_1:
+LW t9, -8(fp)
+LA t10, 0x20000000
+LW t11, 0(t10)
+BGE t9, t11, out_1
+LW t12, -4(fp)
+LW t13, -8(fp)
+MUL t14, t12, t13
+LW t15, -4(fp)
+LW t16, -8(fp)
+SUB t17, t15, t16
+LI t18, 3
+DIV t19, t17, t18
+ADD t20, t14, t19
+SW t20, -16(fp)
+LW t21, -12(fp)
+LW t22, -16(fp)
+ADD t23, t21, t22
+LW t25, -12(fp)
+LI t24, 7
+DIV t26, t25, t24
+LI t27, 2
+MUL t28, t26, t27
+SUB t29, t23, t28
+SW t29, -12(fp)
+LW t31, -8(fp)
+LI t30, 1
+ADD t32, t31, t30
+SW t32, -8(fp)
+J loop_1
+out_1:
+LW t34, -4(fp)
+LI t33, 1
+ADD t35, t34, t33
+SW t35, -4(fp)
+J loop_2
+out_2:
+LW t36, -12(fp)
+PUTI t36
+LI t37, 0
+SW t37, 8(fp)
+J func_ret_main
+func_ret_main:
+ADDI sp, sp, 4
+LW t37, 0(sp)
+ADDI sp, sp, 4
+LW t36, 0(sp)
+ADDI sp, sp, 4
+LW t35, 0(sp)
+ADDI sp, sp, 4
+LW t34, 0(sp)
+ADDI sp, sp, 4
+LW t33, 0(sp)
+ADDI sp, sp, 4
+LW t32, 0(sp)
+ADDI sp, sp, 4
+LW t31, 0(sp)
+ADDI sp, sp, 4
+LW t30, 0(sp)
+ADDI sp, sp, 4
+LW t29, 0(sp)
+ADDI sp, sp, 4
+LW t28, 0(sp)
+ADDI sp, sp, 4
+LW t27, 0(sp)
+ADDI sp, sp, 4
+LW t26, 0(sp)
+ADDI sp, sp, 4
+LW t25, 0(sp)
+ADDI sp, sp, 4
+LW t24, 0(sp)
+ADDI sp, sp, 4
+LW t23, 0(sp)
+ADDI sp, sp, 4
+LW t22, 0(sp)
+ADDI sp, sp, 4
+LW t21, 0(sp)
+ADDI sp, sp, 4
+LW t20, 0(sp)
+ADDI sp, sp, 4
+LW t19, 0(sp)
+ADDI sp, sp, 4
+LW t18, 0(sp)
+ADDI sp, sp, 4
+LW t17, 0(sp)
+ADDI sp, sp, 4
+LW t16, 0(sp)
+ADDI sp, sp, 4
+LW t15, 0(sp)
+ADDI sp, sp, 4
+LW t14, 0(sp)
+ADDI sp, sp, 4
+LW t13, 0(sp)
+ADDI sp, sp, 4
+LW t12, 0(sp)
+ADDI sp, sp, 4
+LW t11, 0(sp)
+ADDI sp, sp, 4
+LW t10, 0(sp)
+ADDI sp, sp, 4
+LW t9, 0(sp)
+ADDI sp, sp, 4
+LW t8, 0(sp)
+ADDI sp, sp, 4
+LW t7, 0(sp)
+ADDI sp, sp, 4
+LW t6, 0(sp)
+ADDI sp, sp, 4
+LW t5, 0(sp)
+ADDI sp, sp, 4
+LW t4, 0(sp)
+ADDI sp, sp, 4
+LW t3, 0(sp)
+ADDI sp, sp, 4
+LW t2, 0(sp)
+ADDI sp, sp, 4
+LW t1, 0(sp)
+MV sp, fp
+LW fp, 0(fp)
+RET
+
+
+.section .strings
@@ -0,0 +1,163 @@
+; Symbol table GLOBAL
+; name sep type Type.STRING location 0x10000000 value " "
+; name nl type Type.STRING location 0x10000004 value "\n"
+; Function: Type.INT main([])
+
+; Symbol table main
+; name count type Type.INT location -4
+; name i type Type.INT location -8
+; name v type Type.INT location -12
+; name sum type Type.INT location -16
+; name f type Type.FLOAT location -20
+; name fsum type Type.FLOAT location -24
+
+.section .text
+;Current temp: 
+;IR Code: 
+MV fp, sp
+JR func_main
+HALT
+
+func_main:
+SW fp, 0(sp)
+MV fp, sp
+ADDI sp, sp, -4
+ADDI sp, sp, -24
+SW t1, 0(sp)
+ADDI sp, sp, -4
+SW t2, 0(sp)
+ADDI sp, sp, -4
+SW t3, 0(sp)
+ADDI sp, sp, -4
+SW t4, 0(sp)
+ADDI sp, sp, -4
+SW t5, 0(sp)
+ADDI sp, sp, -4
+SW t6, 0(sp)
+ADDI sp, sp, -4
+SW t7, 0(sp)
+ADDI sp, sp, -4
+SW t8, 0(sp)
+ADDI sp, sp, -4
+SW t9, 0(sp)
+ADDI sp, sp, -4
+SW t10, 0(sp)
+ADDI sp, sp, -4
+SW t11, 0(sp)
+ADDI sp, sp, -4
+SW t12, 0(sp)
+ADDI sp, sp, -4
+SW t13, 0(sp)
+ADDI sp, sp, -4
+SW t14, 0(sp)
+ADDI sp, sp, -4
+SW t15, 0(sp)
+ADDI sp, sp, -4
+SW t16, 0(sp)
+ADDI sp, sp, -4
+FSW f1, 0(sp)
+ADDI sp, sp, -4
+FSW f2, 0(sp)
+ADDI sp, sp, -4
+FSW f3, 0(sp)
+ADDI sp, sp, -4
+FSW f4, 0(sp)
+ADDI sp, sp, -4
+FSW f5, 0(sp)
+ADDI sp, sp, -4
+FSW f6, 0(sp)
+ADDI sp, sp, -4
+GETI t1
+SW t1, -4(fp)
+LI t2, 0
+SW t2, -8(fp)
+LI t3, 0
+SW t3, -16(fp)
+FIMM.S f1, 0.0
+FSW f1, -24(fp)
+loop_1:
+LW t4, -8(fp)
+LW t5, -4(fp)
+BGE t4, t5, out_1
+GETI t6
+SW t6, -12(fp)
+GETF f2
+FSW f2, -20(fp)
+LW t7, -16(fp)
+LW t8, -12(fp)
+ADD t9, t7, t8
+SW t9, -16(fp)
+FLW f3, -24(fp)
+FLW f4, -20(fp)
+FADD.S f5, f3, f4
+FSW f5, -24(fp)
+LW t10, -16(fp)
+PUTI t10
+LA t11, 0x10000000
+PUTS t11
+FLW f6, -24(fp)
+PUTF f6
+LA t12, 0x10000004
+PUTS t12
+LW t14, -8(fp)
+LI t13, 1
+ADD t15, t14, t13
+SW t15, -8(fp)
+J loop_1
+out_1:
+LI t16, 0
+SW t16, 8(fp)
+J func_ret_main
+func_ret_main:
+ADDI sp, sp, 4
+FLW f6, 0(sp)
+ADDI sp, sp, 4
+FLW f5, 0(sp)
+ADDI sp, sp, 4
+FLW f4, 0(sp)
+ADDI sp, sp, 4
+FLW f3, 0(sp)
+ADDI sp, sp, 4
+FLW f2, 0(sp)
+ADDI sp, sp, 4
+FLW f1, 0(sp)
+ADDI sp, sp, 4
+LW t16, 0(sp)
+ADDI sp, sp, 4
+LW t15, 0(sp)
+ADDI sp, sp, 4
+LW t14, 0(sp)
+ADDI sp, sp, 4
+LW t13, 0(sp)
+ADDI sp, sp, 4
+LW t12, 0(sp)
+ADDI sp, sp, 4
+LW t11, 0(sp)
+ADDI sp, sp, 4
+LW t10, 0(sp)
+ADDI sp, sp, 4
+LW t9, 0(sp)
+ADDI sp, sp, 4
+LW t8, 0(sp)
+ADDI sp, sp, 4
+LW t7, 0(sp)
+ADDI sp, sp, 4
+LW t6, 0(sp)
+ADDI sp, sp, 4
+LW t5, 0(sp)
+ADDI sp, sp, 4
+LW t4, 0(sp)
+ADDI sp, sp, 4
+LW t3, 0(sp)
+ADDI sp, sp, 4
+LW t2, 0(sp)
+ADDI sp, sp, 4
+LW t1, 0(sp)
+MV sp, fp
+LW fp, 0(fp)
+RET
+
+
+.section .strings
+0x10000000 " "
+0x10000004 "\n"
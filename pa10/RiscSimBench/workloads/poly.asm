@@ -0,0 +1,269 @@
+; Symbol table GLOBAL
+; name coeff type Type.FLOAT location 0x20000000
+; Function: Type.FLOAT poly([<Type.FLOAT: 3>, <Type.FLOAT: 3>, <Type.INT: 2>])
+; Function: Type.INT main([])
+
+; Symbol table main
+; name rep type Type.INT location -4
+; name total type Type.FLOAT location -8
+
+; Symbol table poly
+; name degree type Type.INT location 12
+; name x type Type.FLOAT location 16
+; name curVal type Type.FLOAT location 20
+
+.section .text
+;Current temp: 
+;IR Code: 
+MV fp, sp
+JR func_main
+HALT
+
+func_main:
+SW fp, 0(sp)
+MV fp, sp
+ADDI sp, sp, -4
+ADDI sp, sp, -8
+SW t1, 0(sp)
+ADDI sp, sp, -4
+SW t2, 0(sp)
+ADDI sp, sp, -4
+SW t3, 0(sp)
+ADDI sp, sp, -4
+SW t4, 0(sp)
+ADDI sp, sp, -4
+SW t5, 0(sp)
+ADDI sp, sp, -4
+SW t6, 0(sp)
+ADDI sp, sp, -4
+SW t7, 0(sp)
+ADDI sp, sp, -4
+SW t8, 0(sp)
+ADDI sp, sp, -4
+SW t9, 0(sp)
+ADDI sp, sp, -4
+FSW f1, 0(sp)
+ADDI sp, sp, -4
+FSW f2, 0(sp)
+ADDI sp, sp, -4
+FSW f3, 0(sp)
+ADDI sp, sp, -4
+FSW f4, 0(sp)
+ADDI sp, sp, -4
+FSW f5, 0(sp)
+ADDI sp, sp, -4
+FSW f6, 0(sp)
+ADDI sp, sp, -4
+FSW f7, 0(sp)
+ADDI sp, sp, -4
+FSW f8, 0(sp)
+ADDI sp, sp, -4
+FIMM.S f1, 0.0
+FSW f1, -8(fp)
+LI t1, 0
+SW t1, -4(fp)
+loop_1:
+LW t3, -4(fp)
+LI t2, 60
+BGE t3, t2, out_1
+FIMM.S f2, 0.5
+LA t4, 0x20000000
+FSW f2, 0(t4)
+FLW f6, -8(fp)
+FIMM.S f3, 0.0
+FSW f3, 0(sp)
+ADDI sp, sp, -4
+FIMM.S f4, 0.75
+FSW f4, 0(sp)
+ADDI sp, sp, -4
+LI t5, 40
+SW t5, 0(sp)
+ADDI sp, sp, -4
+ADDI sp, sp, -4
+SW ra, 0(sp)
+ADDI sp, sp, -4
+JR func_poly
+ADDI sp, sp, 4
+LW ra, 0(sp)
+ADDI sp, sp, 4
+FLW f5, 0(sp)
+ADDI sp, sp, 12
+FADD.S f7, f6, f5
+FSW f7, -8(fp)
+LW t7, -4(fp)
+LI t6, 1
+ADD t8, t7, t6
+SW t8, -4(fp)
+J loop_1
+out_1:
+FLW f8, -8(fp)
+PUTF f8
+LI t9, 0
+SW t9, 8(fp)
+J func_ret_main
+func_ret_main:
+ADDI sp, sp, 4
+FLW f8, 0(sp)
+ADDI sp, sp, 4
+FLW f7, 0(sp)
+ADDI sp, sp, 4
+FLW f6, 0(sp)
+ADDI sp, sp, 4
+FLW f5, 0(sp)
+ADDI sp, sp, 4
+FLW f4, 0(sp)
+ADDI sp, sp, 4
+FLW f3, 0(sp)
+ADDI sp, sp, 4
+FLW f2, 0(sp)
+ADDI sp, sp, 4
+FLW f1, 0(sp)
+ADDI sp, sp, 4
+LW t9, 0(sp)
+ADDI sp, sp, 4
+LW t8, 0(sp)
+ADDI sp, sp, 4
+LW t7, 0(sp)
+ADDI sp, sp, 4
+LW t6, 0(sp)
+ADDI sp, sp, 4
+LW t5, 0(sp)
+ADDI sp, sp, 4
+LW t4, 0(sp)
+ADDI sp, sp, 4
+LW t3, 0(sp)
+ADDI sp, sp, 4
+LW t2, 0(sp)
+ADDI sp, sp, 4
+LW t1, 0(sp)
+MV sp, fp
+LW fp, 0(fp)
+RET
+
+func_poly:
+SW fp, 0(sp)
+MV fp, sp
+ADDI sp, sp, -4
+ADDI sp, sp, 0
+SW t1, 0(sp)
+ADDI sp, sp, -4
+SW t2, 0(sp)
+ADDI sp, sp, -4
+SW t3, 0(sp)
+ADDI sp, sp, -4
+SW t4, 0(sp)
+ADDI sp, sp, -4
+SW t5, 0(sp)
+ADDI sp, sp, -4
+SW t6, 0(sp)
+ADDI sp, sp, -4
+SW t7, 0(sp)
+ADDI sp, sp, -4
+SW t8, 0(sp)
+ADDI sp, sp, -4
+FSW f1, 0(sp)
+ADDI sp, sp, -4
+FSW f2, 0(sp)
+ADDI sp, sp, -4
+FSW f3, 0(sp)
+ADDI sp, sp, -4
+FSW f4, 0(sp)
+ADDI sp, sp, -4
+FSW f5, 0(sp)
+ADDI sp, sp, -4
+FSW f6, 0(sp)
+ADDI sp, sp, -4
+FSW f7, 0(sp)
+ADDI sp, sp, -4
+FSW f8, 0(sp)
+ADDI sp, sp, -4
+FSW f9, 0(sp)
+ADDI sp, sp, -4
+FSW f10, 0(sp)
+ADDI sp, sp, -4
+FSW f11, 0(sp)
+ADDI sp, sp, -4
+LW t2, 12(fp)
+LI t1, 0
+BLE t2, t1, out_2
+FLW f1, 20(fp)
+FSW f1, 0(sp)
+ADDI sp, sp, -4
+FLW f2, 16(fp)
+FSW f2, 0(sp)
+ADDI sp, sp, -4
+LW t4, 12(fp)
+LI t3, 1
+SUB t5, t4, t3
+SW t5, 0(sp)
+ADDI sp, sp, -4
+ADDI sp, sp, -4
+SW ra, 0(sp)
+ADDI sp, sp, -4
+JR func_poly
+ADDI sp, sp, 4
+LW ra, 0(sp)
+ADDI sp, sp, 4
+FLW f3, 0(sp)
+ADDI sp, sp, 12
+FSW f3, 20(fp)
+out_2:
+LA t6, 0x20000000
+FLW f5, 0(t6)
+FIMM.S f4, 0.25
+FADD.S f6, f5, f4
+LA t7, 0x20000000
+FSW f6, 0(t7)
+FLW f7, 16(fp)
+FLW f8, 20(fp)
+FMUL.S f9, f7, f8
+LA t8, 0x20000000
+FLW f10, 0(t8)
+FADD.S f11, f9, f10
+FSW f11, 8(fp)
+J func_ret_poly
+func_ret_poly:
+ADDI sp, sp, 4
+FLW f11, 0(sp)
+ADDI sp, sp, 4
+FLW f10, 0(sp)
+ADDI sp, sp, 4
+FLW f9, 0(sp)
+ADDI sp, sp, 4
+FLW f8, 0(sp)
+ADDI sp, sp, 4
+FLW f7, 0(sp)
+ADDI sp, sp, 4
+FLW f6, 0(sp)
+ADDI sp, sp, 4
+FLW f5, 0(sp)
+ADDI sp, sp, 4
+FLW f4, 0(sp)
+ADDI sp, sp, 4
+FLW f3, 0(sp)
+ADDI sp, sp, 4
+FLW f2, 0(sp)
+ADDI sp, sp, 4
+FLW f1, 0(sp)
+ADDI sp, sp, 4
+LW t8, 0(sp)
+ADDI sp, sp, 4
+LW t7, 0(sp)
+ADDI sp, sp, 4
+LW t6, 0(sp)
+ADDI sp, sp, 4
+LW t5, 0(sp)
+ADDI sp, sp, 4
+LW t4, 0(sp)
+ADDI sp, sp, 4
+LW t3, 0(sp)
+ADDI sp, sp, 4
+LW t2, 0(sp)
+ADDI sp, sp, 4
+LW t1, 0(sp)
+MV sp, fp
+LW fp, 0(fp)
+RET
+
+
+.section .strings
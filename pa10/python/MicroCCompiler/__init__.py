@@ -1,3 +1,6 @@
 from .assembly import *
 from .ast import *
+from .analysis import *
 from .compiler import *
+from .ir import *
+from .optimization import *
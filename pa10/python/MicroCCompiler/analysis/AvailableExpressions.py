@@ -0,0 +1,68 @@
+from typing import Callable, Dict, List, Set, Tuple
+
+from ..assembly.instructions import *
+from .ControlFlowGraph import ControlFlowGraph
+from .DataflowProblem import DataflowProblem
+
+class AvailableExpressions(DataflowProblem):
+  # Forward "must" problem: which computations have been done on every path to a point
+  # with none of their operands written since.
+  # An expression is (opcode, src1, src2, label) of an arithmetic or constant-producing instruction;
+  # it stops being available once one of its operands is written.
+
+  PURE = (Instruction3O, Li, La, FImm, Neg, FNeg)
+
+  def __init__(self, cfg: ControlFlowGraph, isRegister: Callable[[str], bool]):
+    super().__init__(cfg, DataflowProblem.FORWARD, union=False)
+    self.isRegister = isRegister
+
+    u = self.universe
+    # register -> bitset of the expressions that read it
+    self.readers: Dict[str, int] = {}
+    for inst in cfg.code:
+      e = self.expression(inst)
+      if e is not None:
+        bit = 1 << u.add(e)
+        for r in inst.getSources():
+          self.readers[r] = self.readers.get(r, 0) | bit
+
+    for block in cfg.blocks:
+      gen = 0
+      kill = 0
+      for i in range(block.start, block.start + len(block)):
+        gen, killed = self.step(cfg.code[i], gen)
+        kill |= killed
+      self.gen[block.index] = gen
+      self.kill[block.index] = kill
+
+    self.solve()
+
+  @staticmethod
+  def expression(inst) -> Tuple:
+    if not isinstance(inst, AvailableExpressions.PURE):
+      return None
+    return (str(inst.oc), getattr(inst, 'src1', None), getattr(inst, 'src2', None), getattr(inst, 'label', None))
+
+  def step(self, inst, available: int) -> Tuple[int, int]:
+    # the available set after inst, and the expressions inst kills
+    killed = 0
+    for r in inst.getDests():
+      killed |= self.readers.get(r, 0)
+    if isinstance(inst, Jr):
+      # the callee may write any register it does not save
+      killed = self.universe.full()
+    available &= ~killed
+    e = self.expression(inst)
+    if e is not None and not (set(inst.getDests()) & set(inst.getSources())):
+      available |= self.universe.bit(e)
+    return available, killed
+
+  def instructionAvailableIn(self) -> List[Set[Tuple]]:
+    # expressions available just before each instruction of the code
+    availableIn: List[Set[Tuple]] = [set() for _ in self.cfg.code]
+    for block in self.cfg.blocks:
+      available = self.blockIn[block.index]
+      for i in range(block.start, block.start + len(block)):
+        availableIn[i] = self.universe.toSet(available)
+        available, _ = self.step(self.cfg.code[i], available)
+    return availableIn
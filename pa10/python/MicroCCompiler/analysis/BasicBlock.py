@@ -0,0 +1,33 @@
+from typing import List
+
+from ..assembly.instructions import Label
+
+class BasicBlock:
+  # A maximal run of instructions entered only at the top and left only at the bottom.
+  # start is the index of the first instruction in the function's InstructionList.
+  def __init__(self, index: int, start: int):
+    self.index = index
+    self.start = start
+    self.instructions = []
+    self.successors: List['BasicBlock'] = []
+    self.predecessors: List['BasicBlock'] = []
+
+  def getLabel(self):
+    # the label that starts this block, if any
+    if len(self.instructions) > 0 and isinstance(self.instructions[0], Label):
+      return self.instructions[0].label
+    return None
+
+  def getLast(self):
+    return self.instructions[-1]
+
+  def addSuccessor(self, block: 'BasicBlock'):
+    if block not in self.successors:
+      self.successors.append(block)
+      block.predecessors.append(self)
+
+  def __len__(self):
+    return len(self.instructions)
+
+  def __str__(self):
+    return "B" + str(self.index) + " -> " + ", ".join("B" + str(b.index) for b in self.successors)
@@ -0,0 +1,83 @@
+from typing import Dict, List
+
+from ..assembly.InstructionList import InstructionList
+from ..assembly.instructions import *
+from .BasicBlock import BasicBlock
+
+class ControlFlowGraph:
+  # Basic blocks of one function body (or any straight InstructionList) with successor/predecessor edges.
+  # Blocks start at labels and after branches, jumps, calls and returns. A jump to a label outside
+  # the list (the function's return label) leaves the graph: that block has no successor.
+
+  def __init__(self, code: InstructionList):
+    self.code = code
+    self.blocks: List[BasicBlock] = []
+    self.labels: Dict[str, BasicBlock] = {}
+    self.build()
+
+  @staticmethod
+  def endsBlock(inst) -> bool:
+    return isinstance(inst, (InstructionBranch, J, Jr, Ret, Halt))
+
+  def build(self):
+    block = None
+    for i, inst in enumerate(self.code):
+      if block is None or (isinstance(inst, Label) and len(block) > 0):
+        block = BasicBlock(len(self.blocks), i)
+        self.blocks.append(block)
+      block.instructions.append(inst)
+      if isinstance(inst, Label):
+        self.labels[inst.label] = block
+      if self.endsBlock(inst):
+        block = None
+
+    for b, block in enumerate(self.blocks):
+      last = block.getLast()
+      fallThrough = self.blocks[b + 1] if b + 1 < len(self.blocks) else None
+      if isinstance(last, J):
+        if last.label in self.labels:
+          block.addSuccessor(self.labels[last.label])
+      elif isinstance(last, InstructionBranch):
+        if fallThrough is not None:
+          block.addSuccessor(fallThrough)
+        if last.label in self.labels:
+          block.addSuccessor(self.labels[last.label])
+      elif isinstance(last, (Ret, Halt)):
+        pass
+      elif fallThrough is not None:
+        block.addSuccessor(fallThrough)
+
+  def getEntry(self) -> BasicBlock:
+    return self.blocks[0] if len(self.blocks) > 0 else None
+
+  def getExits(self) -> List[BasicBlock]:
+    return [b for b in self.blocks if len(b.successors) == 0]
+
+  def postorder(self) -> List[BasicBlock]:
+    # every block, including ones unreachable from the entry, in postorder of a depth-first walk
+    order = []
+    visited = set()
+    for root in self.blocks:
+      if root.index in visited:
+        continue
+      visited.add(root.index)
+      stack = [(root, iter(root.successors))]
+      while len(stack) > 0:
+        block, succs = stack[-1]
+        advanced = False
+        for s in succs:
+          if s.index not in visited:
+            visited.add(s.index)
+            stack.append((s, iter(s.successors)))
+            advanced = True
+            break
+        if not advanced:
+          stack.pop()
+          order.append(block)
+    return order
+
+  def reversePostorder(self) -> List[BasicBlock]:
+    return list(reversed(self.postorder()))
+
+  def __str__(self):
+    return "\n".join(str(b) for b in self.blocks)
@@ -0,0 +1,81 @@
+from collections import deque
+from typing import List, Set
+
+from .BasicBlock import BasicBlock
+from .ControlFlowGraph import ControlFlowGraph
+from .Universe import Universe
+
+class DataflowProblem:
+  # A gen/kill dataflow problem over the blocks of a ControlFlowGraph, solved with a worklist.
+  # Facts are numbered by a Universe and every set of facts is an int bitset, so meet and
+  # transfer are a handful of integer operations per block however large the function is.
+  #
+  # Subclasses fill in universe, gen and kill (one bitset per block) and pick a direction,
+  # a meet (union for "may" problems, intersection for "must" problems) and the boundary value
+  # that holds at the entry (forward) or at blocks without successors (backward).
+
+  FORWARD = 'forward'
+  BACKWARD = 'backward'
+
+  def __init__(self, cfg: ControlFlowGraph, direction: str, union: bool = True):
+    self.cfg = cfg
+    self.direction = direction
+    self.union = union
+    self.universe = Universe()
+    self.boundary = 0
+    n = len(cfg.blocks)
+    self.gen: List[int] = [0] * n
+    self.kill: List[int] = [0] * n
+    self.blockIn: List[int] = [0] * n
+    self.blockOut: List[int] = [0] * n
+
+  def transfer(self, block: BasicBlock, value: int) -> int:
+    return self.gen[block.index] | (value & ~self.kill[block.index])
+
+  def meet(self, values: List[int]) -> int:
+    if self.union:
+      result = 0
+      for v in values:
+        result |= v
+    else:
+      result = self.universe.full()
+      for v in values:
+        result &= v
+    return result
+
+  def solve(self):
+    forward = self.direction == DataflowProblem.FORWARD
+    top = 0 if self.union else self.universe.full()
+    n = len(self.cfg.blocks)
+    self.blockIn = [top] * n
+    self.blockOut = [top] * n
+    # the meet side of each block is blockIn going forward and blockOut going backward
+    before, after = (self.blockIn, self.blockOut) if forward else (self.blockOut, self.blockIn)
+    entry = self.cfg.getEntry()
+
+    order = self.cfg.reversePostorder() if forward else self.cfg.postorder()
+    worklist = deque(order)
+    queued = set(b.index for b in order)
+    while len(worklist) > 0:
+      block = worklist.popleft()
+      queued.discard(block.index)
+
+      neighbours = block.predecessors if forward else block.successors
+      values = [after[b.index] for b in neighbours]
+      if (forward and block is entry) or (not forward and len(neighbours) == 0):
+        values.append(self.boundary)
+      before[block.index] = self.meet(values)
+
+      value = self.transfer(block, before[block.index])
+      if value != after[block.index]:
+        after[block.index] = value
+        for b in (block.successors if forward else block.predecessors):
+          if b.index not in queued:
+            queued.add(b.index)
+            worklist.append(b)
+
+  def getIn(self, block: BasicBlock) -> Set:
+    return self.universe.toSet(self.blockIn[block.index])
+
+  def getOut(self, block: BasicBlock) -> Set:
+    return self.universe.toSet(self.blockOut[block.index])
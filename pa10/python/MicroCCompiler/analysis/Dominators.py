@@ -0,0 +1,35 @@
+from typing import Set
+
+from .DataflowProblem import DataflowProblem
+
+class Dominators(DataflowProblem):
+  # Dominator sets as a forward "must" problem: out(b) = {b} | meet of out over the predecessors.
+  # With post=True the same problem runs backward and gives postdominators, where every block
+  # without successors counts as an exit. Works on a ControlFlowGraph or an IRFunction.
+
+  def __init__(self, cfg, post: bool = False):
+    super().__init__(cfg, DataflowProblem.BACKWARD if post else DataflowProblem.FORWARD, union=False)
+    self.post = post
+    for block in cfg.blocks:
+      self.universe.add(block)
+    for block in cfg.blocks:
+      self.gen[block.index] = self.universe.bit(block)
+    self.solve()
+    self.idoms = {}
+
+  def dominators(self, block) -> Set:
+    # blocks that (post)dominate block, including itself
+    return self.universe.toSet(self.blockIn[block.index] if self.post else self.blockOut[block.index])
+
+  def dominates(self, a, b) -> bool:
+    bits = self.blockIn[b.index] if self.post else self.blockOut[b.index]
+    return bits & self.universe.bit(a) != 0
+
+  def immediateDominator(self, block):
+    # the closest strict (post)dominator: since strict dominators form a chain,
+    # it is the one that has the most (post)dominators itself
+    if block in self.idoms:
+      return self.idoms[block]
+    strict = [d for d in self.dominators(block) if d is not block]
+    self.idoms[block] = None if len(strict) == 0 else max(strict, key=lambda d: bin(self.blockIn[d.index] if self.post else self.blockOut[d.index]).count('1'))
+    return self.idoms[block]
@@ -0,0 +1,53 @@
+from typing import List, Set, Union
+
+from ..assembly.instructions import *
+from .ControlFlowGraph import ControlFlowGraph
+from .DataflowProblem import DataflowProblem
+
+class LiveSlots(DataflowProblem):
+  # Backward liveness of the fp-relative words of a function's frame, by offset.
+  # MicroC cannot take the address of a local, so only loads and stores through fp reach the frame,
+  # and a call cannot read the caller's slots. Once the function is left only slots at non-negative
+  # offsets (the return value and the arguments, which belong to the caller) can still be read.
+
+  def __init__(self, cfg: ControlFlowGraph):
+    super().__init__(cfg, DataflowProblem.BACKWARD, union=True)
+    self.uses: List[int] = []
+    self.defs: List[int] = []
+
+    u = self.universe
+    for inst in cfg.code:
+      slot = self.slot(inst)
+      use = 1 << u.add(slot) if slot is not None and isinstance(inst, (Lw, Flw)) else 0
+      d = 1 << u.add(slot) if slot is not None and isinstance(inst, (Sw, Fsw)) else 0
+      self.uses.append(use)
+      self.defs.append(d)
+    self.boundary = u.toBits(o for o in u.items if o >= 0)
+
+    for block in cfg.blocks:
+      gen = 0
+      kill = 0
+      for i in range(block.start + len(block) - 1, block.start - 1, -1):
+        gen = self.uses[i] | (gen & ~self.defs[i])
+        kill |= self.defs[i]
+      self.gen[block.index] = gen
+      self.kill[block.index] = kill
+
+    self.solve()
+
+  @staticmethod
+  def slot(inst) -> Union[int, None]:
+    # the frame offset inst loads or stores, if it accesses the frame
+    if isinstance(inst, InstructionLS) and inst.src1 == "fp":
+      return int(inst.label)
+    return None
+
+  def instructionLiveOut(self) -> List[Set[int]]:
+    # slots live just after each instruction of the code, indexed like the code
+    liveOut: List[Set[int]] = [set() for _ in self.cfg.code]
+    for block in self.cfg.blocks:
+      live = self.blockOut[block.index]
+      for i in range(block.start + len(block) - 1, block.start - 1, -1):
+        liveOut[i] = self.universe.toSet(live)
+        live = self.uses[i] | (live & ~self.defs[i])
+    return liveOut
@@ -0,0 +1,50 @@
+from typing import Callable, Iterable, List, Set
+
+from .ControlFlowGraph import ControlFlowGraph
+from .DataflowProblem import DataflowProblem
+
+class LiveVariables(DataflowProblem):
+  # Backward liveness of registers. Only names accepted by isRegister are tracked.
+  # exitLive holds the registers read after the code is left: by default nothing, since
+  # jumps to the function's return label carry no value in a register.
+
+  def __init__(self, cfg: ControlFlowGraph, isRegister: Callable[[str], bool], exitLive: Iterable[str] = ()):
+    super().__init__(cfg, DataflowProblem.BACKWARD, union=True)
+    self.isRegister = isRegister
+    self.uses: List[int] = []
+    self.defs: List[int] = []
+
+    u = self.universe
+    for inst in cfg.code:
+      use = 0
+      for r in inst.getSources():
+        if isRegister(r):
+          use |= 1 << u.add(r)
+      d = 0
+      for r in inst.getDests():
+        if isRegister(r):
+          d |= 1 << u.add(r)
+      self.uses.append(use)
+      self.defs.append(d)
+    self.boundary = u.toBits(r for r in exitLive if isRegister(r))
+
+    for block in cfg.blocks:
+      gen = 0
+      kill = 0
+      for i in range(block.start + len(block) - 1, block.start - 1, -1):
+        gen = self.uses[i] | (gen & ~self.defs[i])
+        kill |= self.defs[i]
+      self.gen[block.index] = gen
+      self.kill[block.index] = kill
+
+    self.solve()
+
+  def instructionLiveOut(self) -> List[Set[str]]:
+    # registers live just after each instruction of the code, indexed like the code
+    liveOut: List[Set[str]] = [set() for _ in self.cfg.code]
+    for block in self.cfg.blocks:
+      live = self.blockOut[block.index]
+      for i in range(block.start + len(block) - 1, block.start - 1, -1):
+        liveOut[i] = self.universe.toSet(live)
+        live = self.uses[i] | (live & ~self.defs[i])
+    return liveOut
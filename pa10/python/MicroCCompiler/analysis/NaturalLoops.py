@@ -0,0 +1,42 @@
+from typing import Dict, List, Set
+
+from .Dominators import Dominators
+
+class Loop:
+  # A natural loop: its header and every block that reaches one of its back edges without passing the header.
+  def __init__(self, header):
+    self.header = header
+    self.blocks: Set = {header}
+    self.latches: List = []
+
+  def exiting(self) -> List:
+    # blocks of the loop with an edge leaving it
+    return [b for b in self.blocks if any(s not in self.blocks for s in b.successors)]
+
+  def outsidePredecessors(self) -> List:
+    return [p for p in self.header.predecessors if p not in self.blocks]
+
+class NaturalLoops:
+  # The natural loops of a ControlFlowGraph or IRFunction, found from back edges (an edge into a
+  # block that dominates its source). Back edges sharing a header make one loop. Loops come
+  # innermost first, ordered by size.
+
+  def __init__(self, cfg, dominators: Dominators = None):
+    self.dominators = dominators if dominators is not None else Dominators(cfg)
+    loops: Dict = {}
+    for block in cfg.blocks:
+      for header in block.successors:
+        if not self.dominators.dominates(header, block):
+          continue
+        loop = loops.setdefault(header, Loop(header))
+        loop.latches.append(block)
+        stack = [block]
+        while len(stack) > 0:
+          b = stack.pop()
+          if b not in loop.blocks:
+            loop.blocks.add(b)
+            stack.extend(b.predecessors)
+    self.loops: List[Loop] = sorted(loops.values(), key=lambda l: len(l.blocks))
+
+  def __iter__(self):
+    return iter(self.loops)
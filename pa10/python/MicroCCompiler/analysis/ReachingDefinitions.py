@@ -0,0 +1,45 @@
+from typing import Callable, Dict, List, Set
+
+from .ControlFlowGraph import ControlFlowGraph
+from .DataflowProblem import DataflowProblem
+
+class ReachingDefinitions(DataflowProblem):
+  # Forward "may" problem: which writes of a register can reach each point.
+  # A definition is the index of the writing instruction in the code.
+
+  def __init__(self, cfg: ControlFlowGraph, isRegister: Callable[[str], bool]):
+    super().__init__(cfg, DataflowProblem.FORWARD, union=True)
+    self.isRegister = isRegister
+
+    u = self.universe
+    # register -> bitset of every definition of it
+    self.definitionsOf: Dict[str, int] = {}
+    for i, inst in enumerate(cfg.code):
+      for r in inst.getDests():
+        if isRegister(r):
+          self.definitionsOf[r] = self.definitionsOf.get(r, 0) | (1 << u.add(i))
+
+    for block in cfg.blocks:
+      gen = 0
+      kill = 0
+      for i in range(block.start, block.start + len(block)):
+        for r in cfg.code[i].getDests():
+          if isRegister(r):
+            kill |= self.definitionsOf[r]
+            gen = (gen & ~self.definitionsOf[r]) | u.bit(i)
+      self.gen[block.index] = gen
+      self.kill[block.index] = kill
+
+    self.solve()
+
+  def instructionReachIn(self) -> List[Set[int]]:
+    # definitions reaching each instruction of the code, before it executes
+    reachIn: List[Set[int]] = [set() for _ in self.cfg.code]
+    for block in self.cfg.blocks:
+      reach = self.blockIn[block.index]
+      for i in range(block.start, block.start + len(block)):
+        reachIn[i] = self.universe.toSet(reach)
+        for r in self.cfg.code[i].getDests():
+          if self.isRegister(r):
+            reach = (reach & ~self.definitionsOf[r]) | self.universe.bit(i)
+    return reachIn
@@ -0,0 +1,42 @@
+from typing import Dict, Iterable, List, Set
+
+class Universe:
+  # Numbers the facts of a dataflow problem so that sets of facts are plain int bitsets.
+  def __init__(self, items: Iterable = ()):
+    self.items: List = []
+    self.bits: Dict = {}
+    for item in items:
+      self.add(item)
+
+  def add(self, item) -> int:
+    if item not in self.bits:
+      self.bits[item] = len(self.items)
+      self.items.append(item)
+    return self.bits[item]
+
+  def bit(self, item) -> int:
+    return 1 << self.bits[item]
+
+  def __contains__(self, item) -> bool:
+    return item in self.bits
+
+  def __len__(self) -> int:
+    return len(self.items)
+
+  def full(self) -> int:
+    return (1 << len(self.items)) - 1
+
+  def toBits(self, items: Iterable) -> int:
+    bits = 0
+    for item in items:
+      if item in self.bits:
+        bits |= 1 << self.bits[item]
+    return bits
+
+  def toSet(self, bits: int) -> Set:
+    result = set()
+    while bits:
+      low = bits & -bits
+      result.add(self.items[low.bit_length() - 1])
+      bits ^= low
+    return result
@@ -0,0 +1,10 @@
+from .BasicBlock import BasicBlock
+from .ControlFlowGraph import ControlFlowGraph
+from .Universe import Universe
+from .DataflowProblem import DataflowProblem
+from .LiveVariables import LiveVariables
+from .LiveSlots import LiveSlots
+from .ReachingDefinitions import ReachingDefinitions
+from .AvailableExpressions import AvailableExpressions
+from .Dominators import Dominators
+from .NaturalLoops import NaturalLoops, Loop
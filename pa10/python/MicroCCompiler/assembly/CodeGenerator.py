@@ -1,17 +1,34 @@
 import sys
 import os
-from typing import List
+from typing import List, Tuple
 
 from .CodeObject import CodeObject
 from .InstructionList import InstructionList
+from .RegisterAllocator import RegisterAllocator
+from .SaveSetAnalysis import SaveSetAnalysis
+from ..optimization.Peephole import Peephole
+from ..optimization.LocalValueNumbering import LocalValueNumbering
+from ..optimization.LoopInvariantCodeMotion import LoopInvariantCodeMotion
+from ..optimization.LoopRotation import LoopRotation
+from ..optimization.StrengthReduction import StrengthReduction
+from ..optimization.ListScheduler import ListScheduler
+from ..optimization.DeadStoreElimination import DeadStoreElimination
+from ..optimization.InductionVariables import InductionVariables
+from ..optimization.SparseConstantPropagation import SparseConstantPropagation
+from ..optimization.AggressiveDeadCodeElimination import AggressiveDeadCodeElimination
+from ..ir import IRBuilder, IRLowering
 from .instructions import *
 from ..compiler import *
+from ..compiler.SymbolTable import StaticVariables
 from ..ast import *
 from ..ast.visitor.AbstractASTVisitor import AbstractASTVisitor
+from ..ast.visitor.ScalarPromotion import ScalarPromotion
 
 class CodeGenerator(AbstractASTVisitor):
 
-  def __init__(self):
+  def __init__(self, options: Options = None):
+    self.options = options if options is not None else Options()
+    self.options.resolve()
     self.intRegCount = 0
     self.floatRegCount = 0
     self.intTempPrefix = 't'
@@ -19,7 +36,24 @@ class CodeGenerator(AbstractASTVisitor):
     self.loopLabel = 0
     self.elseLabel = 0
     self.outLabel = 0
+    self.blockLabel = 0
+    self.inlineLabel = 0
+    # (end label, result symbol) of each InlineNode being generated, innermost last
+    self.inlineExits = []
+    # set when the current function jumps back to its own start for a self tail call
+    self.selfTailCalled = False
+    # set once some global is addressed through gp, which the program then has to set up
+    self.usesGp = False
     self.currFunc = None
+    self.currScope = None
+    self.functionFrames = []
+    # the temp holding each symbol that lives in a register (register parameters, and with -fpromote
+    # locals and the globals of the loop being generated), and the moves that fill them on entry
+    self.homes = {}
+    self.entryMoves = InstructionList()
+    # globals the loop being generated keeps in homes, and those it has to store when left
+    self.promotedGlobals = []
+    self.promotedStores = []
 
   def getIntRegCount(self):
     return self.intRegCount
@@ -65,41 +99,45 @@ class CodeGenerator(AbstractASTVisitor):
       right = self.rvalify(right)
     co.code.extend(right.code)
 
-    op = node.getOp()
     resultType = left.type
+    code, temp = self._generateBinaryOp(node.getOp(), resultType, left.temp, right.temp)
+    co.code.extend(code)
 
+    co.temp = temp
+    co.lval = False
+    co.type = resultType
+
+    return co
+
+  def _generateBinaryOp(self, op: BinaryOpNode.OpType, resultType: Scope.Type, left: str, right: str) -> Tuple[InstructionList, str]:
+    code = InstructionList()
     if resultType == Scope.Type.INT:
       temp = self.generateTemp(Scope.Type.INT)
       if op == BinaryOpNode.OpType.ADD:
-        co.code.append(Add(left.temp, right.temp, temp))
+        code.append(Add(left, right, temp))
       elif op == BinaryOpNode.OpType.SUB:
-        co.code.append(Sub(left.temp, right.temp, temp))
+        code.append(Sub(left, right, temp))
       elif op == BinaryOpNode.OpType.MUL:
-        co.code.append(Mul(left.temp, right.temp, temp))
+        code.append(Mul(left, right, temp))
       elif op == BinaryOpNode.OpType.DIV:
-        co.code.append(Div(left.temp, right.temp, temp))
+        code.append(Div(left, right, temp))
       else:
         raise Exception("Unknown binary op for INT")
     elif resultType == Scope.Type.FLOAT:
       temp = self.generateTemp(Scope.Type.FLOAT)
       if op == BinaryOpNode.OpType.ADD:
-        co.code.append(FAdd(left.temp, right.temp, temp))
+        code.append(FAdd(left, right, temp))
       elif op == BinaryOpNode.OpType.SUB:
-        co.code.append(FSub(left.temp, right.temp, temp))
+        code.append(FSub(left, right, temp))
       elif op == BinaryOpNode.OpType.MUL:
-        co.code.append(FMul(left.temp, right.temp, temp))
+        code.append(FMul(left, right, temp))
       elif op == BinaryOpNode.OpType.DIV:
-        co.code.append(FDiv(left.temp, right.temp, temp))
+        code.append(FDiv(left, right, temp))
       else:
         raise Exception("Unknown binary op for FLOAT")
     else:
       raise Exception("Bad type in binary op node")
-
-    co.temp = temp
-    co.lval = False
-    co.type = resultType
-
-    return co
+    return code, temp
 
   def postprocessUnaryOpNode(self, node: UnaryOpNode, expr: CodeObject) -> CodeObject:
     co = CodeObject()
@@ -130,7 +168,12 @@ class CodeGenerator(AbstractASTVisitor):
     co.code.extend(right.code)
 
     sym = left.getSTE()
-    if sym.isLocal():
+    if sym in self.homes:
+      if left.type == Scope.Type.INT:
+        co.code.append(Mv(right.temp, self.homes[sym]))
+      else:
+        co.code.append(FMv(right.temp, self.homes[sym]))
+    elif sym.isLocal():
       offset = sym.addressToString()
       if left.type == Scope.Type.INT:
         co.code.append(Sw(right.temp, "fp", offset))
@@ -139,13 +182,12 @@ class CodeGenerator(AbstractASTVisitor):
       else:
         raise Exception("Bad type in assign node")
     else:
-      address = self.generateAddrFromVariable(left)
-      addrTemp = self.generateTemp(Scope.Type.INT)
-      co.code.append(La(addrTemp, address))
+      code, base, offset = self._globalAddress(sym)
+      co.code.extend(code)
       if left.type == Scope.Type.INT:
-        co.code.append(Sw(right.temp, addrTemp, '0'))
+        co.code.append(Sw(right.temp, base, offset))
       elif left.type == Scope.Type.FLOAT:
-        co.code.append(Fsw(right.temp, addrTemp, '0'))
+        co.code.append(Fsw(right.temp, base, offset))
       else:
         raise Exception("Bad type in assign node")
 
@@ -169,21 +211,25 @@ class CodeGenerator(AbstractASTVisitor):
     if var.type is Scope.Type.INT:
       temp = self.generateTemp(Scope.Type.INT)
       co.code.append(GetI(temp))
-      if sym.isLocal():
+      if sym in self.homes:
+        co.code.append(Mv(temp, self.homes[sym]))
+      elif sym.isLocal():
         co.code.append(Sw(temp, "fp", sym.addressToString()))
       else:
-        addrTemp = self.generateTemp(Scope.Type.INT)
-        co.code.append(La(addrTemp, sym.addressToString()))
-        co.code.append(Sw(temp, addrTemp, '0'))
+        code, base, offset = self._globalAddress(sym)
+        co.code.extend(code)
+        co.code.append(Sw(temp, base, offset))
     elif var.type is Scope.Type.FLOAT:
       temp = self.generateTemp(Scope.Type.FLOAT)
       co.code.append(GetF(temp))
-      if sym.isLocal():
+      if sym in self.homes:
+        co.code.append(FMv(temp, self.homes[sym]))
+      elif sym.isLocal():
         co.code.append(Fsw(temp, "fp", sym.addressToString()))
       else:
-        addrTemp = self.generateTemp(Scope.Type.INT)
-        co.code.append(La(addrTemp, sym.addressToString()))
-        co.code.append(Fsw(temp, addrTemp, '0'))
+        code, base, offset = self._globalAddress(sym)
+        co.code.extend(code)
+        co.code.append(Fsw(temp, base, offset))
     else:
       raise Exception("Bad type in read node")
 
@@ -225,22 +271,29 @@ class CodeGenerator(AbstractASTVisitor):
       right = self.rvalify(right)
     co.code.extend(right.code)
 
-    op = node.getOp()
+    cond = self._generateCondition(node.getOp(), left.type, left.temp, right.temp)
+    co.code.extend(cond.code)
+    co.temp, co.temp2, co.cmptype = cond.temp, cond.temp2, cond.cmptype
+    return co
+
+  def _generateCondition(self, op: str, type: Scope.Type, left: str, right: str) -> CodeObject:
+    # the returned temp, temp2 and cmptype make _makeBranch jump when `left op right` does not hold
+    co = CodeObject()
     rev_op = self._reverseOpString(op)
 
-    if left.type == Scope.Type.INT:
-      co.temp = left.temp
-      co.temp2 = right.temp
+    if type == Scope.Type.INT:
+      co.temp = left
+      co.temp2 = right
       co.cmptype = rev_op
-    elif left.type == Scope.Type.FLOAT:
+    elif type == Scope.Type.FLOAT:
       cmpTemp = self.generateTemp(Scope.Type.INT)
 
       if op in ('<', '>='):
-        co.code.append(Flt(left.temp, right.temp, cmpTemp))
+        co.code.append(Flt(left, right, cmpTemp))
       elif op in ('<=', '>'):
-        co.code.append(Fle(left.temp, right.temp, cmpTemp))
+        co.code.append(Fle(left, right, cmpTemp))
       elif op in ('==', '!='):
-        co.code.append(Feq(left.temp, right.temp, cmpTemp))
+        co.code.append(Feq(left, right, cmpTemp))
       else:
         raise Exception("Unknown float cmp op: " + str(op))
 
@@ -282,6 +335,46 @@ class CodeGenerator(AbstractASTVisitor):
     co.type = None
     return co
 
+  def visitWhileNode(self, node: WhileNode) -> CodeObject:
+    if not self.options.enabled('promote') or len(self.promotedGlobals) > 0:
+      return super().visitWhileNode(node)
+    promoted, stored = ScalarPromotion.candidates(node)
+    if len(promoted) == 0:
+      return super().visitWhileNode(node)
+
+    # the loop is only entered when its condition holds, so loading the globals reads nothing it would not
+    co = CodeObject()
+    self.outLabel += 1
+    skipLabelStr = "out_" + str(self.outLabel)
+    guard = node.getCondExpr().accept(self)
+    co.code.extend(guard.code)
+    co.code.extend(self._makeBranch(guard, skipLabelStr))
+    for sym in promoted:
+      value = self.rvalify(self._lvalue(sym))
+      co.code.extend(value.code)
+      self.homes[sym] = value.temp
+
+    self.promotedGlobals, self.promotedStores = promoted, stored
+    co.code.extend(super().visitWhileNode(node).code)
+    co.code.extend(self._storePromotedGlobals())
+    for sym in promoted:
+      del self.homes[sym]
+    self.promotedGlobals, self.promotedStores = [], []
+
+    co.code.append(Label(skipLabelStr))
+    co.lval = False
+    co.type = None
+    return co
+
+  def _storePromotedGlobals(self) -> InstructionList:
+    # control leaves the loop holding globals in temps: memory gets their current values
+    code = InstructionList()
+    for sym in self.promotedStores:
+      address, base, offset = self._globalAddress(sym)
+      code.extend(address)
+      code.append((Fsw if sym.getType() == Scope.Type.FLOAT else Sw)(self.homes[sym], base, offset))
+    return code
+
   def postprocessWhileNode(self, node: WhileNode, cond: CodeObject, wlist: CodeObject) -> CodeObject:
     co = CodeObject()
 
@@ -301,82 +394,342 @@ class CodeGenerator(AbstractASTVisitor):
     co.type = None
     return co
 
+  def visitReturnNode(self, node: ReturnNode) -> CodeObject:
+    if self._isSelfTailCall(node):
+      return self._generateSelfTailCall(node.getRetExpr())
+    return super().visitReturnNode(node)
+
+  def _isSelfTailCall(self, node: ReturnNode) -> bool:
+    # return f(...) inside f, outside any inlined body, with arguments of the parameters' types
+    call = node.getRetExpr()
+    if not self.options.enabled('tailcall') or len(self.inlineExits) > 0:
+      return False
+    if not isinstance(call, CallNode) or call.getFuncName() != self.currFunc:
+      return False
+    params = self.currScope.getArguments()
+    return all(arg.getType() == param.getType() for arg, param in zip(call.getArgs(), params))
+
+  def _generateSelfTailCall(self, call: CallNode) -> CodeObject:
+    # reuse the frame: overwrite the parameters and start the body again
+    co = CodeObject()
+    values = []
+    for arg in call.getArgs():
+      value = arg.accept(self)
+      if value.lval:
+        value = self.rvalify(value)
+      co.code.extend(value.code)
+      temp = value.temp
+      if temp in self.homes.values():
+        # a parameter's home is about to be overwritten, so its old value needs a copy
+        temp = self.generateTemp(value.type)
+        co.code.append(FMv(value.temp, temp) if value.type == Scope.Type.FLOAT else Mv(value.temp, temp))
+      # the stores below only need the temp, not the code that computed it
+      computed = CodeObject()
+      computed.temp = temp
+      computed.type = value.type
+      computed.lval = False
+      values.append(computed)
+
+    # every argument is evaluated before any parameter changes
+    for param, value in zip(self.currScope.getArguments(), values):
+      co.code.extend(self.postprocessAssignNode(None, self._lvalue(param), value).code)
+
+    co.code.extend(self._storePromotedGlobals())
+    co.code.append(J(self._generateFunctionBodyLabel()))
+    self.selfTailCalled = True
+    co.type = None
+    return co
+
   def postprocessReturnNode(self, node: ReturnNode, retExpr: CodeObject) -> CodeObject:
+    if len(self.inlineExits) > 0:
+      # returning from an inlined body: store the result and leave the body
+      label, result = self.inlineExits[-1]
+      co = self.postprocessAssignNode(None, self._lvalue(result), retExpr)
+      co.code.extend(self._storePromotedGlobals())
+      co.code.append(J(label))
+      return co
+
     co = CodeObject()
 
     if retExpr.lval:
       retExpr = self.rvalify(retExpr)
     co.code.extend(retExpr.code)
 
-    if retExpr.type == Scope.Type.INT:
+    if self.options.enabled('regcall'):
+      if retExpr.type == Scope.Type.INT:
+        co.code.append(Mv(retExpr.temp, "a0"))
+      elif retExpr.type == Scope.Type.FLOAT:
+        co.code.append(FMv(retExpr.temp, "fa0"))
+      else:
+        raise Exception("Bad return type")
+    elif retExpr.type == Scope.Type.INT:
       co.code.append(Sw(retExpr.temp, "fp", "8"))
     elif retExpr.type == Scope.Type.FLOAT:
       co.code.append(Fsw(retExpr.temp, "fp", "8"))
     else:
       raise Exception("Bad return type")
 
+    co.code.extend(self._storePromotedGlobals())
     co.code.append(J(self._generateFunctionRetLabel()))
     co.type = None
     return co
 
+  def preprocessInlineNode(self, node: InlineNode):
+    self.inlineLabel += 1
+    self.inlineExits.append(("inline_" + str(self.inlineLabel), node.getResult()))
+
+  def postprocessInlineNode(self, node: InlineNode, body: CodeObject) -> CodeObject:
+    label, result = self.inlineExits.pop()
+    value = self.rvalify(self._lvalue(result))
+
+    co = CodeObject()
+    co.code.extend(body.code)
+    co.code.append(Label(label))
+    co.code.extend(value.code)
+    co.temp = value.temp
+    co.type = node.getType()
+    co.lval = False
+    return co
+
   def preprocessFunctionNode(self, node: FunctionNode):
     self.currFunc = node.getFuncName()
+    self.currScope = node.getScope()
+    self.selfTailCalled = False
     self.intRegCount = 0
     self.floatRegCount = 0
 
+    self.homes = {}
+    self.entryMoves = InstructionList()
+    if self.options.enabled('regcall'):
+      node.getScope().assignArgumentRegisters()
+    if self.options.enabled('regcall') and not self.options.enabled('ssa'):
+      # copy register arguments into temps on entry so the argument registers are free for calls
+      for param in node.getScope().getArguments():
+        if param.getRegister() is None:
+          continue
+        home = self.generateTemp(param.getType())
+        self.homes[param] = home
+        if param.getType() == Scope.Type.FLOAT:
+          self.entryMoves.append(FMv(param.getRegister(), home))
+        else:
+          self.entryMoves.append(Mv(param.getRegister(), home))
+    if self.options.enabled('promote') and not self.options.enabled('ssa'):
+      # nothing can take the address of a local, so every local and parameter can live in a temp;
+      # parameters passed on the stack are loaded once on entry
+      arguments = node.getScope().getArguments()
+      for sym in list(node.getScope().getEntries()):
+        if sym in self.homes:
+          continue
+        home = self.generateTemp(sym.getType())
+        self.homes[sym] = home
+        if sym in arguments:
+          self.entryMoves.append((Flw if sym.getType() == Scope.Type.FLOAT else Lw)(home, "fp", sym.addressToString()))
+
+  def visitFunctionNode(self, node: FunctionNode) -> CodeObject:
+    if not self.options.enabled('ssa'):
+      return super().visitFunctionNode(node)
+
+    # build the body through the SSA form instead of straight from the AST
+    self.preprocessFunctionNode(node)
+    function = IRBuilder(self.options.enabled('tailcall'), self.options.enabled('promote')).build(node)
+    if self.options.enabled('sccp'):
+      SparseConstantPropagation().run(function)
+    if self.options.enabled('ivsr'):
+      InductionVariables().run(function)
+    if self.options.enabled('adce'):
+      AggressiveDeadCodeElimination().run(function)
+    body = CodeObject()
+    body.code = IRLowering(self).run(function)
+    return self.postprocessFunctionNode(node, body)
+
   def postprocessFunctionNode(self, node: FunctionNode, body: CodeObject) -> CodeObject:
+    # only the body is finished here: the prologue and epilogue depend on which registers the
+    # callers need preserved, so frames are built in postprocessFunctionListNode
     co = CodeObject()
 
-    co.code.append(Label(self._generateFunctionLabel()))
-    co.code.append(Sw("fp", "sp", "0"))
-    co.code.append(Mv("sp", "fp"))
-    co.code.append(Addi("sp", "-4", "sp"))
+    # through the SSA form or with -fpromote locals live in temps, so the frame needs no slots for them
+    numLocals = 0 if self.options.enabled('ssa') or self.options.enabled('promote') else node.getScope().getNumLocals()
+    code = InstructionList()
+    code.extend(self.entryMoves)
+    if self.selfTailCalled:
+      code.append(Label(self._generateFunctionBodyLabel()))
+    code.extend(body.code)
 
-    numLocals = node.getScope().getNumLocals()
-    co.code.append(Addi("sp", str(-4 * numLocals), "sp"))
+    if self.options.enabled('strength'):
+      code = StrengthReduction(self._isTemp, self.generateTemp).run(code)
 
-    nInt = self.intRegCount
-    nFloat = self.floatRegCount
+    if self.options.enabled('lvn'):
+      code = LocalValueNumbering(self._isTemp).run(code)
 
-    for i in range(1, nInt + 1):
-      co.code.append(Sw(self.intTempPrefix + str(i), "sp", "0"))
-      co.code.append(Addi("sp", "-4", "sp"))
-    for i in range(1, nFloat + 1):
-      co.code.append(Fsw(self.floatTempPrefix + str(i), "sp", "0"))
-      co.code.append(Addi("sp", "-4", "sp"))
+    if self.options.enabled('rotate'):
+      code = LoopRotation(self._generateBlockLabel).run(code)
 
-    co.code.extend(body.code)
+    if self.options.enabled('licm'):
+      code = LoopInvariantCodeMotion(self._isTemp).run(code)
 
-    co.code.append(Label(self._generateFunctionRetLabel()))
+    if self.options.enabled('peephole'):
+      code = Peephole().run(code)
 
-    for i in range(nFloat, 0, -1):
-      co.code.append(Addi("sp", "4", "sp"))
-      co.code.append(Flw(self.floatTempPrefix + str(i), "sp", "0"))
-    for i in range(nInt, 0, -1):
-      co.code.append(Addi("sp", "4", "sp"))
-      co.code.append(Lw(self.intTempPrefix + str(i), "sp", "0"))
+    if self.options.enabled('dse'):
+      code = DeadStoreElimination(self._isTemp).run(code)
 
-    co.code.append(Mv("fp", "sp"))
-    co.code.append(Lw("fp", "fp", "0"))
-    co.code.append(Ret())
+    if self.options.enabled('regalloc'):
+      allocator = RegisterAllocator(self, numLocals, self._argumentRegisters())
+      code = allocator.run(code)
+      # spilled temps get frame slots right below the locals
+      numLocals += allocator.numSpillSlots
 
+    if self.options.enabled('schedule'):
+      code = ListScheduler().run(code)
+
+    co.code = code
+    self.functionFrames.append((self.currFunc, numLocals))
     return co
 
   def postprocessFunctionListNode(self, node: FunctionListNode, functions: List[CodeObject]) -> CodeObject:
     co = CodeObject()
 
+    if self.usesGp:
+      co.code.append(La("gp", hex(StaticVariables.getSymbolTableSingleton().getGlobalScope().globalPointer)))
     co.code.append(Mv("sp", "fp"))
     co.code.append(Jr(self._generateFunctionLabel("main")))
     co.code.append(Halt())
     co.code.append(Blank())
 
-    for c in functions:
-      co.code.extend(c.code)
+    if self.options.enabled('savelive'):
+      analysis = SaveSetAnalysis(self._argumentRegisters())
+      for (func, numLocals), c in zip(self.functionFrames, functions):
+        analysis.addFunction(self._generateFunctionLabel(func), c.code)
+      saveSets = analysis.run()
+
+    for (func, numLocals), c in zip(self.functionFrames, functions):
+      if self.options.enabled('savelive'):
+        saves = saveSets[self._generateFunctionLabel(func)]
+      else:
+        # save everything the function writes
+        saves = set()
+        for inst in c.code:
+          saves.update(r for r in inst.getDests() if r not in ("fp", "sp", "ra") and r not in self._argumentRegisters())
+
+      # callers no longer spill ra under the register convention, so non-leaf functions keep it in their frame
+      if self.options.enabled('regcall') and any(isinstance(inst, Jr) for inst in c.code):
+        saves = set(saves) | {"ra"}
+
+      co.code.extend(self._generateFunctionFrame(func, numLocals, c.code, saves))
       co.code.append(Blank())
 
+    if self.options.enabled('peephole'):
+      # again on the finished program, where the frame code is visible
+      co.code = Peephole().run(co.code)
+
     return co
 
+  def _generateFunctionFrame(self, func: str, numLocals: int, body: InstructionList, saves) -> InstructionList:
+    code = InstructionList()
+    saveRa = "ra" in saves
+    saves = sorted((r for r in saves if r != "ra"), key=self._saveOrder)
+    intSaves = (["ra"] if saveRa else []) + [r for r in saves if not self._isFloatRegister(r)]
+    floatSaves = [r for r in saves if self._isFloatRegister(r)]
+
+    if self.options.enabled('frame'):
+      return self._generateCompactFrame(func, numLocals, body, intSaves + floatSaves)
+
+    code.append(Label(self._generateFunctionLabel(func)))
+    code.append(Sw("fp", "sp", "0"))
+    code.append(Mv("sp", "fp"))
+    code.append(Addi("sp", "-4", "sp"))
+    code.append(Addi("sp", str(-4 * numLocals), "sp"))
+
+    for reg in intSaves:
+      code.append(Sw(reg, "sp", "0"))
+      code.append(Addi("sp", "-4", "sp"))
+    for reg in floatSaves:
+      code.append(Fsw(reg, "sp", "0"))
+      code.append(Addi("sp", "-4", "sp"))
+
+    code.extend(body)
+
+    code.append(Label(self._generateFunctionRetLabel(func)))
+
+    for reg in reversed(floatSaves):
+      code.append(Addi("sp", "4", "sp"))
+      code.append(Flw(reg, "sp", "0"))
+    for reg in reversed(intSaves):
+      code.append(Addi("sp", "4", "sp"))
+      code.append(Lw(reg, "sp", "0"))
+
+    code.append(Mv("fp", "sp"))
+    code.append(Lw("fp", "fp", "0"))
+    code.append(Ret())
+    return code
+
+  def _generateCompactFrame(self, func: str, numLocals: int, body: InstructionList, saves: List[str]) -> InstructionList:
+    # the frame is laid out up front: saved registers get fixed slots below the locals and spill slots,
+    # and sp moves once. A leaf function with no stack slots builds no frame: sp stays put while it runs,
+    # so the body addresses its arguments and return slot from sp instead of fp, and saved registers
+    # go to the free words below sp.
+    code = InstructionList()
+    leaf = numLocals == 0 and self._isLeaf(body)
+    if leaf:
+      base, first = "sp", 0
+      body = InstructionList([type(inst)(inst.dest, "sp", inst.label) if isinstance(inst, InstructionLS) and inst.src1 == "fp" else inst
+                              for inst in body])
+    else:
+      base, first = "fp", -4 * (numLocals + 1)
+    slots = [(reg, str(first - 4 * i)) for i, reg in enumerate(saves)]
+
+    code.append(Label(self._generateFunctionLabel(func)))
+    if not leaf:
+      code.append(Sw("fp", "sp", "0"))
+      code.append(Mv("sp", "fp"))
+      code.append(Addi("sp", str(-4 * (numLocals + 1 + len(saves))), "sp"))
+    for reg, offset in slots:
+      code.append((Fsw if self._isFloatRegister(reg) else Sw)(reg, base, offset))
+
+    code.extend(body)
+
+    code.append(Label(self._generateFunctionRetLabel(func)))
+    for reg, offset in reversed(slots):
+      code.append((Flw if self._isFloatRegister(reg) else Lw)(reg, base, offset))
+    if not leaf:
+      code.append(Mv("fp", "sp"))
+      code.append(Lw("fp", "fp", "0"))
+    code.append(Ret())
+    return code
+
+  @staticmethod
+  def _isLeaf(body: InstructionList) -> bool:
+    # makes no calls, never moves sp or fp, and uses fp only as the base of loads and stores
+    for inst in body:
+      if isinstance(inst, Jr) or any(r in ("sp", "fp") for r in inst.getDests()):
+        return False
+      if "fp" in inst.getSources() and not (isinstance(inst, InstructionLS) and inst.src1 == "fp" and inst.dest != "fp"):
+        return False
+    return True
+
+  def _isTemp(self, reg: str) -> bool:
+    # a temp handed out by generateTemp, as opposed to a register the calling convention names
+    for prefix in (self.intTempPrefix, self.floatTempPrefix):
+      if reg.startswith(prefix) and reg[len(prefix):].isdigit():
+        return True
+    return False
+
+  def _isFloatRegister(self, reg: str) -> bool:
+    if reg in RegisterAllocator.FLOAT_REGISTERS:
+      return True
+    return reg.startswith(self.floatTempPrefix) and reg[len(self.floatTempPrefix):].isdigit()
+
+  def _saveOrder(self, reg: str):
+    # physical registers in allocation order, then temps by number
+    for order in (RegisterAllocator.INT_REGISTERS, RegisterAllocator.FLOAT_REGISTERS):
+      if reg in order:
+        return (0, order.index(reg))
+    return (1, int(reg.lstrip(self.intTempPrefix + self.floatTempPrefix)))
+
   def postprocessCallNode(self, node: CallNode, args: List[CodeObject]) -> CodeObject:
+    if self.options.enabled('regcall'):
+      return self._generateRegisterCall(node, args)
+
     co = CodeObject()
 
     for arg in args:
@@ -419,6 +772,71 @@ class CodeGenerator(AbstractASTVisitor):
     co.type = retType
     return co
 
+  def _generateRegisterCall(self, node: CallNode, args: List[CodeObject]) -> CodeObject:
+    co = CodeObject()
+
+    # evaluate every argument before filling argument registers: a later argument may contain a call
+    temps = []
+    for arg in args:
+      if arg.lval:
+        arg = self.rvalify(arg)
+      co.code.extend(arg.code)
+      if arg.type not in (Scope.Type.INT, Scope.Type.FLOAT):
+        raise Exception("Bad arg type")
+      temps.append((arg.temp, arg.type))
+
+    regs = LocalScope.argumentRegisters([t for _, t in temps])
+
+    # arguments that did not get a register are pushed in order, as in the stack convention
+    numStackArgs = 0
+    for (temp, t), reg in zip(temps, regs):
+      if reg is not None:
+        continue
+      if t == Scope.Type.INT:
+        co.code.append(Sw(temp, "sp", "0"))
+      else:
+        co.code.append(Fsw(temp, "sp", "0"))
+      co.code.append(Addi("sp", "-4", "sp"))
+      numStackArgs += 1
+
+    argRegs = []
+    for (temp, t), reg in zip(temps, regs):
+      if reg is None:
+        continue
+      if t == Scope.Type.INT:
+        co.code.append(Mv(temp, reg))
+      else:
+        co.code.append(FMv(temp, reg))
+      argRegs.append(reg)
+
+    retType = node.ste.getReturnType()
+    retReg = {Scope.Type.INT: "a0", Scope.Type.FLOAT: "fa0"}.get(retType)
+
+    co.code.append(Jr(self._generateFunctionLabel(node.getFuncName()), argRegs, retReg))
+
+    if retType == Scope.Type.INT:
+      retTemp = self.generateTemp(Scope.Type.INT)
+      co.code.append(Mv("a0", retTemp))
+    elif retType == Scope.Type.FLOAT:
+      retTemp = self.generateTemp(Scope.Type.FLOAT)
+      co.code.append(FMv("fa0", retTemp))
+    else:
+      retTemp = None
+
+    if numStackArgs > 0:
+      co.code.append(Addi("sp", str(4 * numStackArgs), "sp"))
+
+    co.temp = retTemp
+    co.lval = False
+    co.type = retType
+    return co
+
+  def _argumentRegisters(self) -> List[str]:
+    # argument registers belong to the call protocol: they are never allocated to temps or saved by callees
+    if not self.options.enabled('regcall'):
+      return []
+    return ["a" + str(i) for i in range(LocalScope.numArgRegisters)] + ["fa" + str(i) for i in range(LocalScope.numArgRegisters)]
+
   def generateTemp(self, t: Scope.Type) -> str:
     if t == Scope.Type.INT:
       self.intRegCount += 1
@@ -429,6 +847,11 @@ class CodeGenerator(AbstractASTVisitor):
     else:
       raise Exception("Generating temp for bad type")
 
+  def _lvalue(self, sym: Scope.SymbolTableEntry) -> CodeObject:
+    co = CodeObject(sym)
+    co.lval = True
+    return co
+
   def rvalify(self, lco: CodeObject) -> CodeObject:
     assert(lco.lval is True)
     assert(lco.isVar() is True)
@@ -436,7 +859,14 @@ class CodeGenerator(AbstractASTVisitor):
     co = CodeObject()
     sym = lco.getSTE()
 
-    if sym.isLocal():
+    if sym in self.promotedGlobals:
+      # an inlined body later in the same expression may assign the global, so the value read is a copy
+      temp2 = self.generateTemp(lco.type)
+      co.code.append((FMv if lco.type is Scope.Type.FLOAT else Mv)(self.homes[sym], temp2))
+    elif sym in self.homes:
+      # register-resident symbol: its value already lives in a temp
+      temp2 = self.homes[sym]
+    elif sym.isLocal():
       offset = sym.addressToString()
       if lco.type is Scope.Type.INT:
         temp2 = self.generateTemp(Scope.Type.INT)
@@ -446,19 +876,19 @@ class CodeGenerator(AbstractASTVisitor):
         co.code.append(Flw(temp2, "fp", offset))
       else:
         raise Exception("Bad local type in rvalify")
+    elif lco.type is Scope.Type.STRING:
+      temp2 = self.generateTemp(Scope.Type.INT)
+      co.code.append(La(temp2, self.generateAddrFromVariable(lco)))
     else:
-      address = self.generateAddrFromVariable(lco)
-      temp1 = self.generateTemp(Scope.Type.INT)
-      co.code.append(La(temp1, address))
+      code, base, offset = self._globalAddress(sym)
+      co.code.extend(code)
 
       if lco.type is Scope.Type.INT:
         temp2 = self.generateTemp(Scope.Type.INT)
-        co.code.append(Lw(temp2, temp1, '0'))
+        co.code.append(Lw(temp2, base, offset))
       elif lco.type is Scope.Type.FLOAT:
         temp2 = self.generateTemp(Scope.Type.FLOAT)
-        co.code.append(Flw(temp2, temp1, '0'))
-      elif lco.type is Scope.Type.STRING:
-        temp2 = temp1
+        co.code.append(Flw(temp2, base, offset))
       else:
         raise Exception("Bad type in rvalify!")
 
@@ -467,6 +897,19 @@ class CodeGenerator(AbstractASTVisitor):
     co.temp = temp2
     return co
 
+  def _globalAddress(self, sym: Scope.SymbolTableEntry) -> Tuple[InstructionList, str, str]:
+    # code, base register and offset that address a global: gp-relative when it is in reach,
+    # otherwise through its address in a fresh temp
+    code = InstructionList()
+    if self.options.enabled('gprel'):
+      offset = StaticVariables.getSymbolTableSingleton().getGlobalScope().gpOffset(sym)
+      if offset is not None:
+        self.usesGp = True
+        return code, "gp", str(offset)
+    addrTemp = self.generateTemp(Scope.Type.INT)
+    code.append(La(addrTemp, sym.addressToString()))
+    return code, addrTemp, '0'
+
   def generateAddrFromVariable(self, lco: CodeObject) -> str:
     assert(lco.isVar() is True)
     symbol = lco.getSTE()
@@ -510,11 +953,22 @@ class CodeGenerator(AbstractASTVisitor):
 
     return instructions
 
+  def _generateBlockLabel(self) -> str:
+    self.blockLabel += 1
+    return "block_" + str(self.blockLabel)
+
   def _generateFunctionLabel(self, func=None) -> str:
     if func is None:
       return "func_" + self.currFunc
     else:
       return "func_" + func
 
-  def _generateFunctionRetLabel(self) -> str:
-    return "func_ret_" + self.currFunc
+  def _generateFunctionBodyLabel(self) -> str:
+    # start of the current function's body, after the prologue and the parameter moves
+    return "func_body_" + self.currFunc
+
+  def _generateFunctionRetLabel(self, func=None) -> str:
+    if func is None:
+      return "func_ret_" + self.currFunc
+    else:
+      return "func_ret_" + func
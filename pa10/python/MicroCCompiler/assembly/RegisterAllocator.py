@@ -0,0 +1,182 @@
+import re
+from typing import Dict, List, Set
+
+from .InstructionList import InstructionList
+from .instructions import *
+from ..analysis import ControlFlowGraph, LiveVariables
+from ..compiler import *
+
+class RegisterAllocator:
+  # Graph-coloring allocator (Chaitin/Briggs) for the body of one function.
+  # The code generator hands out an unbounded supply of temps (t1, t2, ... and f1, f2, ...);
+  # this maps them onto the RV32 register file and spills the rest to stack slots below the locals.
+
+  # allocatable registers, in the order they are handed out.
+  # zero, ra, sp, gp, tp and fp are never allocated.
+  INT_REGISTERS = ['t' + str(i) for i in range(7)] + ['a' + str(i) for i in range(8)] + ['s' + str(i) for i in range(1, 12)]
+  FLOAT_REGISTERS = ['ft' + str(i) for i in range(12)] + ['fa' + str(i) for i in range(8)] + ['fs' + str(i) for i in range(12)]
+
+  def __init__(self, cg, numLocals: int, reserved: List[str] = ()):
+    self.cg = cg
+    # registers the calling convention needs for itself
+    self.intRegisters = [r for r in RegisterAllocator.INT_REGISTERS if r not in reserved]
+    self.floatRegisters = [r for r in RegisterAllocator.FLOAT_REGISTERS if r not in reserved]
+    self.numLocals = numLocals
+    self.numSpillSlots = 0
+    self.spillSlots: Dict[str, str] = {}
+    # temps created to load or store a spilled value; they live for one instruction and are never spilled
+    self.spillTemps: Set[str] = set()
+
+    self.intTemp = re.compile('^' + re.escape(cg.intTempPrefix) + r'\d+$')
+    self.floatTemp = re.compile('^' + re.escape(cg.floatTempPrefix) + r'\d+$')
+
+    # physical registers written by the allocated code, which the prologue has to save
+    self.usedIntRegisters: List[str] = []
+    self.usedFloatRegisters: List[str] = []
+
+  def run(self, code: InstructionList) -> InstructionList:
+    while True:
+      liveOut = LiveVariables(ControlFlowGraph(code), self.isTemp).instructionLiveOut()
+      graph = self.buildInterferenceGraph(code, liveOut)
+
+      colors: Dict[str, str] = {}
+      spills: List[str] = []
+      for temps, registers in ((self._intTemps(graph), self.intRegisters),
+                               (self._floatTemps(graph), self.floatRegisters)):
+        spills.extend(self.color(graph, temps, registers, colors, code))
+
+      if len(spills) == 0:
+        break
+      code = self.spill(code, spills)
+
+    allocated = InstructionList()
+    for inst in code:
+      inst.renameRegisters(colors)
+      # moves between temps that ended up in the same register are no-ops
+      if isinstance(inst, (Mv, FMv)) and inst.src1 == inst.dest:
+        continue
+      allocated.append(inst)
+
+    written = set()
+    for inst in allocated:
+      written.update(inst.getDests())
+    self.usedIntRegisters = [r for r in self.intRegisters if r in written]
+    self.usedFloatRegisters = [r for r in self.floatRegisters if r in written]
+
+    return allocated
+
+  def isTemp(self, reg: str) -> bool:
+    return self.intTemp.match(reg) is not None or self.floatTemp.match(reg) is not None
+
+  def _intTemps(self, graph):
+    return [t for t in graph if self.intTemp.match(t)]
+
+  def _floatTemps(self, graph):
+    return [t for t in graph if self.floatTemp.match(t)]
+
+  def buildInterferenceGraph(self, code: InstructionList, liveOut: List[Set[str]]) -> Dict[str, Set[str]]:
+    graph: Dict[str, Set[str]] = {}
+    for inst in code:
+      for r in inst.getSources() + inst.getDests():
+        if self.isTemp(r):
+          graph.setdefault(r, set())
+
+    for i, inst in enumerate(code):
+      for d in inst.getDests():
+        if not self.isTemp(d):
+          continue
+        sameClass = self.intTemp if self.intTemp.match(d) else self.floatTemp
+        for l in liveOut[i]:
+          # the source of a move may share its destination's register
+          if l == d or not sameClass.match(l) or (isinstance(inst, (Mv, FMv)) and l == inst.src1):
+            continue
+          graph[d].add(l)
+          graph[l].add(d)
+    return graph
+
+  def color(self, graph, temps: List[str], registers: List[str], colors: Dict[str, str], code: InstructionList) -> List[str]:
+    k = len(registers)
+    degree = {t: len(graph[t]) for t in temps}
+    stack = []
+
+    occurrences = {t: 0 for t in temps}
+    for inst in code:
+      for r in inst.getSources() + inst.getDests():
+        if r in occurrences:
+          occurrences[r] += 1
+
+    remaining = set(temps)
+    while len(remaining) > 0:
+      low = [t for t in remaining if degree[t] < k]
+      if len(low) > 0:
+        candidates = low
+      else:
+        # no trivially colorable temp: push the cheapest spill candidate and hope it still gets a color
+        spillable = [t for t in remaining if t not in self.spillTemps]
+        if len(spillable) == 0:
+          raise Exception("Register allocation failed: too many values live at once")
+        candidates = [max(spillable, key=lambda t: (degree[t] / occurrences[t], t))]
+
+      for t in sorted(candidates):
+        if t not in remaining:
+          continue
+        remaining.remove(t)
+        stack.append(t)
+        for n in graph[t]:
+          if n in degree:
+            degree[n] -= 1
+        if len(low) == 0:
+          break
+
+    partners = self.movePartners(code)
+    spills = []
+    while len(stack) > 0:
+      t = stack.pop()
+      taken = set(colors[n] for n in graph[t] if n in colors)
+      free = [r for r in registers if r not in taken]
+      if len(free) == 0:
+        spills.append(t)
+        continue
+      # prefer the register of a temp this one is copied to or from, so the copy disappears
+      preferred = [colors[p] for p in sorted(partners.get(t, ())) if p in colors and colors[p] in free]
+      if len(preferred) == 0:
+        # otherwise leave a partner still to be colored free to take the same register
+        pending = [p for p in partners.get(t, ()) if p not in colors and p in graph]
+        preferred = [r for r in free if not any(colors.get(n) == r for p in pending for n in graph[p])]
+      colors[t] = preferred[0] if len(preferred) > 0 else free[0]
+    return spills
+
+  def movePartners(self, code: InstructionList) -> Dict[str, Set[str]]:
+    partners: Dict[str, Set[str]] = {}
+    for inst in code:
+      if isinstance(inst, (Mv, FMv)) and self.isTemp(inst.src1) and self.isTemp(inst.dest):
+        partners.setdefault(inst.src1, set()).add(inst.dest)
+        partners.setdefault(inst.dest, set()).add(inst.src1)
+    return partners
+
+  def spill(self, code: InstructionList, spills: List[str]) -> InstructionList:
+    for t in spills:
+      self.numSpillSlots += 1
+      self.spillSlots[t] = str(-4 * (self.numLocals + self.numSpillSlots))
+
+    rewritten = InstructionList()
+    for inst in code:
+      before = []
+      after = []
+      mapping = {}
+      for r in inst.getSources() + inst.getDests():
+        if r not in self.spillSlots or r in mapping:
+          continue
+        isInt = self.intTemp.match(r) is not None
+        temp = self.cg.generateTemp(Scope.Type.INT if isInt else Scope.Type.FLOAT)
+        self.spillTemps.add(temp)
+        mapping[r] = temp
+        if r in inst.getSources():
+          before.append((Lw if isInt else Flw)(temp, "fp", self.spillSlots[r]))
+        if r in inst.getDests():
+          after.append((Sw if isInt else Fsw)(temp, "fp", self.spillSlots[r]))
+      inst.renameRegisters(mapping)
+      rewritten.extend(before)
+      rewritten.append(inst)
+      rewritten.extend(after)
+    return rewritten
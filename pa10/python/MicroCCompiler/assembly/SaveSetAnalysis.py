@@ -0,0 +1,64 @@
+from typing import Dict, List, Set
+
+from .InstructionList import InstructionList
+from .instructions import *
+from ..analysis import ControlFlowGraph, LiveVariables
+
+class SaveSetAnalysis:
+  # Decides which registers each function's prologue has to save.
+  # All registers are callee-saved in our convention, but a function only needs to save a register
+  # if it, or something it calls, changes the register and some caller still needs the value once the call returns.
+  #
+  #   demand(f)  = registers live across some call to f
+  #   touched(f) = registers written by f, plus clobber(g) for every g that f calls
+  #   saves(f)   = touched(f) & demand(f)
+  #   clobber(f) = touched(f) - demand(f), i.e. what f changes without restoring
+  #
+  # clobber is solved to a fixpoint so that recursion and call chains are handled.
+
+  RESERVED = ('zero', 'x0', 'ra', 'sp', 'fp', 's0', 'gp', 'tp')
+
+  def __init__(self, reserved: List[str] = ()):
+    # registers owned by the calling convention, which callees never save
+    self.reserved = set(SaveSetAnalysis.RESERVED) | set(reserved)
+    self.written: Dict[str, Set[str]] = {}
+    self.calls: Dict[str, List[str]] = {}
+    self.demand: Dict[str, Set[str]] = {}
+
+  def isRegister(self, reg: str) -> bool:
+    return reg not in self.reserved
+
+  def addFunction(self, label: str, code: InstructionList):
+    liveOut = LiveVariables(ControlFlowGraph(code), self.isRegister).instructionLiveOut()
+
+    written = set()
+    calls = []
+    for i, inst in enumerate(code):
+      written.update(r for r in inst.getDests() if self.isRegister(r))
+      if isinstance(inst, Jr):
+        calls.append(inst.label)
+        self.demand.setdefault(inst.label, set()).update(liveOut[i])
+
+    self.written[label] = written
+    self.calls[label] = calls
+    self.demand.setdefault(label, set())
+
+  def run(self) -> Dict[str, Set[str]]:
+    clobber = {f: set() for f in self.written}
+
+    changed = True
+    while changed:
+      changed = False
+      for f in self.written:
+        c = self.touched(f, clobber) - self.demand[f]
+        if c != clobber[f]:
+          clobber[f] = c
+          changed = True
+
+    return {f: self.touched(f, clobber) & self.demand[f] for f in self.written}
+
+  def touched(self, f: str, clobber: Dict[str, Set[str]]) -> Set[str]:
+    t = set(self.written[f])
+    for g in self.calls[f]:
+      t |= clobber.get(g, set())
+    return t
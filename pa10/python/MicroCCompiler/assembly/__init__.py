@@ -1,3 +1,5 @@
 from .InstructionList import InstructionList
 from .CodeObject import CodeObject
+from .RegisterAllocator import RegisterAllocator
+from .SaveSetAnalysis import SaveSetAnalysis
 from .CodeGenerator import CodeGenerator
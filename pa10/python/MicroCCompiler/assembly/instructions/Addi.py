@@ -2,6 +2,9 @@ from .Instruction3O import Instruction3O
 from .Instruction import OpCode
 
 class Addi(Instruction3O):
+  # src2 holds the immediate
+  srcFields = ('src1',)
+
   def __init__(self, src1: str, imm: str, dest: str):
     super().__init__(src1, imm, dest)
     self.oc = OpCode.ADDI
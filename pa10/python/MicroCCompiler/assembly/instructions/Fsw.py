@@ -2,6 +2,10 @@ from .InstructionLS import InstructionLS
 from .Instruction import OpCode
 
 class Fsw(InstructionLS):
+  # dest is the register being stored, so it is read, not written
+  srcFields = ('dest', 'src1')
+  destFields = ()
+
   def __init__(self, src: str, baseAddress: str, offset: str):
     super().__init__(src, baseAddress, offset)
     self.oc = OpCode.FSW
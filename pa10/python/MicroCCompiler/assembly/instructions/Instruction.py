@@ -17,6 +17,8 @@ class OpCode(Enum):
   GETI = "GETI"
   HALT = "HALT"
   ADDI = "ADDI"
+  SLLI = "SLLI"
+  SRAI = "SRAI"
 
   # BRANCH INSTRUCTIONS
   BEQ = "BEQ"
@@ -55,6 +57,11 @@ class OpCode(Enum):
 
 
 class Instruction(ABC):
+  # fields that name registers: srcFields are read and destFields are written.
+  # label holds branch targets, immediates and offsets, so it is never a register.
+  srcFields = ('src1', 'src2')
+  destFields = ('dest',)
+
   def __init__(self):
     self.src1  = None
     self.src2  = None
@@ -64,3 +71,15 @@ class Instruction(ABC):
 
   def getDest(self):
     return self.dest
+
+  def getSources(self):
+    return [getattr(self, f, None) for f in self.srcFields if getattr(self, f, None) is not None]
+
+  def getDests(self):
+    return [getattr(self, f, None) for f in self.destFields if getattr(self, f, None) is not None]
+
+  def renameRegisters(self, mapping):
+    for f in self.srcFields + self.destFields:
+      reg = getattr(self, f, None)
+      if reg in mapping:
+        setattr(self, f, mapping[reg])
@@ -1,10 +1,17 @@
+from typing import List
 from .Instruction import Instruction, OpCode
 
 class Jr(Instruction):
-  def __init__(self, label: str):
+  def __init__(self, label: str, argRegisters: List[str] = None, retRegister: str = None):
     super().__init__()
     self.label = label
+    # under the register calling convention the call reads its argument registers and writes the return register
+    self.argRegisters = argRegisters if argRegisters is not None else []
+    self.dest = retRegister
     self.oc = OpCode.JR
 
+  def getSources(self):
+    return list(self.argRegisters)
+
   def __str__(self):
     return str(self.oc) + " " + self.label
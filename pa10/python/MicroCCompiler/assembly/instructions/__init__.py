@@ -41,5 +41,7 @@ from .PutF import PutF
 from .PutI import PutI
 from .PutS import PutS
 from .Ret import Ret
+from .Slli import Slli
+from .Srai import Srai
 from .Sub import Sub
 from .Sw import Sw
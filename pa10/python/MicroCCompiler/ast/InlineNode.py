@@ -0,0 +1,33 @@
+from .ASTNode import ASTNode
+from .StatementListNode import StatementListNode
+from ..compiler import Scope
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+  from .visitor.ASTVisitor import ASTVisitor
+
+class InlineNode(ASTNode):
+  # A call replaced by a copy of the callee's body (see visitor/Inliner). The body starts by assigning
+  # the arguments to the copies of the parameters; a ReturnNode inside it stores into result and
+  # leaves for the end of the node. The node's value is result.
+  def __init__(self, funcSymbol: Scope.FunctionSymbolTableEntry, body: StatementListNode, result: Scope.SymbolTableEntry):
+    self.funcSymbol = funcSymbol
+    self.setBody(body)
+    self.result = result
+    self.type = funcSymbol.getReturnType()
+
+  def accept(self, visitor: 'ASTVisitor') -> Any:
+    return visitor.visitInlineNode(self)
+
+  def getFuncSymbol(self) -> Scope.FunctionSymbolTableEntry:
+    return self.funcSymbol
+
+  def getBody(self) -> StatementListNode:
+    return self.body
+
+  def setBody(self, body: StatementListNode):
+    self.body = body
+
+  def getResult(self) -> Scope.SymbolTableEntry:
+    return self.result
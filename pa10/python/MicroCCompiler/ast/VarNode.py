@@ -8,9 +8,10 @@ if TYPE_CHECKING:
 
 class VarNode(ASTNode):
 
-    def __init__(self, ident: str):
+    def __init__(self, ident: str, ste: Scope.SymbolTableEntry = None):
+        # ste is looked up in the current scope unless given
         self.setIdent(ident)
-        self.setSymbol(StaticVariables.getSymbolTableSingleton().getSymbolTableEntry(ident))
+        self.setSymbol(ste if ste is not None else StaticVariables.getSymbolTableSingleton().getSymbolTableEntry(ident))
         self.setType(self.ste.getType())
 
     def accept(self, visitor: 'ASTVisitor') -> Any:
@@ -15,3 +15,4 @@ from .VarNode import VarNode
 from .CallNode import CallNode
 from .FunctionListNode import FunctionListNode
 from .FunctionNode import FunctionNode
+from .InlineNode import InlineNode
@@ -0,0 +1,80 @@
+from typing import Any, List
+
+from .AbstractASTVisitor import AbstractASTVisitor
+from .. import *
+
+class ASTRewriter(AbstractASTVisitor):
+  # Base for passes that change the AST in place. Every postprocess hook stores the (possibly new)
+  # children it is given back into the node and returns the node, so a subclass replaces a node
+  # by returning something else from its hook.
+
+  def postprocessVarNode(self, node: VarNode) -> ASTNode:
+    return node
+
+  def postprocessIntLitNode(self, node: IntLitNode) -> ASTNode:
+    return node
+
+  def postprocessFloatLitNode(self, node: FloatLitNode) -> ASTNode:
+    return node
+
+  def postprocessBinaryOpNode(self, node: BinaryOpNode, left: ASTNode, right: ASTNode) -> ASTNode:
+    node.setLeft(left)
+    node.setRight(right)
+    return node
+
+  def postprocessUnaryOpNode(self, node: UnaryOpNode, expr: ASTNode) -> ASTNode:
+    node.setExpr(expr)
+    return node
+
+  def postprocessAssignNode(self, node: AssignNode, left: ASTNode, right: ASTNode) -> ASTNode:
+    node.setLeft(left)
+    node.setRight(right)
+    return node
+
+  def postprocessStatementListNode(self, node: StatementListNode, statements: List[ASTNode]) -> ASTNode:
+    node.getStatements()[:] = statements
+    return node
+
+  def postprocessReadNode(self, node: ReadNode, var: ASTNode) -> ASTNode:
+    node.setVarNode(var)
+    return node
+
+  def postprocessWriteNode(self, node: WriteNode, writeExpr: ASTNode) -> ASTNode:
+    node.setWriteExpr(writeExpr)
+    return node
+
+  def postprocessIfStatementNode(self, node: IfStatementNode, cond: ASTNode, tlist: ASTNode, elist: ASTNode) -> ASTNode:
+    node.setCondExpr(cond)
+    node.setThenBlock(tlist)
+    node.setElseBlock(elist)
+    return node
+
+  def postprocessWhileNode(self, node: WhileNode, cond: ASTNode, slist: ASTNode) -> ASTNode:
+    node.setCondExpr(cond)
+    node.setSList(slist)
+    return node
+
+  def postprocessReturnNode(self, node: ReturnNode, retExpr: ASTNode) -> ASTNode:
+    node.setRetExpr(retExpr)
+    return node
+
+  def postprocessCondNode(self, node: CondNode, left: ASTNode, right: ASTNode) -> ASTNode:
+    node.setLeft(left)
+    node.setRight(right)
+    return node
+
+  def postprocessFunctionNode(self, node: FunctionNode, body: ASTNode) -> ASTNode:
+    node.setFuncBody(body)
+    return node
+
+  def postprocessFunctionListNode(self, node: FunctionListNode, functions: List[ASTNode]) -> ASTNode:
+    node.getFunctions()[:] = functions
+    return node
+
+  def postprocessCallNode(self, node: CallNode, args: List[ASTNode]) -> ASTNode:
+    node.getArgs()[:] = args
+    return node
+
+  def postprocessInlineNode(self, node: InlineNode, body: ASTNode) -> ASTNode:
+    node.setBody(body)
+    return node
@@ -58,3 +58,6 @@ class ASTVisitor(ABC):
     @abstractmethod
     def visitCallNode(self, node: 'CallNode') -> Any:
         pass
+    @abstractmethod
+    def visitInlineNode(self, node: 'InlineNode') -> Any:
+        pass
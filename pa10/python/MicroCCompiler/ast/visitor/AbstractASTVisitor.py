@@ -98,6 +98,11 @@ class AbstractASTVisitor(ASTVisitor):
           li.append(arg.accept(self))
         return self.postprocessCallNode(node, li)
 
+    def visitInlineNode(self, node: 'InlineNode') -> Any:
+        self.preprocessInlineNode(node)
+        body = node.getBody().accept(self)
+        return self.postprocessInlineNode(node, body)
+
     def preprocessVarNode(self, node: 'VarNode'):
         return
     
@@ -194,3 +199,8 @@ class AbstractASTVisitor(ASTVisitor):
     def postprocessCallNode(self, node: 'CallNode', args: Any) -> Any:
         return None
 
+    def preprocessInlineNode(self, node: 'InlineNode'):
+        return
+
+    def postprocessInlineNode(self, node: 'InlineNode', body: Any) -> Any:
+        return None
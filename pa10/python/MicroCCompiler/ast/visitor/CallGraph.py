@@ -0,0 +1,103 @@
+from typing import Dict, List, Set
+
+from .AbstractASTVisitor import AbstractASTVisitor
+from .. import *
+
+class CallGraph(AbstractASTVisitor):
+  # Which functions each function of a FunctionListNode calls. Calls to functions that are only
+  # declared are kept, but those functions have no edges of their own.
+
+  def __init__(self, node: FunctionListNode):
+    self.functions: Dict[str, FunctionNode] = {}
+    # caller -> callee of every call site, in program order
+    self.calls: Dict[str, List[str]] = {}
+    self.current: str = None
+    self.run(node)
+
+  def preprocessFunctionNode(self, node: FunctionNode):
+    self.current = node.getFuncName()
+    self.functions[self.current] = node
+    self.calls[self.current] = []
+
+  def preprocessCallNode(self, node: CallNode):
+    self.calls[self.current].append(node.getFuncName())
+
+  def callees(self, name: str) -> Set[str]:
+    return set(self.calls.get(name, ()))
+
+  def callSites(self, name: str) -> int:
+    # number of calls to name in the whole program
+    return sum(callees.count(name) for callees in self.calls.values())
+
+  def reachable(self, name: str) -> Set[str]:
+    # functions reached from name through one or more calls
+    seen: Set[str] = set()
+    stack = list(self.callees(name))
+    while len(stack) > 0:
+      f = stack.pop()
+      if f not in seen:
+        seen.add(f)
+        stack.extend(self.callees(f))
+    return seen
+
+  def live(self, root: str = "main") -> Set[str]:
+    # defined functions that can run when the program starts at root
+    return set(f for f in {root} | self.reachable(root) if f in self.functions)
+
+  def isRecursive(self, name: str) -> bool:
+    return name in self.callees(name) or len(self.scc(name)) > 1
+
+  def scc(self, name: str) -> List[str]:
+    # the functions that can both reach and be reached from name, name included
+    for component in self.sccs():
+      if name in component:
+        return component
+    return [name]
+
+  def sccs(self) -> List[List[str]]:
+    # strongly connected components of the defined functions (Tarjan), callees' components first
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    onStack: Set[str] = set()
+    components: List[List[str]] = []
+    def visit(f: str):
+      index[f] = low[f] = len(index)
+      stack.append(f)
+      onStack.add(f)
+      for g in self.calls[f]:
+        if g not in self.functions:
+          continue
+        if g not in index:
+          visit(g)
+          low[f] = min(low[f], low[g])
+        elif g in onStack:
+          low[f] = min(low[f], index[g])
+      if low[f] == index[f]:
+        component = []
+        while True:
+          g = stack.pop()
+          onStack.remove(g)
+          component.append(g)
+          if g == f:
+            break
+        components.append(component)
+    for f in self.functions:
+      if f not in index:
+        visit(f)
+    return components
+
+  def bottomUp(self) -> List[str]:
+    # defined functions with callees before their callers (as far as recursion allows)
+    order: List[str] = []
+    visited: Set[str] = set()
+    def visit(f: str):
+      visited.add(f)
+      for g in self.calls[f]:
+        if g in self.functions and g not in visited:
+          visit(g)
+      order.append(f)
+    for f in self.functions:
+      if f not in visited:
+        visit(f)
+    return order
@@ -0,0 +1,111 @@
+import math
+from typing import Union
+
+from .ASTRewriter import ASTRewriter
+from .. import *
+from ...compiler.Scope import Scope
+from ...ir.Constant import Constant
+from ...optimization.Arithmetic import Arithmetic
+
+class ConstantFolder(ASTRewriter):
+  # Folds arithmetic on literals into a single literal, with the simulator's semantics (see Arithmetic),
+  # and applies identities that hold for every operand: x+0, x-0, x*1, x/1, -(-x), and x*0 for ints.
+  # Comparisons of literals are decided here, so an if keeps only the branch that runs
+  # and a while whose condition is false from the start disappears.
+
+  def __init__(self):
+    self.numFolded = 0
+
+  def run(self, node: FunctionListNode) -> FunctionListNode:
+    return node.accept(self)
+
+  @staticmethod
+  def value(node: ASTNode) -> Union[int, float, None]:
+    # the value of a literal, read the way the simulator reads LI and FIMM.S immediates
+    if isinstance(node, (IntLitNode, FloatLitNode)):
+      return Constant.fromLiteral(node.getVal(), node.getType()).value
+    return None
+
+  def literal(self, value, type: Scope.Type) -> ASTNode:
+    self.numFolded += 1
+    return FloatLitNode(repr(value)) if type == Scope.Type.FLOAT else IntLitNode(str(value))
+
+  @staticmethod
+  def hasEffects(node) -> bool:
+    # whether evaluating node could do more than compute a value: calls, and inlined bodies
+    if isinstance(node, list):
+      return any(ConstantFolder.hasEffects(n) for n in node)
+    if not isinstance(node, ASTNode):
+      return False
+    if isinstance(node, (CallNode, InlineNode)):
+      return True
+    return any(ConstantFolder.hasEffects(child) for child in vars(node).values())
+
+  def postprocessBinaryOpNode(self, node: BinaryOpNode, left: ASTNode, right: ASTNode) -> ASTNode:
+    node = super().postprocessBinaryOpNode(node, left, right)
+    a, b = self.value(left), self.value(right)
+    if a is not None and b is not None:
+      result = Arithmetic.binary(node.getOp(), node.getType(), a, b)
+      return node if result is None else self.literal(result, node.getType())
+    return self.simplify(node, left, right, a, b)
+
+  def simplify(self, node: BinaryOpNode, left: ASTNode, right: ASTNode, a, b) -> ASTNode:
+    # identities with one literal operand; a is the left literal's value and b the right's, or None
+    op = node.getOp()
+    isInt = node.getType() == Scope.Type.INT
+    if op == BinaryOpNode.OpType.ADD and isInt:
+      # 0.0 + x is not x for x = -0.0
+      if a == 0:
+        return right
+      if b == 0:
+        return left
+    elif op == BinaryOpNode.OpType.SUB:
+      # x - (-0.0) is not x for x = -0.0
+      if b == 0 and (isInt or math.copysign(1, b) > 0):
+        return left
+    elif op == BinaryOpNode.OpType.MUL:
+      if b == 1:
+        return left
+      if a == 1:
+        return right
+      # 0.0 * x is not 0.0 for negative, infinite or NaN x
+      if isInt and ((a == 0 and not self.hasEffects(right)) or (b == 0 and not self.hasEffects(left))):
+        return self.literal(0, Scope.Type.INT)
+    elif op == BinaryOpNode.OpType.DIV:
+      if b == 1:
+        return left
+    return node
+
+  def postprocessUnaryOpNode(self, node: UnaryOpNode, expr: ASTNode) -> ASTNode:
+    node = super().postprocessUnaryOpNode(node, expr)
+    a = self.value(expr)
+    if a is not None:
+      result = Arithmetic.negate(node.getType(), a)
+      return node if result is None else self.literal(result, node.getType())
+    if isinstance(expr, UnaryOpNode) and expr.getOp() == UnaryOpNode.OpType.NEG:
+      return expr.getExpr()
+    return node
+
+  def decide(self, cond: CondNode) -> Union[bool, None]:
+    # the outcome of a comparison between two literals, or None if it is only known at run time
+    a, b = self.value(cond.getLeft()), self.value(cond.getRight())
+    if a is None or b is None:
+      return None
+    return Arithmetic.compare(cond.getOp(), a, b)
+
+  def postprocessIfStatementNode(self, node: IfStatementNode, cond: ASTNode, tlist: ASTNode, elist: ASTNode) -> ASTNode:
+    node = super().postprocessIfStatementNode(node, cond, tlist, elist)
+    taken = self.decide(cond)
+    if taken is None:
+      return node
+    self.numFolded += 1
+    if taken:
+      return tlist
+    return elist if elist is not None else StatementListNode()
+
+  def postprocessWhileNode(self, node: WhileNode, cond: ASTNode, slist: ASTNode) -> ASTNode:
+    node = super().postprocessWhileNode(node, cond, slist)
+    if self.decide(cond) is False:
+      self.numFolded += 1
+      return StatementListNode()
+    return node
@@ -0,0 +1,27 @@
+from typing import List
+
+from .CallGraph import CallGraph
+from .. import *
+
+class DeadFunctionElimination:
+  # Drops the functions that no chain of calls from main reaches, so they are neither compiled nor
+  # listed in the output. A program without main is left alone.
+
+  def __init__(self):
+    self.removed: List[str] = []
+
+  def run(self, node: FunctionListNode) -> FunctionListNode:
+    callGraph = CallGraph(node)
+    if "main" not in callGraph.functions:
+      return node
+    live = callGraph.live("main")
+    for f in list(node.getFunctions()):
+      if f.getFuncName() in live:
+        continue
+      self.removed.append(f.getFuncName())
+      node.getFunctions().remove(f)
+      # the function's symbol table goes with it
+      scope = f.getScope()
+      if scope.parentTable is not None and scope in scope.parentTable.subScopes:
+        scope.parentTable.subScopes.remove(scope)
+    return node
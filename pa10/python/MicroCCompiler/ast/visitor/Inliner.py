@@ -0,0 +1,84 @@
+import copy
+
+from .ASTRewriter import ASTRewriter
+from .CallGraph import CallGraph
+from .. import *
+from ...compiler.Scope import Scope
+
+class Inliner(ASTRewriter):
+  # Replaces calls to small, non-recursive functions with a copy of the callee's body (an InlineNode).
+  # The callee's parameters and locals become new locals of the caller, named <callee>.<n>.<name>,
+  # and the arguments are assigned to the parameter copies before the body runs. Functions are
+  # visited callees first, so a copy already contains whatever was inlined into the callee.
+  #
+  # Calling sequences cost dozens of instructions, so a callee of up to MAX_SIZE AST nodes is
+  # always inlined. A function with a single call site is inlined up to MAX_SINGLE_SIZE nodes, as its
+  # code mostly moves rather than grows. No caller grows beyond MAX_CALLER_SIZE nodes.
+
+  MAX_SIZE = 40
+  MAX_SINGLE_SIZE = 200
+  MAX_CALLER_SIZE = 1500
+
+  def __init__(self):
+    self.callGraph: CallGraph = None
+    self.caller: FunctionNode = None
+    self.callerSize = 0
+    self.numInlined = 0
+
+  def run(self, node: FunctionListNode) -> FunctionListNode:
+    self.callGraph = CallGraph(node)
+    for name in self.callGraph.bottomUp():
+      self.caller = self.callGraph.functions[name]
+      self.callerSize = self.size(self.caller.getFuncBody())
+      self.caller.accept(self)
+    return node
+
+  @staticmethod
+  def size(node) -> int:
+    # AST nodes under node
+    if isinstance(node, list):
+      return sum(Inliner.size(n) for n in node)
+    if not isinstance(node, ASTNode):
+      return 0
+    return 1 + sum(Inliner.size(child) for child in vars(node).values())
+
+  def postprocessCallNode(self, node: CallNode, args) -> ASTNode:
+    node = super().postprocessCallNode(node, args)
+    callee = self.callGraph.functions.get(node.getFuncName())
+    if callee is None or not self.shouldInline(node, callee):
+      return node
+    return self.expand(node, callee)
+
+  def shouldInline(self, call: CallNode, callee: FunctionNode) -> bool:
+    if self.callGraph.isRecursive(callee.getFuncName()):
+      return False
+    params = callee.getScope().getArguments()
+    if any(arg.getType() != param.getType() for arg, param in zip(call.getArgs(), params)):
+      return False
+    size = self.size(callee.getFuncBody())
+    limit = Inliner.MAX_SINGLE_SIZE if self.callGraph.callSites(callee.getFuncName()) == 1 else Inliner.MAX_SIZE
+    return size <= limit and self.callerSize + size <= Inliner.MAX_CALLER_SIZE
+
+  def expand(self, call: CallNode, callee: FunctionNode) -> InlineNode:
+    self.numInlined += 1
+    prefix = callee.getFuncName() + "." + str(self.numInlined) + "."
+
+    # the copy of the body refers to the caller's copies of the callee's symbols, and shares everything else
+    renamed = {}
+    for sym in list(callee.getScope().getEntries()):
+      renamed[id(sym)] = self.newLocal(prefix + sym.getName(), sym.getType())
+    result = self.newLocal(prefix + "result", call.getType())
+
+    statements = []
+    for param, arg in zip(callee.getScope().getArguments(), call.getArgs()):
+      copied = renamed[id(param)]
+      statements.append(AssignNode(VarNode(copied.getName(), copied), arg))
+    statements.extend(copy.deepcopy(callee.getFuncBody(), renamed).getStatements())
+
+    self.callerSize += self.size(callee.getFuncBody())
+    return InlineNode(call.ste, StatementListNode(li=statements), result)
+
+  def newLocal(self, name: str, type: Scope.Type) -> Scope.SymbolTableEntry:
+    scope = self.caller.getScope()
+    scope.addSymbol(type, name)
+    return scope.searchLocalScope(name)
@@ -0,0 +1,99 @@
+from typing import List, Tuple
+
+from .. import *
+from ...compiler.Scope import Scope
+
+class ScalarPromotion:
+  # Which globals a while loop can keep in a register while it runs. The loop must make no calls,
+  # which could read or write any global, so the register is the only copy that changes in between.
+  # It is loaded once in front of the loop and stored back where control leaves the loop.
+  #
+  # Code generators only enter the loop through a test of its condition, so the load must not
+  # read anything the loop itself would not. A global qualifies when the condition reads it, or when
+  # the body reads it before anything in the body may write it, on the path every first trip takes.
+
+  @staticmethod
+  def globals(node, found: List[Scope.SymbolTableEntry], inlined: bool = True):
+    # int and float globals read or written under node, in order of first appearance;
+    # without inlined, the bodies of InlineNodes are skipped, as they may only run in part
+    if isinstance(node, list):
+      for n in node:
+        ScalarPromotion.globals(n, found, inlined)
+      return
+    if not isinstance(node, ASTNode) or (isinstance(node, InlineNode) and not inlined):
+      return
+    if isinstance(node, VarNode):
+      sym = node.getSymbol()
+      if not sym.isLocal() and sym.getType() in (Scope.Type.INT, Scope.Type.FLOAT) and sym not in found:
+        found.append(sym)
+    for child in vars(node).values():
+      ScalarPromotion.globals(child, found, inlined)
+
+  @staticmethod
+  def assigned(node) -> List[Scope.SymbolTableEntry]:
+    # globals assigned or read into under node
+    if isinstance(node, list):
+      return [sym for n in node for sym in ScalarPromotion.assigned(n)]
+    if not isinstance(node, ASTNode):
+      return []
+    written = []
+    if isinstance(node, AssignNode) and isinstance(node.getLeft(), VarNode):
+      written.append(node.getLeft().getSymbol())
+    elif isinstance(node, ReadNode):
+      written.append(node.getVarNode().getSymbol())
+    written = [sym for sym in written if not sym.isLocal()]
+    return written + [sym for child in vars(node).values() for sym in ScalarPromotion.assigned(child)]
+
+  @staticmethod
+  def contains(node, types) -> bool:
+    if isinstance(node, list):
+      return any(ScalarPromotion.contains(n, types) for n in node)
+    if not isinstance(node, ASTNode):
+      return False
+    if isinstance(node, types):
+      return True
+    return any(ScalarPromotion.contains(child, types) for child in vars(node).values())
+
+  @staticmethod
+  def statements(node: StatementListNode) -> List[ASTNode]:
+    # the statements of a list in the order they run; the parser wraps loop bodies in a list of their own
+    flat = []
+    for statement in node.getStatements():
+      if isinstance(statement, StatementListNode):
+        flat.extend(ScalarPromotion.statements(statement))
+      else:
+        flat.append(statement)
+    return flat
+
+  @staticmethod
+  def candidates(node: WhileNode) -> Tuple[List[Scope.SymbolTableEntry], List[Scope.SymbolTableEntry]]:
+    # the globals the loop can keep in registers, and those among them it may change;
+    # the condition is generated once more in front of the loop, so it must not hold an inlined body
+    cond = node.getCondExpr()
+    if ScalarPromotion.contains(node, CallNode) or ScalarPromotion.contains(cond, InlineNode):
+      return [], []
+
+    safe: List[Scope.SymbolTableEntry] = []
+    ScalarPromotion.globals(cond, safe)
+    written: List[Scope.SymbolTableEntry] = []
+    for statement in ScalarPromotion.statements(node.getSList()):
+      if isinstance(statement, AssignNode):
+        reads = statement.getRight()
+      elif isinstance(statement, WriteNode):
+        reads = statement.getWriteExpr()
+      elif isinstance(statement, (IfStatementNode, WhileNode)):
+        reads = statement.getCondExpr()
+      elif isinstance(statement, ReturnNode):
+        reads = statement.getRetExpr()
+      else:
+        reads = None
+      found: List[Scope.SymbolTableEntry] = []
+      ScalarPromotion.globals(reads, found, inlined=False)
+      safe.extend(sym for sym in found if sym not in written and sym not in safe)
+      if isinstance(statement, ReturnNode):
+        break
+      written.extend(ScalarPromotion.assigned(statement))
+
+    changed = ScalarPromotion.assigned(node)
+    stored = [sym for sym in safe if sym in changed]
+    return safe, stored
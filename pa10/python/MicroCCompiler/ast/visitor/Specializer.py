@@ -0,0 +1,127 @@
+import copy
+from typing import Dict, List, Set, Tuple
+
+from .ASTRewriter import ASTRewriter
+from .CallGraph import CallGraph
+from .Inliner import Inliner
+from .. import *
+from ...compiler.LocalScope import LocalScope
+from ...compiler.SymbolTable import StaticVariables
+
+class ParameterBinding(ASTRewriter):
+  # Replaces every read of the given symbols with a copy of a literal.
+
+  def __init__(self, values: Dict[int, ASTNode]):
+    self.values = values
+
+  def postprocessVarNode(self, node: VarNode) -> ASTNode:
+    value = self.values.get(id(node.getSymbol()))
+    return copy.deepcopy(value) if value is not None else node
+
+class Specializer(ASTRewriter):
+  # Interprocedural constant propagation: a call that passes literals to a non-recursive function
+  # is redirected to a clone of the function, named <callee>_<n>, that takes only the other arguments.
+  # In the clone a parameter that is never assigned is replaced by its literal wherever it is read,
+  # and any other becomes a local assigned the literal on entry. Call sites passing the same literals
+  # share a clone. Constant folding and the later passes then see the values.
+  #
+  # Only callees of up to MAX_SIZE AST nodes are cloned, and the clones add at most MAX_GROWTH nodes
+  # to the program. Clones are visited like any other function, so their calls are specialized too.
+
+  MAX_SIZE = 200
+  MAX_GROWTH = 1000
+
+  def __init__(self):
+    self.callGraph: CallGraph = None
+    self.program: FunctionListNode = None
+    self.clones: Dict[Tuple[str, Tuple[Tuple[int, str], ...]], str] = {}
+    self.growth = 0
+    # functions still to visit, clones included
+    self.worklist: List[FunctionNode] = []
+
+  def run(self, node: FunctionListNode) -> FunctionListNode:
+    self.callGraph = CallGraph(node)
+    self.program = node
+    self.worklist = list(node.getFunctions())
+    while len(self.worklist) > 0:
+      self.worklist.pop(0).accept(self)
+    return node
+
+  @staticmethod
+  def assigned(node) -> Set[int]:
+    # ids of the symbols node assigns or reads input into
+    if isinstance(node, list):
+      return set().union(*(Specializer.assigned(n) for n in node))
+    if not isinstance(node, ASTNode):
+      return set()
+    written = set()
+    if isinstance(node, AssignNode) and isinstance(node.getLeft(), VarNode):
+      written.add(id(node.getLeft().getSymbol()))
+    elif isinstance(node, ReadNode):
+      written.add(id(node.getVarNode().getSymbol()))
+    return written.union(*(Specializer.assigned(child) for child in vars(node).values()))
+
+  def postprocessCallNode(self, node: CallNode, args) -> ASTNode:
+    node = super().postprocessCallNode(node, args)
+    callee = self.callGraph.functions.get(node.getFuncName())
+    if callee is None or self.callGraph.isRecursive(callee.getFuncName()):
+      return node
+    params = callee.getScope().getArguments()
+    constants = [i for i, (arg, param) in enumerate(zip(node.getArgs(), params))
+                 if isinstance(arg, (IntLitNode, FloatLitNode)) and arg.getType() == param.getType()]
+    if len(constants) == 0:
+      return node
+
+    key = (callee.getFuncName(), tuple((i, node.getArgs()[i].getVal()) for i in constants))
+    if key not in self.clones:
+      size = Inliner.size(callee.getFuncBody())
+      if size > Specializer.MAX_SIZE or self.growth + size > Specializer.MAX_GROWTH:
+        return node
+      self.growth += size
+      self.clones[key] = self.clone(callee, {i: node.getArgs()[i] for i in constants})
+    return CallNode(self.clones[key], [arg for i, arg in enumerate(node.getArgs()) if i not in constants])
+
+  def clone(self, callee: FunctionNode, constants: Dict[int, ASTNode]) -> str:
+    globalScope = StaticVariables.getSymbolTableSingleton().getGlobalScope()
+    n = 1
+    while globalScope.searchLocalScope(callee.getFuncName() + "_" + str(n)) is not None:
+      n += 1
+    name = callee.getFuncName() + "_" + str(n)
+
+    scope: LocalScope = globalScope.addSubScope(name)
+    params = callee.getScope().getArguments()
+    kept = [p for i, p in enumerate(params) if i not in constants]
+    ste = StaticVariables.getSymbolTableSingleton().getFunctionSymbol(callee.getFuncName())
+    globalScope.addFunctionSymbol(ste.getReturnType(), name, [p.getType() for p in kept])
+    globalScope.searchLocalScope(name).setDefined(True)
+
+    # the clone gets symbols of its own: parameters are added last first, as the parser does
+    renamed = {}
+    for p in reversed(kept):
+      scope.addArgument(p.getType(), p.getName())
+      renamed[id(p)] = scope.searchLocalScope(p.getName())
+    written = self.assigned(callee.getFuncBody())
+    bound: Dict[int, ASTNode] = {}
+    prologue = []
+    for sym in list(callee.getScope().getEntries()):
+      if id(sym) in renamed:
+        continue
+      index = next((i for i, p in enumerate(params) if p is sym), None)
+      if index is not None and id(sym) not in written:
+        bound[id(sym)] = constants[index]
+        continue
+      scope.addSymbol(sym.getType(), sym.getName())
+      renamed[id(sym)] = scope.searchLocalScope(sym.getName())
+      if index is not None:
+        local = renamed[id(sym)]
+        prologue.append(AssignNode(VarNode(local.getName(), local), copy.deepcopy(constants[index])))
+
+    body = copy.deepcopy(callee.getFuncBody(), renamed)
+    body = body.accept(ParameterBinding(bound))
+    body.getStatements()[:0] = prologue
+
+    function = FunctionNode(body, name, scope)
+    functions = self.program.getFunctions()
+    functions.insert(functions.index(callee) + 1, function)
+    self.worklist.append(function)
+    return name
@@ -2,6 +2,7 @@ import sys
 
 from .AbstractASTVisitor import AbstractASTVisitor
 from ...compiler.Scope import Scope
+from ...ir.Constant import Constant
 
 
 class TypeChecker(AbstractASTVisitor):
@@ -10,6 +11,15 @@ class TypeChecker(AbstractASTVisitor):
     print("TYPE ERROR", file=sys.stderr)
     sys.exit(7)
 
+  def postprocessIntLitNode(self, node):
+    # a leading 0 makes the literal octal, as the simulator reads LI immediates, so 08 or 09
+    # could never be loaded; reject it here the way the parser rejects malformed input
+    try:
+      Constant.fromLiteral(node.getVal(), Scope.Type.INT)
+    except ValueError:
+      print("Not Accepted")
+      sys.exit(1)
+
   def postprocessBinaryOpNode(self, node, left, right):
     lt = node.getLeft().getType()
     rt = node.getRight().getType()
@@ -1,2 +1,8 @@
 from .ASTVisitor import ASTVisitor
 from .AbstractASTVisitor import AbstractASTVisitor
+from .ASTRewriter import ASTRewriter
+from .CallGraph import CallGraph
+from .DeadFunctionElimination import DeadFunctionElimination
+from .Inliner import Inliner
+from .Specializer import Specializer
+from .ScalarPromotion import ScalarPromotion
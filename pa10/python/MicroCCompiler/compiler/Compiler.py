@@ -8,8 +8,13 @@ from MicroCParser import MicroCParser
 
 from .Scope import Scope
 from .SymbolTable import StaticVariables, SymbolTable
+from .Options import Options
 from ..ast.ASTNode import ASTNode
 from ..ast.visitor.TypeChecker import TypeChecker
+from ..ast.visitor.Inliner import Inliner
+from ..ast.visitor.Specializer import Specializer
+from ..ast.visitor.ConstantFolder import ConstantFolder
+from ..ast.visitor.DeadFunctionElimination import DeadFunctionElimination
 from ..assembly.CodeGenerator import CodeGenerator
 from ..assembly.CodeObject import CodeObject
 
@@ -21,46 +26,74 @@ class MyErrorStrategy(DefaultErrorStrategy):
         print("Not Accepted")
         exit(1)
 
-def printStrings(st: SymbolTable):
+def getStringEntries(st: SymbolTable):
+  # (address, quoted literal) for every string constant, as listed in the .strings section
   g = st.getGlobalScope()
   stes = g.getEntries()
 
+  return [(int(ste.getAddress()), ste.getValue()) for ste in stes if ste.getType() == Scope.Type.STRING]
+
+def printStrings(st: SymbolTable):
   print("\n.section .strings")
 
-  for ste in stes:
-    if ste.getType() == Scope.Type.STRING:
-      print("{} {}".format(hex(int(ste.getAddress())), ste.getValue()))
+  for addr, value in getStringEntries(st):
+    print("{} {}".format(hex(addr), value))
+
+def compileFile(filename, options: Options = None):
+    # parse, type check and generate code for one file; returns the CodeObject and its symbol table
+    # the symbol table singleton is replaced first so that several files can be compiled in one process
+    StaticVariables.resetSymbolTableSingleton()
+
+    input_stream = FileStream(filename)
+    lexer = MicroCLexer(input_stream)
+
+    token_stream = CommonTokenStream(lexer)
+    parser = MicroCParser(token_stream)
+
+    parser._errHandler = MyErrorStrategy()
+
+    parser.setSymbolTable(StaticVariables.getSymbolTableSingleton())
+
+    _parse_tree = parser.program()
 
-def main(filename):
+    ast = parser.getAST()
+    # Type checking
+    tc = TypeChecker()
+    tc.run(ast)
+
+    if options is not None and options.enabled('deadfunc'):
+        DeadFunctionElimination().run(ast)
+
+    if options is not None and options.enabled('constfold'):
+        ConstantFolder().run(ast)
+
+    if options is not None and options.enabled('specialize'):
+        Specializer().run(ast)
+        if options.enabled('constfold'):
+            # fold what the bound parameters made constant
+            ConstantFolder().run(ast)
+
+    if options is not None and options.enabled('inline'):
+        Inliner().run(ast)
+        if options.enabled('deadfunc'):
+            # callees inlined at every call site are unreachable now
+            DeadFunctionElimination().run(ast)
+
+    # Now back to code generation
+    cg = CodeGenerator(options)
+    co = cg.run(ast)
+
+    return co, parser.getSymbolTable()
+
+def main(filename, options: Options = None):
     try:
-        input_stream = FileStream(filename)
-        lexer = MicroCLexer(input_stream)
-        
-        token_stream = CommonTokenStream(lexer)
-        parser = MicroCParser(token_stream)
-        
-        parser._errHandler = MyErrorStrategy()
-        
-        parser.setSymbolTable(StaticVariables.getSymbolTableSingleton())
-        
-        _parse_tree = parser.program()
-        
-
-
-        ast = parser.getAST()
-        # Type checking
-        tc = TypeChecker()
-        tc.run(ast)
-
-        # Now back to code generation
-        parser.getSymbolTable().printTable()
-
-        cg = CodeGenerator()
-        co = cg.run(ast)
+        co, st = compileFile(filename, options)
+
+        st.printTable()
 
         print(".section .text")
         print(co)
-        printStrings(parser.getSymbolTable())
+        printStrings(st)
 
     except FileNotFoundError:
         print("File not found")
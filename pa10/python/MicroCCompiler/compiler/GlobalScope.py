@@ -1,11 +1,16 @@
 from .Scope import Scope
-from typing import List
+from typing import List, Union
 
 class GlobalScope(Scope):
+    # gp points this far past the first global, so that the 12-bit signed offsets
+    # of LW/SW reach the first 1024 globals from it
+    GP_BIAS: int = 2048
+
     def __init__(self, stringBase: int, globalBase: int):
         super().__init__(None)
         self.globalBase: int = globalBase
         self.stringBase: int = stringBase
+        self.globalPointer: int = globalBase + GlobalScope.GP_BIAS
     
     def genSymbol(self, type: Scope.Type, name: str) -> Scope.SymbolTableEntry:
         addr: int = self.globalBase
@@ -13,6 +18,11 @@ class GlobalScope(Scope):
         self.globalBase += 4
         return ste
     
+    def gpOffset(self, ste: Scope.SymbolTableEntry) -> Union[int, None]:
+        # offset of a global from gp, or None if it is out of reach
+        offset: int = ste.getAddress() - self.globalPointer
+        return offset if -GlobalScope.GP_BIAS <= offset < GlobalScope.GP_BIAS else None
+
     def genStringSymbol(self, type: Scope.Type, name: str, value: str) -> Scope.StringSymbolTableEntry:
         addr: int = self.stringBase
         ste: Scope.StringSymbolTableEntry = Scope.StringSymbolTableEntry(type, name, value, addr, False)
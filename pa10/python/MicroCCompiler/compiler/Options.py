@@ -0,0 +1,89 @@
+from typing import Dict, List, Set, Tuple
+
+class Options:
+    # Code generation flags, set on the command line with -f<name> / -fno-<name>.
+    # -O turns on every flag marked as an optimization.
+    # name: (default, enabled by -O, description)
+    FLAGS: Dict[str, Tuple[bool, bool, str]] = {
+        'regalloc': (True, True, 'map temps onto the 32 RV32 registers, spilling to the frame'),
+        'savelive': (True, True, 'save only registers a caller needs preserved across the call'),
+        'regcall': (False, True, 'pass arguments in a0-a7/fa0-fa7, return in a0/fa0, spill ra only in non-leaf functions'),
+        'peephole': (False, True, 'rewrite the generated code with the peephole rule table'),
+        'ssa': (False, True, 'generate each function through an SSA form that keeps locals in registers'),
+        'sccp': (False, True, 'sparse conditional constant propagation on the SSA form (needs -fssa)'),
+        'adce': (False, True, 'aggressive dead code elimination on the SSA form (needs -fssa)'),
+        'ivsr': (False, True, 'replace multiplications by induction variables with additions (needs -fssa)'),
+        'strength': (False, True, 'multiply and divide by constants with shifts and adds where that is cheaper'),
+        'gprel': (False, True, 'address globals with one LW/SW relative to gp, which is set once at program start'),
+        'lvn': (False, True, 'local value numbering: reuse values already computed or loaded in the same basic block'),
+        'rotate': (False, True, 'turn while loops into a guard and a bottom-tested loop, saving a jump per trip'),
+        'licm': (False, True, 'hoist loop-invariant computations and loads in front of their loop'),
+        'constfold': (False, True, 'fold constant arithmetic and comparisons in the AST and drop branches that never run'),
+        'schedule': (False, True, 'reorder each basic block so that loads and float operations are not used right away'),
+        'inline': (False, True, 'replace calls to small non-recursive functions with a copy of their body'),
+        'tailcall': (False, True, 'turn return f(...) inside f into parameter updates and a jump back to the body'),
+        'specialize': (False, True, 'clone small non-recursive functions for the literal arguments they are called with'),
+        'deadfunc': (False, True, 'drop functions that no chain of calls from main reaches'),
+        'promote': (False, True, 'keep locals in temps, and globals in temps while a loop without calls runs'),
+        'dse': (False, True, 'remove stores to frame slots that are never read again and values that are never used'),
+        'frame': (False, True, 'move sp once per frame, and build no frame for leaf functions that need no stack slots'),
+    }
+
+    # flags that only work on top of another flag
+    REQUIRES: Dict[str, str] = {
+        # unallocated float temps f10-f17 are the same registers as fa0-fa7
+        'regcall': 'regalloc',
+        'sccp': 'ssa',
+        'adce': 'ssa',
+        'ivsr': 'ssa',
+    }
+
+    def __init__(self, **flags: bool):
+        self.flags: Dict[str, bool] = {name: spec[0] for name, spec in Options.FLAGS.items()}
+        # flags set by name, as opposed to those left at their default or turned on by -O
+        self.explicit: Set[str] = set()
+        for name, value in flags.items():
+            self.set(name, value)
+
+    def set(self, name: str, value: bool):
+        if name not in Options.FLAGS:
+            raise Exception("Unknown compiler flag: " + name)
+        self.flags[name] = value
+        self.explicit.add(name)
+
+    def resolve(self):
+        # a flag whose requirement is off is turned off with it, so -O -fno-ssa drops sccp, adce
+        # and ivsr; it is an error only when the flag itself was asked for, as in -fsccp -fno-ssa
+        for name, required in Options.REQUIRES.items():
+            if self.flags[name] and not self.flags[required]:
+                if name in self.explicit:
+                    raise Exception("-f" + name + " requires -f" + required)
+                self.flags[name] = False
+
+    def enabled(self, name: str) -> bool:
+        return self.flags[name]
+
+    def optimizeAll(self):
+        for name, spec in Options.FLAGS.items():
+            if spec[1]:
+                self.flags[name] = True
+
+    @staticmethod
+    def parse(args: List[str]) -> Tuple['Options', List[str]]:
+        # returns the options and the arguments that are not flags
+        options = Options()
+        rest: List[str] = []
+        for arg in args:
+            if arg == '-O':
+                options.optimizeAll()
+            elif arg.startswith('-fno-'):
+                options.set(arg[len('-fno-'):], False)
+            elif arg.startswith('-f'):
+                options.set(arg[len('-f'):], True)
+            else:
+                rest.append(arg)
+        options.resolve()
+        return options, rest
+
+    def __str__(self) -> str:
+        return " ".join(("-f" if on else "-fno-") + name for name, on in self.flags.items())
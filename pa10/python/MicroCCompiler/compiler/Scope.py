@@ -21,9 +21,15 @@ class Scope(ABC):
             self.setType(type)
             self.setAddress(address)
             self._isLocal = isLocal
+            self.register: Union[str, None] = None
         
+        def __deepcopy__(self, memo):
+            # copies of the AST refer to the same symbols
+            return self
+
         def __str__(self) -> str:
-            return f"; name {self.getName()} type {self.getType()} location {self.addressToString()}"
+            location = self.addressToString() if self.register is None else self.register
+            return f"; name {self.getName()} type {self.getType()} location {location}"
         def getType(self) -> 'Scope.Type':
             return self.type
         def setType(self, type: 'Scope.Type'):
@@ -40,6 +46,11 @@ class Scope(ABC):
             return (str(self.getAddress())) if self._isLocal else ("{}".format(hex(int(self.getAddress()))))
         def isLocal(self) -> bool:
             return self._isLocal
+        def getRegister(self) -> Union[str, None]:
+            return self.register
+        def setRegister(self, register: Union[str, None]):
+            # arguments passed in a register under the register calling convention
+            self.register = register
     
     class StringSymbolTableEntry(SymbolTableEntry):
         def __init__(self, type: 'Scope.Type', name: str, value: str, address: int, isLocal: bool=False):
@@ -155,6 +166,8 @@ class Scope(ABC):
 class LocalScope(Scope):
     startingLocalsOffset: int = -4  # start local var offset with room for old frame pointer
     startingArgsOffset: int = 12 # start argument offset with room for old fp, old return address and return value
+    startingStackArgsOffset: int = 4 # with register arguments only the old fp sits below the stack arguments
+    numArgRegisters: int = 8
 
     def __init__(self, parent: Scope=None):
         super().__init__(parent)
@@ -163,6 +176,7 @@ class LocalScope(Scope):
         self.name: str = "FUNCTION NAME NOT SET"
         self.localsOffset: int = LocalScope.startingLocalsOffset
         self.argsOffset: int = LocalScope.startingArgsOffset 
+        self.arguments: List[Scope.SymbolTableEntry] = [] # in the order they are added, which is last parameter first
     
     def addArgument(self, type: Scope.Type, name: str) -> Scope.ErrorType:
         retVal: Scope.ErrorType = self.checkSymbol(name)
@@ -173,8 +187,41 @@ class LocalScope(Scope):
         ste: Scope.SymbolTableEntry = Scope.SymbolTableEntry(type, name, addr, True)
         self.argsOffset += 4
         self.numArgs += 1
+        self.arguments.append(ste)
         return ste
 
+    @staticmethod
+    def argumentRegisters(argTypes: List[Scope.Type]) -> List[Union[str, None]]:
+        # register calling convention: the first eight int and the first eight float arguments
+        # travel in a0-a7 and fa0-fa7; None means the argument is passed on the stack
+        regs: List[Union[str, None]] = []
+        numInt = 0
+        numFloat = 0
+        for t in argTypes:
+            if t == Scope.Type.FLOAT:
+                regs.append("fa" + str(numFloat) if numFloat < LocalScope.numArgRegisters else None)
+                numFloat += 1
+            else:
+                regs.append("a" + str(numInt) if numInt < LocalScope.numArgRegisters else None)
+                numInt += 1
+        return regs
+
+    def getArguments(self) -> List[Scope.SymbolTableEntry]:
+        # parameters in declaration order
+        return list(reversed(self.arguments))
+
+    def assignArgumentRegisters(self):
+        # switch this function's parameters to the register calling convention;
+        # arguments that do not get a register keep a stack slot, without the return value and ra slots
+        params = self.getArguments()
+        regs = LocalScope.argumentRegisters([p.getType() for p in params])
+        offset = LocalScope.startingStackArgsOffset
+        for p, reg in reversed(list(zip(params, regs))):
+            p.setRegister(reg)
+            if reg is None:
+                p.setAddress(offset)
+                offset += 4
+
     def genSymbol(self, type: Scope.Type, name: str) -> Scope.SymbolTableEntry:
         addr: int = self.localsOffset
         ste: Scope.SymbolTableEntry = Scope.SymbolTableEntry(type, name, addr, True)
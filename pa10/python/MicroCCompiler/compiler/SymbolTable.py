@@ -91,6 +91,9 @@ class StaticVariables:
   symbolTable = SymbolTable()
   def getSymbolTableSingleton():
     return StaticVariables.symbolTable
+  def resetSymbolTableSingleton():
+    StaticVariables.symbolTable = SymbolTable()
+    return StaticVariables.symbolTable
 
 if __name__ == "__main__":
     st = SymbolTable()
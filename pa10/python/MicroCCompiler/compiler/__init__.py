@@ -2,3 +2,4 @@ from .Scope import Scope
 from .GlobalScope import GlobalScope
 from .LocalScope import LocalScope
 from .SymbolTable import SymbolTable
+from .Options import Options
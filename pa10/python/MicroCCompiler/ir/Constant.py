@@ -0,0 +1,34 @@
+from .Value import Value
+from ..compiler import Scope
+
+class Constant(Value):
+  # An int or float known at compile time. Constants are not placed in blocks:
+  # they are materialized with LI or FIMM.S next to each use when the IR is lowered.
+  def __init__(self, value, type):
+    super().__init__(type)
+    self.value = value
+
+  @staticmethod
+  def fromLiteral(text: str, type) -> 'Constant':
+    if type == Scope.Type.FLOAT:
+      return Constant(float(text), type)
+    # read integer literals the way the simulator reads LI immediates
+    if text.startswith('0x'):
+      return Constant(int(text, 16), type)
+    if text.startswith('0') and len(text) > 1:
+      return Constant(int(text, 8), type)
+    return Constant(int(text), type)
+
+  @staticmethod
+  def zero(type) -> 'Constant':
+    return Constant(0.0 if type == Scope.Type.FLOAT else 0, type)
+
+  def isConstant(self) -> bool:
+    return True
+
+  def toString(self) -> str:
+    # text for the LI/FIMM.S immediate; repr round-trips floats exactly
+    return repr(self.value) if self.type == Scope.Type.FLOAT else str(self.value)
+
+  def __str__(self):
+    return self.toString()
@@ -0,0 +1,60 @@
+from typing import List
+
+from .instructions import *
+
+class IRBlock:
+  # A basic block of the IR: its phis, then straight-line instructions ending in one terminator
+  # (Jump, Branch or Return). Edges are linked when the terminator is appended.
+  def __init__(self, name: str):
+    self.name = name
+    self.index = -1
+    self.phis: List[Phi] = []
+    self.instructions: List[IRInstruction] = []
+    self.predecessors: List['IRBlock'] = []
+    self.successors: List['IRBlock'] = []
+
+  def append(self, inst: IRInstruction) -> IRInstruction:
+    inst.block = self
+    self.instructions.append(inst)
+    if inst.isTerminator():
+      for target in inst.getTargets():
+        self.link(target)
+    return inst
+
+  def addPhi(self, phi: Phi) -> Phi:
+    phi.block = self
+    self.phis.append(phi)
+    return phi
+
+  def link(self, target: 'IRBlock'):
+    if target not in self.successors:
+      self.successors.append(target)
+      target.predecessors.append(self)
+
+  def getTerminator(self) -> IRInstruction:
+    if len(self.instructions) > 0 and self.instructions[-1].isTerminator():
+      return self.instructions[-1]
+    return None
+
+  def isTerminated(self) -> bool:
+    return self.getTerminator() is not None
+
+  def insertBeforeTerminator(self, inst: IRInstruction):
+    inst.block = self
+    self.instructions.insert(len(self.instructions) - 1, inst)
+
+  def remove(self, inst: IRInstruction):
+    if isinstance(inst, Phi):
+      self.phis.remove(inst)
+    else:
+      self.instructions.remove(inst)
+    inst.dropOperands()
+
+  def replaceTerminator(self, inst: IRInstruction):
+    # the caller recomputes edges afterwards
+    self.remove(self.instructions[-1])
+    inst.block = self
+    self.instructions.append(inst)
+
+  def __str__(self):
+    return self.name
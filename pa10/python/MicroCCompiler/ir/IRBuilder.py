@@ -0,0 +1,312 @@
+from typing import Dict, List, Set, Tuple
+
+from ..ast import *
+from ..ast.visitor.AbstractASTVisitor import AbstractASTVisitor
+from ..ast.visitor.ScalarPromotion import ScalarPromotion
+from ..compiler import *
+from .Constant import Constant
+from .IRBlock import IRBlock
+from .IRFunction import IRFunction
+from .Value import Value
+from .instructions import *
+
+class IRBuilder(AbstractASTVisitor):
+  # Builds the SSA form of one FunctionNode directly from the AST, placing phis while it goes
+  # (Braun et al., "Simple and Efficient Construction of Static Single Assignment Form").
+  # Locals and parameters become SSA values; globals stay in memory behind LoadGlobal/StoreGlobal.
+  # With promoteGlobals, a loop that makes no calls holds the globals ScalarPromotion picks in SSA
+  # values too: it is entered through a test of its condition, loads them in front of its body and
+  # stores the ones it may change wherever control leaves it.
+  #
+  # A block is sealed once all of its predecessors are known. Reading a variable in an unsealed
+  # block (a loop header while its body is built) leaves an incomplete phi that is filled in on sealing.
+  # Expressions return their Value; conditions return (op, left, right); statements return None.
+
+  def __init__(self, selfTailCalls: bool = False, promoteGlobals: bool = False):
+    # with selfTailCalls, return f(...) inside f jumps back to the start of the body
+    self.selfTailCalls = selfTailCalls
+    self.promoteGlobals = promoteGlobals
+    # globals held in SSA values by the loop being built, and those it has to store when left
+    self.promoted: List[Scope.SymbolTableEntry] = []
+    self.promotedStores: List[Scope.SymbolTableEntry] = []
+    self.function: IRFunction = None
+    self.block: IRBlock = None
+    self.bodyBlock: IRBlock = None
+    self.currentDef: Dict[Scope.SymbolTableEntry, Dict[IRBlock, Value]] = {}
+    self.sealed: Set[IRBlock] = set()
+    self.incompletePhis: Dict[IRBlock, Dict[Scope.SymbolTableEntry, Phi]] = {}
+    # phis found to be trivial, and the value that replaced them
+    self.replaced: Dict[Phi, Value] = {}
+    # (exit block, result symbol) of each InlineNode being built, innermost last
+    self.inlineExits: List[Tuple[IRBlock, Scope.SymbolTableEntry]] = []
+
+  def build(self, node: FunctionNode) -> IRFunction:
+    self.function = IRFunction(node.getFuncName(), node.getScope())
+    self.block = self.function.newBlock()
+    self.sealBlock(self.block)
+
+    for param in node.getScope().getArguments():
+      self.writeVariable(param, self.block, self.block.append(Param(param)))
+
+    if self.selfTailCalls:
+      # self tail calls come back here, so the block stays open until the body is built
+      self.bodyBlock = self.function.newBlock()
+      self.block.append(Jump(self.bodyBlock))
+      self.block = self.bodyBlock
+
+    node.getFuncBody().accept(self)
+    if not self.block.isTerminated():
+      self.block.append(Return())
+    if self.selfTailCalls:
+      self.sealBlock(self.bodyBlock)
+
+    self.function.removeUnreachable()
+    return self.function
+
+  #### SSA construction ####
+
+  def isVariable(self, sym: Scope.SymbolTableEntry) -> bool:
+    # locals and parameters live in SSA values; globals and strings do not, unless promoted
+    return sym.isLocal() or sym in self.promoted
+
+  def writeVariable(self, sym, block: IRBlock, value: Value):
+    self.currentDef.setdefault(sym, {})[block] = value
+
+  def readVariable(self, sym, block: IRBlock) -> Value:
+    defs = self.currentDef.setdefault(sym, {})
+    if block in defs:
+      return self.resolve(defs[block])
+    return self.readVariableRecursive(sym, block)
+
+  def resolve(self, value: Value) -> Value:
+    while value in self.replaced:
+      value = self.replaced[value]
+    return value
+
+  def readVariableRecursive(self, sym, block: IRBlock) -> Value:
+    if block not in self.sealed:
+      value = block.addPhi(Phi(sym.getType(), sym))
+      self.incompletePhis.setdefault(block, {})[sym] = value
+    elif len(block.predecessors) == 0:
+      # read before any assignment
+      value = Constant.zero(sym.getType())
+    elif len(block.predecessors) == 1:
+      value = self.readVariable(sym, block.predecessors[0])
+    else:
+      phi = block.addPhi(Phi(sym.getType(), sym))
+      # break cycles through loops before looking at the predecessors
+      self.writeVariable(sym, block, phi)
+      value = self.resolve(self.addPhiOperands(sym, phi))
+    self.writeVariable(sym, block, value)
+    return value
+
+  def addPhiOperands(self, sym, phi: Phi) -> Value:
+    for pred in phi.block.predecessors:
+      phi.addIncoming(self.resolve(self.readVariable(sym, pred)), pred)
+    return self.tryRemoveTrivialPhi(phi)
+
+  def tryRemoveTrivialPhi(self, phi: Phi) -> Value:
+    same = None
+    for op in phi.operands:
+      if op is same or op is phi:
+        continue
+      if same is not None and not (same.isConstant() and op.isConstant() and same.value == op.value):
+        return phi
+      same = op
+    if same is None:
+      same = Constant.zero(phi.type)
+
+    users = [u for u in phi.users if u is not phi]
+    phi.replaceAllUsesWith(same)
+    phi.block.remove(phi)
+    self.replaced[phi] = same
+    for u in users:
+      if isinstance(u, Phi) and u.block is not None and u in u.block.phis:
+        self.tryRemoveTrivialPhi(u)
+    return same
+
+  def sealBlock(self, block: IRBlock):
+    for sym, phi in self.incompletePhis.pop(block, {}).items():
+      self.addPhiOperands(sym, phi)
+    self.sealed.add(block)
+
+  def startUnreachable(self):
+    # code after a return: it is built, then dropped with the other unreachable blocks
+    self.block = self.function.newBlock()
+    self.sealBlock(self.block)
+
+  #### expressions ####
+
+  def postprocessVarNode(self, node: VarNode) -> Value:
+    sym = node.getSymbol()
+    if self.isVariable(sym):
+      return self.readVariable(sym, self.block)
+    if sym.getType() == Scope.Type.STRING:
+      return None
+    return self.block.append(LoadGlobal(sym))
+
+  def postprocessIntLitNode(self, node: IntLitNode) -> Value:
+    return Constant.fromLiteral(node.getVal(), Scope.Type.INT)
+
+  def postprocessFloatLitNode(self, node: FloatLitNode) -> Value:
+    return Constant.fromLiteral(node.getVal(), Scope.Type.FLOAT)
+
+  def postprocessBinaryOpNode(self, node: BinaryOpNode, left: Value, right: Value) -> Value:
+    return self.block.append(BinaryOp(node.getOp(), left.getType(), left, right))
+
+  def postprocessUnaryOpNode(self, node: UnaryOpNode, expr: Value) -> Value:
+    return self.block.append(Neg(expr.getType(), expr))
+
+  def postprocessCallNode(self, node: CallNode, args) -> Value:
+    return self.block.append(Call(node, args))
+
+  def postprocessCondNode(self, node: CondNode, left: Value, right: Value):
+    return (node.getOp(), left, right)
+
+  #### statements ####
+
+  def assign(self, sym, value: Value):
+    if self.isVariable(sym):
+      self.writeVariable(sym, self.block, value)
+    else:
+      self.block.append(StoreGlobal(sym, value))
+
+  def visitAssignNode(self, node: AssignNode):
+    value = node.getRight().accept(self)
+    self.assign(node.getLeft().getSymbol(), value)
+
+  def visitReadNode(self, node: ReadNode):
+    sym = node.getVarNode().getSymbol()
+    self.assign(sym, self.block.append(Read(sym.getType())))
+
+  def visitWriteNode(self, node: WriteNode):
+    expr = node.getWriteExpr()
+    if expr.getType() == Scope.Type.STRING:
+      self.block.append(WriteString(expr.getSymbol()))
+    else:
+      # the expression may end in another block (an inlined call), so it is built first
+      value = expr.accept(self)
+      self.block.append(Write(value))
+
+  def storePromoted(self):
+    # control leaves the promoted loop: memory gets the globals' current values
+    for sym in self.promotedStores:
+      self.block.append(StoreGlobal(sym, self.readVariable(sym, self.block)))
+
+  def isSelfTailCall(self, node: ReturnNode) -> bool:
+    call = node.getRetExpr()
+    if not self.selfTailCalls or len(self.inlineExits) > 0:
+      return False
+    if not isinstance(call, CallNode) or call.getFuncName() != self.function.name:
+      return False
+    params = self.function.scope.getArguments()
+    return all(arg.getType() == param.getType() for arg, param in zip(call.getArgs(), params))
+
+  def visitReturnNode(self, node: ReturnNode):
+    if self.isSelfTailCall(node):
+      # every argument is evaluated before any parameter changes
+      values = [arg.accept(self) for arg in node.getRetExpr().getArgs()]
+      for param, value in zip(self.function.scope.getArguments(), values):
+        self.writeVariable(param, self.block, value)
+      self.storePromoted()
+      self.block.append(Jump(self.bodyBlock))
+      self.startUnreachable()
+      return
+
+    value = node.getRetExpr().accept(self)
+    if len(self.inlineExits) > 0:
+      exit, result = self.inlineExits[-1]
+      self.assign(result, value)
+      self.storePromoted()
+      self.block.append(Jump(exit))
+    else:
+      self.storePromoted()
+      self.block.append(Return(value))
+    self.startUnreachable()
+
+  def visitInlineNode(self, node: InlineNode) -> Value:
+    exit = self.function.newBlock()
+    self.inlineExits.append((exit, node.getResult()))
+    node.getBody().accept(self)
+    self.inlineExits.pop()
+    if not self.block.isTerminated():
+      self.block.append(Jump(exit))
+    self.sealBlock(exit)
+    self.block = exit
+    return self.readVariable(node.getResult(), exit)
+
+  def visitIfStatementNode(self, node: IfStatementNode):
+    op, left, right = node.getCondExpr().accept(self)
+    thenBlock = self.function.newBlock()
+    elseBlock = self.function.newBlock() if node.getElseBlock() is not None else None
+    join = self.function.newBlock()
+    self.block.append(Branch(op, left, right, thenBlock, elseBlock if elseBlock is not None else join))
+
+    for block, body in ((thenBlock, node.getThenBlock()), (elseBlock, node.getElseBlock())):
+      if block is None:
+        continue
+      self.sealBlock(block)
+      self.block = block
+      body.accept(self)
+      if not self.block.isTerminated():
+        self.block.append(Jump(join))
+
+    self.sealBlock(join)
+    self.block = join
+
+  def visitWhileNode(self, node: WhileNode):
+    if self.promoteGlobals and len(self.promoted) == 0:
+      promoted, stored = ScalarPromotion.candidates(node)
+      if len(promoted) > 0:
+        self.buildPromotedLoop(node, promoted, stored)
+        return
+
+    header = self.function.newBlock()
+    self.block.append(Jump(header))
+    self.block = header
+    op, left, right = node.getCondExpr().accept(self)
+
+    body = self.function.newBlock()
+    exit = self.function.newBlock()
+    self.block.append(Branch(op, left, right, body, exit))
+    self.sealBlock(body)
+    self.sealBlock(exit)
+
+    self.block = body
+    node.getSList().accept(self)
+    if not self.block.isTerminated():
+      self.block.append(Jump(header))
+    # every edge into the header is known now
+    self.sealBlock(header)
+    self.block = exit
+
+  def buildPromotedLoop(self, node: WhileNode, promoted, stored):
+    # guard test, loads, body and bottom test, with the stores on the way out
+    op, left, right = node.getCondExpr().accept(self)
+    preheader = self.function.newBlock()
+    exit = self.function.newBlock()
+    self.block.append(Branch(op, left, right, preheader, exit))
+    self.sealBlock(preheader)
+
+    self.block = preheader
+    self.promoted, self.promotedStores = promoted, stored
+    for sym in promoted:
+      self.writeVariable(sym, preheader, preheader.append(LoadGlobal(sym)))
+    body = self.function.newBlock()
+    preheader.append(Jump(body))
+
+    self.block = body
+    node.getSList().accept(self)
+    leave = self.function.newBlock()
+    if not self.block.isTerminated():
+      op, left, right = node.getCondExpr().accept(self)
+      self.block.append(Branch(op, left, right, body, leave))
+    self.sealBlock(body)
+    self.sealBlock(leave)
+
+    self.block = leave
+    self.storePromoted()
+    self.block.append(Jump(exit))
+    self.promoted, self.promotedStores = [], []
+    self.sealBlock(exit)
+    self.block = exit
@@ -0,0 +1,107 @@
+from typing import Dict, List
+
+from ..compiler import *
+from .Constant import Constant
+from .IRBlock import IRBlock
+from .instructions import *
+
+class IRFunction:
+  # One function in SSA form. blocks[0] is the entry. Blocks carry index, successors and
+  # predecessors, so the dataflow problems in ..analysis run on an IRFunction as on a ControlFlowGraph.
+  def __init__(self, name: str, scope: LocalScope):
+    self.name = name
+    self.scope = scope
+    self.blocks: List[IRBlock] = []
+    self.numBlocks = 0
+
+  def newBlock(self) -> IRBlock:
+    block = IRBlock("B" + str(self.numBlocks))
+    self.numBlocks += 1
+    self.blocks.append(block)
+    return block
+
+  def getEntry(self) -> IRBlock:
+    return self.blocks[0]
+
+  def computeEdges(self):
+    for i, block in enumerate(self.blocks):
+      block.index = i
+      block.predecessors = []
+      block.successors = []
+    for block in self.blocks:
+      term = block.getTerminator()
+      if term is not None:
+        for target in term.getTargets():
+          block.link(target)
+
+  def postorder(self) -> List[IRBlock]:
+    # blocks reachable from the entry
+    order = []
+    visited = {self.getEntry()}
+    stack = [(self.getEntry(), iter(self.getEntry().successors))]
+    while len(stack) > 0:
+      block, succs = stack[-1]
+      advanced = False
+      for s in succs:
+        if s not in visited:
+          visited.add(s)
+          stack.append((s, iter(s.successors)))
+          advanced = True
+          break
+      if not advanced:
+        stack.pop()
+        order.append(block)
+    return order
+
+  def reversePostorder(self) -> List[IRBlock]:
+    return list(reversed(self.postorder()))
+
+  def removeUnreachable(self):
+    self.computeEdges()
+    reachable = set(self.postorder())
+    dead = [b for b in self.blocks if b not in reachable]
+    if len(dead) == 0:
+      return
+    for block in self.blocks:
+      for phi in block.phis:
+        for d in dead:
+          phi.removeIncoming(d)
+    for block in dead:
+      for inst in block.phis + block.instructions:
+        inst.dropOperands()
+    self.blocks = [b for b in self.blocks if b in reachable]
+    self.computeEdges()
+    self.simplifyPhis()
+
+  def simplifyPhis(self):
+    # a phi whose operands are all one value (or itself) is that value
+    changed = True
+    while changed:
+      changed = False
+      for block in self.blocks:
+        for phi in list(block.phis):
+          values = set(("const", op.value) if op.isConstant() else id(op) for op in phi.operands if op is not phi)
+          if len(values) > 1:
+            continue
+          others = [op for op in phi.operands if op is not phi]
+          same = others[0] if len(others) > 0 else Constant.zero(phi.type)
+          phi.replaceAllUsesWith(same)
+          block.remove(phi)
+          changed = True
+
+  def __str__(self):
+    names: Dict[int, str] = {}
+    def name(v) -> str:
+      if v.isConstant():
+        return str(v)
+      if id(v) not in names:
+        names[id(v)] = "%" + str(len(names))
+      return names[id(v)]
+
+    lines = ["function " + self.name]
+    for block in self.blocks:
+      lines.append(block.name + ":  ; preds " + ", ".join(p.name for p in block.predecessors))
+      for inst in block.phis + block.instructions:
+        prefix = name(inst) + " = " if inst.type is not None and inst.type != Scope.Type.VOID else ""
+        lines.append("  " + prefix + inst.opString(name))
+    return "\n".join(lines)
@@ -0,0 +1,257 @@
+from typing import Dict, List, Tuple
+
+from ..assembly.CodeObject import CodeObject
+from ..ast import BinaryOpNode
+from ..assembly.InstructionList import InstructionList
+from ..assembly import instructions as asm
+from ..compiler import *
+from .Constant import Constant
+from .IRBlock import IRBlock
+from .IRFunction import IRFunction
+from .Value import Value
+from .instructions import *
+
+class IRLowering:
+  # Turns an IRFunction back into a function body of assembly instructions for the code generator.
+  # Every SSA value gets a temp of its own; phis become copies at the end of each predecessor
+  # (critical edges are split first so the copies only run on their edge). Loads, stores, calls,
+  # returns and conditions are emitted by the CodeGenerator, so both paths produce the same sequences.
+
+  MAX_IMMEDIATE = 2047
+
+  def __init__(self, cg):
+    self.cg = cg
+    self.temps: Dict[Value, str] = {}
+    self.labels: Dict[IRBlock, str] = {}
+
+  def run(self, function: IRFunction) -> InstructionList:
+    self.splitCriticalEdges(function)
+    order = self.layout(function)
+    for block in order[1:]:
+      self.labels[block] = self.cg._generateBlockLabel()
+
+    code = InstructionList()
+    for i, block in enumerate(order):
+      following = order[i + 1] if i + 1 < len(order) else None
+      if block in self.labels:
+        code.append(asm.Label(self.labels[block]))
+      for inst in block.instructions:
+        if inst.isTerminator():
+          code.extend(self.phiCopies(block))
+          code.extend(self.lowerTerminator(inst, following))
+        else:
+          code.extend(self.lower(inst))
+
+    # labels nothing jumps to would only split the blocks of later passes
+    targets = set(getattr(inst, 'label', None) for inst in code if isinstance(inst, (asm.J, asm.InstructionBranch)))
+    lowered = InstructionList()
+    for inst in code:
+      if not (isinstance(inst, asm.Label) and inst.label not in targets):
+        lowered.append(inst)
+    return lowered
+
+  #### layout and edges ####
+
+  def splitCriticalEdges(self, function: IRFunction):
+    function.computeEdges()
+    for block in list(function.blocks):
+      term = block.getTerminator()
+      if not isinstance(term, Branch):
+        continue
+      for succ in list(block.successors):
+        if len(succ.phis) == 0 or len(succ.predecessors) < 2:
+          continue
+        middle = function.newBlock()
+        middle.append(Jump(succ))
+        if term.ifTrue is succ:
+          term.ifTrue = middle
+        if term.ifFalse is succ:
+          term.ifFalse = middle
+        for phi in succ.phis:
+          phi.incoming = [middle if b is block else b for b in phi.incoming]
+    function.computeEdges()
+
+  def layout(self, function: IRFunction) -> List[IRBlock]:
+    # reverse postorder, exploring the false side of a branch first so that the true side
+    # (a then-block or a loop body) is placed right after its branch
+    order = []
+    visited = {function.getEntry()}
+    stack = [(function.getEntry(), iter(reversed(function.getEntry().successors)))]
+    while len(stack) > 0:
+      block, succs = stack[-1]
+      advanced = False
+      for s in succs:
+        if s not in visited:
+          visited.add(s)
+          stack.append((s, iter(reversed(s.successors))))
+          advanced = True
+          break
+      if not advanced:
+        stack.pop()
+        order.append(block)
+    return list(reversed(order))
+
+  #### values ####
+
+  def temp(self, value: Value) -> str:
+    if value not in self.temps:
+      self.temps[value] = self.cg.generateTemp(value.type)
+    return self.temps[value]
+
+  def operand(self, value: Value, code: InstructionList) -> str:
+    if value.isConstant():
+      temp = self.cg.generateTemp(value.type)
+      code.append(self.materialize(value, temp))
+      return temp
+    return self.temp(value)
+
+  @staticmethod
+  def materialize(value: Constant, temp: str):
+    if value.type == Scope.Type.FLOAT:
+      return asm.FImm(temp, value.toString())
+    return asm.Li(temp, value.toString())
+
+  def rvalue(self, value: Value, code: InstructionList) -> CodeObject:
+    co = CodeObject()
+    co.temp = self.operand(value, code)
+    co.type = value.type
+    co.lval = False
+    return co
+
+  @staticmethod
+  def lvalue(symbol) -> CodeObject:
+    co = CodeObject(symbol)
+    co.lval = True
+    return co
+
+  @staticmethod
+  def immediateAdd(inst: BinaryOp) -> Tuple[Value, int]:
+    # an int add or subtract of a constant that fits ADDI's immediate
+    if inst.type != Scope.Type.INT:
+      return None
+    left, right = inst.operands
+    if inst.op == BinaryOpNode.OpType.ADD and left.isConstant() != right.isConstant():
+      other, value = (right, left.value) if left.isConstant() else (left, right.value)
+    elif inst.op == BinaryOpNode.OpType.SUB and right.isConstant() and not left.isConstant():
+      other, value = left, -right.value
+    else:
+      return None
+    return (other, value) if abs(value) <= IRLowering.MAX_IMMEDIATE else None
+
+  @staticmethod
+  def move(src: str, dest: str, type):
+    return asm.FMv(src, dest) if type == Scope.Type.FLOAT else asm.Mv(src, dest)
+
+  #### instructions ####
+
+  def lower(self, inst: IRInstruction) -> InstructionList:
+    code = InstructionList()
+    cg = self.cg
+
+    if isinstance(inst, Param):
+      sym = inst.symbol
+      if sym.getRegister() is not None:
+        code.append(self.move(sym.getRegister(), self.temp(inst), inst.type))
+      elif inst.type == Scope.Type.FLOAT:
+        code.append(asm.Flw(self.temp(inst), "fp", sym.addressToString()))
+      else:
+        code.append(asm.Lw(self.temp(inst), "fp", sym.addressToString()))
+    elif isinstance(inst, BinaryOp) and self.immediateAdd(inst) is not None:
+      other, value = self.immediateAdd(inst)
+      code.append(asm.Addi(self.operand(other, code), str(value), self.temp(inst)))
+    elif isinstance(inst, BinaryOp):
+      left = self.operand(inst.operands[0], code)
+      right = self.operand(inst.operands[1], code)
+      opCode, temp = cg._generateBinaryOp(inst.op, inst.type, left, right)
+      code.extend(opCode)
+      self.temps[inst] = temp
+    elif isinstance(inst, Neg):
+      src = self.operand(inst.operands[0], code)
+      if inst.type == Scope.Type.FLOAT:
+        code.append(asm.FNeg(src=src, dest=self.temp(inst)))
+      else:
+        code.append(asm.Neg(src=src, dest=self.temp(inst)))
+    elif isinstance(inst, LoadGlobal):
+      co = cg.rvalify(self.lvalue(inst.symbol))
+      code.extend(co.code)
+      self.temps[inst] = co.temp
+    elif isinstance(inst, StoreGlobal):
+      right = self.rvalue(inst.operands[0], code)
+      code.extend(cg.postprocessAssignNode(None, self.lvalue(inst.symbol), right).code)
+    elif isinstance(inst, Read):
+      if inst.type == Scope.Type.FLOAT:
+        code.append(asm.GetF(self.temp(inst)))
+      else:
+        code.append(asm.GetI(self.temp(inst)))
+    elif isinstance(inst, Write):
+      code.extend(cg.postprocessWriteNode(None, self.rvalue(inst.operands[0], code)).code)
+    elif isinstance(inst, WriteString):
+      code.extend(cg.postprocessWriteNode(None, self.lvalue(inst.symbol)).code)
+    elif isinstance(inst, Call):
+      args = [self.rvalue(a, code) for a in inst.operands]
+      co = cg.postprocessCallNode(inst.node, args)
+      code.extend(co.code)
+      if co.temp is not None:
+        self.temps[inst] = co.temp
+    else:
+      raise Exception("Cannot lower IR instruction: " + type(inst).__name__)
+    return code
+
+  def lowerTerminator(self, inst: IRInstruction, following: IRBlock) -> InstructionList:
+    code = InstructionList()
+    cg = self.cg
+
+    if isinstance(inst, Return):
+      if inst.getValue() is not None:
+        code.extend(cg.postprocessReturnNode(None, self.rvalue(inst.getValue(), code)).code)
+      elif following is not None:
+        code.append(asm.J(cg._generateFunctionRetLabel()))
+    elif isinstance(inst, Jump):
+      if inst.target is not following:
+        code.append(asm.J(self.labels[inst.target]))
+    elif isinstance(inst, Branch):
+      left = self.operand(inst.operands[0], code)
+      right = self.operand(inst.operands[1], code)
+      type = inst.operands[0].type
+      if inst.ifTrue is following:
+        # fall into the true side, branch away when the condition fails
+        cond = cg._generateCondition(inst.op, type, left, right)
+        code.extend(cond.code)
+        code.extend(cg._makeBranch(cond, self.labels[inst.ifFalse]))
+      else:
+        cond = cg._generateCondition(cg._reverseOpString(inst.op), type, left, right)
+        code.extend(cond.code)
+        code.extend(cg._makeBranch(cond, self.labels[inst.ifTrue]))
+        if inst.ifFalse is not following:
+          code.append(asm.J(self.labels[inst.ifFalse]))
+    return code
+
+  def phiCopies(self, block: IRBlock) -> InstructionList:
+    # the copies into the phis of the successor, done as one parallel assignment
+    code = InstructionList()
+    moves: List[Tuple[str, str, object]] = []
+    constants = []
+    for succ in block.successors:
+      for phi in succ.phis:
+        value = phi.getIncoming(block)
+        if value.isConstant():
+          constants.append((self.temp(phi), value))
+        elif self.temp(value) != self.temp(phi):
+          moves.append((self.temp(phi), self.temp(value), phi.type))
+
+    while len(moves) > 0:
+      ready = [m for m in moves if not any(src == m[0] for _, src, _ in moves)]
+      if len(ready) > 0:
+        dest, src, type = ready[0]
+        code.append(self.move(src, dest, type))
+        moves.remove(ready[0])
+      else:
+        # a cycle: park one destination's old value in a fresh temp
+        dest, _, type = moves[0]
+        parked = self.cg.generateTemp(type)
+        code.append(self.move(dest, parked, type))
+        moves = [(d, parked if s == dest else s, t) for d, s, t in moves]
+
+    for dest, value in constants:
+      code.append(self.materialize(value, dest))
+    return code
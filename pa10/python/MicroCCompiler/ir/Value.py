@@ -0,0 +1,20 @@
+from typing import List
+
+class Value:
+  # Anything an IR instruction can use as an operand. users lists the instructions that read this value,
+  # once per operand slot, so that a value can be replaced everywhere it is used.
+  def __init__(self, type):
+    self.type = type
+    self.users: List['Value'] = []
+
+  def getType(self):
+    return self.type
+
+  def replaceAllUsesWith(self, other: 'Value'):
+    for user in list(self.users):
+      for i, op in enumerate(user.operands):
+        if op is self:
+          user.setOperand(i, other)
+
+  def isConstant(self) -> bool:
+    return False
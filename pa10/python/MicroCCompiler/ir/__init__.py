@@ -0,0 +1,7 @@
+from .Value import Value
+from .Constant import Constant
+from .instructions import *
+from .IRBlock import IRBlock
+from .IRFunction import IRFunction
+from .IRBuilder import IRBuilder
+from .IRLowering import IRLowering
@@ -0,0 +1,10 @@
+from .IRInstruction import IRInstruction
+
+class BinaryOp(IRInstruction):
+  # op is a BinaryOpNode.OpType; int and float arithmetic share the class and differ by type.
+  def __init__(self, op, type, left, right):
+    super().__init__(type, (left, right))
+    self.op = op
+
+  def opString(self, names) -> str:
+    return self.op.name + " " + super().opString(names)
@@ -0,0 +1,18 @@
+from .IRInstruction import IRInstruction
+
+class Branch(IRInstruction):
+  # Goes to ifTrue when `left op right` holds and to ifFalse otherwise. op is the CondNode operator string.
+  def __init__(self, op: str, left, right, ifTrue, ifFalse):
+    super().__init__(None, (left, right))
+    self.op = op
+    self.ifTrue = ifTrue
+    self.ifFalse = ifFalse
+
+  def isTerminator(self) -> bool:
+    return True
+
+  def getTargets(self):
+    return [self.ifTrue, self.ifFalse]
+
+  def opString(self, names) -> str:
+    return "BRANCH " + names(self.operands[0]) + " " + self.op + " " + names(self.operands[1]) + ", " + self.ifTrue.name + ", " + self.ifFalse.name
@@ -0,0 +1,16 @@
+from .IRInstruction import IRInstruction
+
+class Call(IRInstruction):
+  # node is the CallNode the call came from; the code generator emits the calling sequence from it.
+  def __init__(self, node, args):
+    super().__init__(node.ste.getReturnType(), args)
+    self.node = node
+
+  def getFuncName(self) -> str:
+    return self.node.getFuncName()
+
+  def hasSideEffects(self) -> bool:
+    return True
+
+  def opString(self, names) -> str:
+    return "CALL " + self.getFuncName() + "(" + super().opString(names) + ")"
@@ -0,0 +1,40 @@
+from typing import List
+
+from ..Value import Value
+
+class IRInstruction(Value):
+  # Base class of the three-address instructions. An instruction is also the SSA value it defines;
+  # instructions that define nothing have type None.
+  def __init__(self, type, operands=()):
+    super().__init__(type)
+    self.block = None
+    self.operands: List[Value] = []
+    for op in operands:
+      self.addOperand(op)
+
+  def addOperand(self, value: Value):
+    self.operands.append(value)
+    value.users.append(self)
+
+  def setOperand(self, i: int, value: Value):
+    self.operands[i].users.remove(self)
+    self.operands[i] = value
+    value.users.append(self)
+
+  def dropOperands(self):
+    for op in self.operands:
+      op.users.remove(self)
+    self.operands = []
+
+  def hasSideEffects(self) -> bool:
+    # instructions that must stay even when nothing uses their value
+    return False
+
+  def isTerminator(self) -> bool:
+    return False
+
+  def getTargets(self) -> List:
+    return []
+
+  def opString(self, names) -> str:
+    return ", ".join(names(op) for op in self.operands)
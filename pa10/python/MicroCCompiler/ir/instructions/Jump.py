@@ -0,0 +1,15 @@
+from .IRInstruction import IRInstruction
+
+class Jump(IRInstruction):
+  def __init__(self, target):
+    super().__init__(None)
+    self.target = target
+
+  def isTerminator(self) -> bool:
+    return True
+
+  def getTargets(self):
+    return [self.target]
+
+  def opString(self, names) -> str:
+    return "JUMP " + self.target.name
@@ -0,0 +1,10 @@
+from .IRInstruction import IRInstruction
+
+class LoadGlobal(IRInstruction):
+  # Globals stay in memory: any call may read or write them.
+  def __init__(self, symbol):
+    super().__init__(symbol.getType())
+    self.symbol = symbol
+
+  def opString(self, names) -> str:
+    return "LOAD " + self.symbol.getName()
@@ -0,0 +1,8 @@
+from .IRInstruction import IRInstruction
+
+class Neg(IRInstruction):
+  def __init__(self, type, value):
+    super().__init__(type, (value,))
+
+  def opString(self, names) -> str:
+    return "NEG " + super().opString(names)
@@ -0,0 +1,10 @@
+from .IRInstruction import IRInstruction
+
+class Param(IRInstruction):
+  # The incoming value of a parameter, from its argument register or its stack slot.
+  def __init__(self, symbol):
+    super().__init__(symbol.getType())
+    self.symbol = symbol
+
+  def opString(self, names) -> str:
+    return "PARAM " + self.symbol.getName()
@@ -0,0 +1,31 @@
+from typing import List
+
+from .IRInstruction import IRInstruction
+
+class Phi(IRInstruction):
+  # Merges a variable at a join: operand i is the value flowing in from incoming[i].
+  def __init__(self, type, var=None):
+    super().__init__(type)
+    self.var = var
+    self.incoming: List = []
+
+  def addIncoming(self, value, block):
+    self.addOperand(value)
+    self.incoming.append(block)
+
+  def getIncoming(self, block):
+    return self.operands[self.incoming.index(block)]
+
+  def removeIncoming(self, block):
+    while block in self.incoming:
+      i = self.incoming.index(block)
+      self.operands[i].users.remove(self)
+      del self.operands[i]
+      del self.incoming[i]
+
+  def dropOperands(self):
+    super().dropOperands()
+    self.incoming = []
+
+  def opString(self, names) -> str:
+    return "PHI " + ", ".join("[" + names(op) + ", " + b.name + "]" for op, b in zip(self.operands, self.incoming))
@@ -0,0 +1,11 @@
+from .IRInstruction import IRInstruction
+
+class Read(IRInstruction):
+  def __init__(self, type):
+    super().__init__(type)
+
+  def hasSideEffects(self) -> bool:
+    return True
+
+  def opString(self, names) -> str:
+    return "READ"
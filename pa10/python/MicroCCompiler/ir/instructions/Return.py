@@ -0,0 +1,18 @@
+from .IRInstruction import IRInstruction
+
+class Return(IRInstruction):
+  # value is None when control falls off the end of the function body
+  def __init__(self, value=None):
+    super().__init__(None, () if value is None else (value,))
+
+  def getValue(self):
+    return self.operands[0] if len(self.operands) > 0 else None
+
+  def isTerminator(self) -> bool:
+    return True
+
+  def hasSideEffects(self) -> bool:
+    return True
+
+  def opString(self, names) -> str:
+    return "RETURN " + super().opString(names)
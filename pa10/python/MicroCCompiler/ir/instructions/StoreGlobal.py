@@ -0,0 +1,12 @@
+from .IRInstruction import IRInstruction
+
+class StoreGlobal(IRInstruction):
+  def __init__(self, symbol, value):
+    super().__init__(None, (value,))
+    self.symbol = symbol
+
+  def hasSideEffects(self) -> bool:
+    return True
+
+  def opString(self, names) -> str:
+    return "STORE " + self.symbol.getName() + ", " + super().opString(names)
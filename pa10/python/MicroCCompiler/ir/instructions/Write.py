@@ -0,0 +1,11 @@
+from .IRInstruction import IRInstruction
+
+class Write(IRInstruction):
+  def __init__(self, value):
+    super().__init__(None, (value,))
+
+  def hasSideEffects(self) -> bool:
+    return True
+
+  def opString(self, names) -> str:
+    return "WRITE " + super().opString(names)
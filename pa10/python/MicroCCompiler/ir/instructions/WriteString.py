@@ -0,0 +1,12 @@
+from .IRInstruction import IRInstruction
+
+class WriteString(IRInstruction):
+  def __init__(self, symbol):
+    super().__init__(None)
+    self.symbol = symbol
+
+  def hasSideEffects(self) -> bool:
+    return True
+
+  def opString(self, names) -> str:
+    return "WRITE " + self.symbol.getName()
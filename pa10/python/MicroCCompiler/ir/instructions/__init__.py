@@ -0,0 +1,14 @@
+from .IRInstruction import IRInstruction
+from .BinaryOp import BinaryOp
+from .Branch import Branch
+from .Call import Call
+from .Jump import Jump
+from .LoadGlobal import LoadGlobal
+from .Neg import Neg
+from .Param import Param
+from .Phi import Phi
+from .Read import Read
+from .Return import Return
+from .StoreGlobal import StoreGlobal
+from .Write import Write
+from .WriteString import WriteString
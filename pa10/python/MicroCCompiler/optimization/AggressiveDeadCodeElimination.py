@@ -0,0 +1,106 @@
+from typing import Dict, List, Set
+
+from ..analysis import Dominators
+from ..ir import *
+
+class AggressiveDeadCodeElimination:
+  # Aggressive dead code elimination over an IRFunction (Cytron et al.): everything is assumed
+  # dead until it is shown to matter. Instructions with side effects are live; so are the
+  # operands of live instructions and the branches that live code is control dependent on.
+  # A live phi needs the terminators of its incoming blocks. Dead branches become jumps to the
+  # nearest postdominator holding live code, which removes loops and conditionals that compute nothing.
+
+  def __init__(self):
+    self.live: Set[IRInstruction] = set()
+    self.work: List[IRInstruction] = []
+
+  def run(self, function: IRFunction) -> IRFunction:
+    function.computeEdges()
+    self.postdominators = Dominators(function, post=True)
+    controlDeps = self.controlDependences(function)
+
+    for block in function.blocks:
+      for inst in block.phis + block.instructions:
+        if inst.hasSideEffects():
+          self.mark(inst)
+    if controlDeps is None:
+      # some block cannot reach a return, so postdominance says nothing there: keep every branch
+      for block in function.blocks:
+        self.mark(block.getTerminator())
+      controlDeps = {b: [] for b in function.blocks}
+
+    retargets: Dict[IRBlock, IRBlock] = {}
+    while True:
+      while len(self.work) > 0:
+        inst = self.work.pop()
+        for op in inst.operands:
+          if isinstance(op, IRInstruction):
+            self.mark(op)
+        if isinstance(inst, Phi):
+          for pred in inst.incoming:
+            self.mark(pred.getTerminator())
+        for b in controlDeps[inst.block]:
+          self.mark(b.getTerminator())
+
+      # a dead branch can only be bypassed if its new target has no live phis needing an operand from it
+      retargets = {}
+      for block in function.blocks:
+        term = block.getTerminator()
+        if not isinstance(term, Branch) or term in self.live:
+          continue
+        target = self.nearestUsefulPostdominator(block)
+        if target is None or any(phi in self.live for phi in target.phis):
+          self.mark(term)
+        else:
+          retargets[block] = target
+      if len(self.work) == 0:
+        break
+
+    for block in function.blocks:
+      for inst in list(block.phis + block.instructions):
+        if inst not in self.live and not inst.isTerminator():
+          block.remove(inst)
+    for block, target in retargets.items():
+      block.replaceTerminator(Jump(target))
+
+    function.removeUnreachable()
+    return function
+
+  def mark(self, inst: IRInstruction):
+    if inst not in self.live:
+      self.live.add(inst)
+      self.work.append(inst)
+
+  def isUseful(self, block: IRBlock) -> bool:
+    return any(inst in self.live for inst in block.phis + block.instructions)
+
+  def nearestUsefulPostdominator(self, block: IRBlock) -> IRBlock:
+    d = self.postdominators.immediateDominator(block)
+    while d is not None and not self.isUseful(d):
+      d = self.postdominators.immediateDominator(d)
+    return d
+
+  def controlDependences(self, function: IRFunction) -> Dict[IRBlock, List[IRBlock]]:
+    # block -> the blocks whose branch decides whether it runs; None if some block never reaches an exit
+    reaches = set(b for b in function.blocks if len(b.successors) == 0)
+    stack = list(reaches)
+    while len(stack) > 0:
+      for p in stack.pop().predecessors:
+        if p not in reaches:
+          reaches.add(p)
+          stack.append(p)
+    if len(reaches) != len(function.blocks):
+      return None
+
+    deps: Dict[IRBlock, List[IRBlock]] = {b: [] for b in function.blocks}
+    for block in function.blocks:
+      if len(block.successors) < 2:
+        continue
+      stop = self.postdominators.immediateDominator(block)
+      for s in block.successors:
+        runner = s
+        while runner is not None and runner is not stop:
+          if block not in deps[runner]:
+            deps[runner].append(block)
+          runner = self.postdominators.immediateDominator(runner)
+    return deps
@@ -0,0 +1,53 @@
+import math
+from typing import Union
+
+from ..ast import *
+from ..compiler import *
+
+class Arithmetic:
+  # Compile-time evaluation with the simulator's semantics: ints are unbounded Python ints,
+  # DIV floors, floats are Python floats. None means "leave it to run time": division by zero,
+  # and float results that could not be written back as an FIMM.S immediate.
+
+  @staticmethod
+  def binary(op: BinaryOpNode.OpType, type: Scope.Type, a, b) -> Union[int, float, None]:
+    if op == BinaryOpNode.OpType.DIV and b == 0:
+      return None
+    if op == BinaryOpNode.OpType.ADD:
+      result = a + b
+    elif op == BinaryOpNode.OpType.SUB:
+      result = a - b
+    elif op == BinaryOpNode.OpType.MUL:
+      result = a * b
+    elif type == Scope.Type.INT:
+      result = a // b
+    else:
+      result = a / b
+    return Arithmetic.checked(result, type)
+
+  @staticmethod
+  def negate(type: Scope.Type, a) -> Union[int, float, None]:
+    return Arithmetic.checked(-1 * a, type)
+
+  @staticmethod
+  def compare(op: str, a, b) -> bool:
+    if op == '<':
+      return a < b
+    if op == '<=':
+      return a <= b
+    if op == '>':
+      return a > b
+    if op == '>=':
+      return a >= b
+    if op == '==':
+      return a == b
+    if op == '!=':
+      return a != b
+    raise Exception("Unknown comparison: " + str(op))
+
+  @staticmethod
+  def checked(result, type: Scope.Type):
+    if type == Scope.Type.FLOAT:
+      result = float(result)
+      return result if math.isfinite(result) else None
+    return int(result)
@@ -0,0 +1,43 @@
+from typing import Callable
+
+from ..analysis import ControlFlowGraph, LiveSlots, LiveVariables
+from ..assembly.InstructionList import InstructionList
+from ..assembly.instructions import *
+
+class DeadStoreElimination:
+  # Removes, before register allocation, the work whose result is never used:
+  #
+  #   - a store to a frame slot through fp that is not live after it (see LiveSlots): the slot is
+  #     written again, or the function returns, before anything reads it
+  #   - a side-effect-free instruction, loads included, whose destinations are all temps that are
+  #     not live after it
+  #
+  # Stores through any other base, to globals, are always kept, as other functions may read them.
+  # Removing one instruction can make the ones feeding it dead, so both repeat until nothing changes.
+
+  PURE = (Instruction3O, Li, La, FImm, Mv, FMv, Neg, FNeg, Lw, Flw)
+
+  def __init__(self, isTemp: Callable[[str], bool]):
+    self.isTemp = isTemp
+    self.numRemoved = 0
+
+  def run(self, code: InstructionList) -> InstructionList:
+    while True:
+      cfg = ControlFlowGraph(code)
+      liveSlots = LiveSlots(cfg).instructionLiveOut()
+      liveTemps = LiveVariables(cfg, self.isTemp).instructionLiveOut()
+      kept = InstructionList()
+      for i, inst in enumerate(code):
+        if isinstance(inst, (Sw, Fsw)) and LiveSlots.slot(inst) is not None:
+          dead = LiveSlots.slot(inst) not in liveSlots[i]
+        elif isinstance(inst, DeadStoreElimination.PURE):
+          dests = inst.getDests()
+          dead = len(dests) > 0 and all(self.isTemp(d) and d not in liveTemps[i] for d in dests)
+        else:
+          dead = False
+        if not dead:
+          kept.append(inst)
+      if len(kept) == len(code):
+        return code
+      self.numRemoved += len(code) - len(kept)
+      code = kept
@@ -0,0 +1,98 @@
+from typing import Dict, Tuple
+
+from ..analysis import Loop, NaturalLoops
+from ..ast import *
+from ..compiler import *
+from ..ir import *
+
+class InductionVariables:
+  # Strength reduction of induction variables over an IRFunction.
+  #
+  # A basic induction variable is an int phi in a loop header whose value around every back edge
+  # is the phi plus or minus a constant c. A product i * k in the loop, with k a constant or a value
+  # from outside the loop, then becomes a phi of its own: it starts at init * k in the preheader and
+  # grows by c * k next to the increment of i, so each trip pays an ADD instead of a MUL.
+  # Ints do not overflow in the simulator, so the new phi equals the product exactly.
+  # The old MUL goes away; ADCE can then remove i if nothing else reads it.
+
+  def run(self, function: IRFunction) -> IRFunction:
+    function.computeEdges()
+    for loop in NaturalLoops(function):
+      self.reduce(loop)
+    return function
+
+  def reduce(self, loop: Loop):
+    outside = loop.outsidePredecessors()
+    if len(outside) != 1:
+      return
+    preheader = outside[0]
+
+    for phi in list(loop.header.phis):
+      step = self.basicStep(phi, loop)
+      if step is None:
+        continue
+      increment, c = step
+      reduced: Dict[object, Phi] = {}
+      for user in list(phi.users):
+        if not (isinstance(user, BinaryOp) and user.op == BinaryOpNode.OpType.MUL and user.type == Scope.Type.INT):
+          continue
+        if user.block not in loop.blocks or user.operands[0] is user.operands[1]:
+          continue
+        factor = user.operands[1] if user.operands[0] is phi else user.operands[0]
+        if not self.isInvariant(factor, loop) or (factor.isConstant() and factor.value in (0, 1)):
+          continue
+        key = ("const", factor.value) if factor.isConstant() else id(factor)
+        if key not in reduced:
+          reduced[key] = self.newVariable(phi, increment, c, factor, preheader)
+        user.replaceAllUsesWith(reduced[key])
+        user.block.remove(user)
+
+  def basicStep(self, phi: Phi, loop: Loop) -> Tuple[BinaryOp, int]:
+    # the increment instruction shared by every back edge, and its constant step
+    if phi.type != Scope.Type.INT:
+      return None
+    increments = set(op for op, b in zip(phi.operands, phi.incoming) if b in loop.blocks)
+    if len(increments) != 1:
+      return None
+    inc = increments.pop()
+    if not isinstance(inc, BinaryOp) or inc.block not in loop.blocks:
+      return None
+    l, r = inc.operands
+    if inc.op == BinaryOpNode.OpType.ADD:
+      if l is phi and r.isConstant():
+        return inc, r.value
+      if r is phi and l.isConstant():
+        return inc, l.value
+    if inc.op == BinaryOpNode.OpType.SUB and l is phi and r.isConstant():
+      return inc, -r.value
+    return None
+
+  @staticmethod
+  def isInvariant(value: Value, loop: Loop) -> bool:
+    return value.isConstant() or value.block not in loop.blocks
+
+  def newVariable(self, phi: Phi, increment: BinaryOp, c: int, factor: Value, preheader: IRBlock) -> Phi:
+    start = self.multiply(phi.getIncoming(preheader), factor, preheader)
+    stride = self.multiply(Constant(c, Scope.Type.INT), factor, preheader)
+
+    reduced = phi.block.addPhi(Phi(Scope.Type.INT))
+    step = BinaryOp(BinaryOpNode.OpType.ADD, Scope.Type.INT, reduced, stride)
+    block = increment.block
+    step.block = block
+    block.instructions.insert(block.instructions.index(increment) + 1, step)
+
+    for b in phi.incoming:
+      reduced.addIncoming(start if b is preheader else step, b)
+    return reduced
+
+  def multiply(self, a: Value, b: Value, block: IRBlock) -> Value:
+    if a.isConstant() and b.isConstant():
+      return Constant(a.value * b.value, Scope.Type.INT)
+    for x, y in ((a, b), (b, a)):
+      if x.isConstant() and x.value == 0:
+        return x
+      if x.isConstant() and x.value == 1:
+        return y
+    product = BinaryOp(BinaryOpNode.OpType.MUL, Scope.Type.INT, a, b)
+    block.insertBeforeTerminator(product)
+    return product
@@ -0,0 +1,123 @@
+from typing import Dict, List
+
+from ..analysis import ControlFlowGraph
+from ..assembly.InstructionList import InstructionList
+from ..assembly.instructions import *
+
+class ListScheduler:
+  # Reorders the instructions of each basic block, after register allocation, so that a value is not
+  # read right after the instruction producing it when other work can run in between. This pays off on
+  # a pipelined machine, where only an instruction that needs a result still being computed has to wait.
+  #
+  # The block's dependence DAG has an edge for each register read after write, weighted with the producer's
+  # latency, each write after read or write, and each pair of memory accesses that may touch the same word
+  # when one of them is a store: through different base registers, or through the same base register at
+  # the same offset. Globals addressed from gp never overlap the frame addressed from fp or sp. Input and
+  # output keep their order. Leading labels stay first and the instruction that ends the block stays last.
+  #
+  # Among the instructions whose predecessors are placed, the one that can start first is placed next,
+  # and among those the one with the longest latency-weighted path to the end of the block.
+  # Running after allocation means reuse of physical registers limits the reordering, but the
+  # scheduler can never make the allocator spill.
+
+  # cycles until the result can be used, as charged by RiscSim's basicTimingModel; everything else takes 1
+  LATENCY = {Lw: 2, Flw: 2, FImm: 2, Sub: 2, Mul: 3, Div: 4, Feq: 3, Flt: 3, Fle: 3, FAdd: 4, FSub: 4, FMul: 5, FDiv: 6}
+
+  IO = (GetI, GetF, PutI, PutF, PutS)
+
+  def run(self, code: InstructionList) -> InstructionList:
+    out = InstructionList()
+    for block in ControlFlowGraph(code).blocks:
+      out.extend(self.scheduleBlock(block.instructions))
+    return out
+
+  def scheduleBlock(self, instructions: List[Instruction]) -> List[Instruction]:
+    head = 0
+    while head < len(instructions) and isinstance(instructions[head], (Label, Blank)):
+      head += 1
+    tail = len(instructions)
+    if tail > head and ControlFlowGraph.endsBlock(instructions[-1]):
+      tail -= 1
+    return instructions[:head] + self.schedule(instructions[head:tail]) + instructions[tail:]
+
+  @staticmethod
+  def latency(inst) -> int:
+    return ListScheduler.LATENCY.get(type(inst), 1)
+
+  @staticmethod
+  def mayAlias(a: InstructionLS, b: InstructionLS) -> bool:
+    if a.src1 == b.src1:
+      return int(a.label) == int(b.label)
+    regions = set('gp' if base == 'gp' else 'frame' if base in ('fp', 'sp') else base for base in (a.src1, b.src1))
+    return regions != {'gp', 'frame'}
+
+  def dependences(self, body: List[Instruction]) -> List[Dict[int, int]]:
+    # successors of each instruction, with the number of cycles the successor has to start after it
+    succs: List[Dict[int, int]] = [{} for _ in body]
+
+    def edge(i: int, j: int, weight: int):
+      succs[i][j] = max(succs[i].get(j, 0), weight)
+
+    lastWrite: Dict[str, int] = {}
+    readers: Dict[str, List[int]] = {}
+    memory: List[int] = []
+    lastIO = None
+    for i, inst in enumerate(body):
+      for r in inst.getSources():
+        if r in lastWrite:
+          edge(lastWrite[r], i, self.latency(body[lastWrite[r]]))
+      for r in inst.getDests():
+        if r in lastWrite:
+          edge(lastWrite[r], i, 1)
+        for j in readers.get(r, ()):
+          if j != i:
+            edge(j, i, 0)
+
+      if isinstance(inst, InstructionLS):
+        for j in memory:
+          if (isinstance(inst, (Sw, Fsw)) or isinstance(body[j], (Sw, Fsw))) and self.mayAlias(body[j], inst):
+            edge(j, i, 1)
+        memory.append(i)
+      if isinstance(inst, ListScheduler.IO):
+        if lastIO is not None:
+          edge(lastIO, i, 1)
+        lastIO = i
+
+      for r in inst.getSources():
+        readers.setdefault(r, []).append(i)
+      for r in inst.getDests():
+        lastWrite[r] = i
+        readers[r] = []
+    return succs
+
+  def schedule(self, body: List[Instruction]) -> List[Instruction]:
+    if len(body) < 2:
+      return body
+    succs = self.dependences(body)
+
+    # longest latency-weighted path from each instruction to the end of the block
+    priority = [0] * len(body)
+    for i in reversed(range(len(body))):
+      priority[i] = max([self.latency(body[i])] + [w + priority[j] for j, w in succs[i].items()])
+
+    numPreds = [0] * len(body)
+    for i in range(len(body)):
+      for j in succs[i]:
+        numPreds[j] += 1
+
+    earliest = [0] * len(body)
+    candidates = [i for i in range(len(body)) if numPreds[i] == 0]
+    cycle = 0
+    order = []
+    while len(candidates) > 0:
+      best = max(candidates, key=lambda i: (-max(earliest[i], cycle), priority[i], -i))
+      candidates.remove(best)
+      start = max(earliest[best], cycle)
+      cycle = start + 1
+      order.append(body[best])
+      for j, w in succs[best].items():
+        earliest[j] = max(earliest[j], start + w)
+        numPreds[j] -= 1
+        if numPreds[j] == 0:
+          candidates.append(j)
+    return order
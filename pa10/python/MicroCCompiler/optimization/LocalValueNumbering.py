@@ -0,0 +1,125 @@
+from typing import Callable, Dict, Tuple
+
+from ..analysis import ControlFlowGraph
+from ..assembly.InstructionList import InstructionList
+from ..assembly.instructions import *
+from .Peephole import Peephole
+
+class LocalValueNumbering:
+  # Common subexpression elimination inside each basic block of a function body, before register allocation.
+  #
+  # Every register gets a value number; an arithmetic instruction, LI/LA/FIMM.S or load whose
+  # value is already held by some register is not computed again. When both registers are temps
+  # written exactly once, later uses are renamed to the earlier temp and the instruction goes away;
+  # otherwise it becomes a move, which the allocator usually coalesces.
+  #
+  # Memory: fp-relative slots are the function's own locals and arguments and are tracked per offset.
+  # Everything else (globals through an LA'd address, the stack below sp) is one class that any
+  # store through a non-fp base or any call clobbers. A store also makes the stored value known
+  # for the next load of the same slot.
+
+  COMMUTATIVE = (Add, Mul, FAdd, FMul, Feq)
+  PURE = (Instruction3O, Li, La, FImm, Neg, FNeg)
+
+  def __init__(self, isTemp: Callable[[str], bool]):
+    self.isTemp = isTemp
+
+  def run(self, code: InstructionList) -> InstructionList:
+    self.counts = Peephole.defCounts(code)
+    self.mapping: Dict[str, str] = {}
+    out = InstructionList()
+    for block in ControlFlowGraph(code).blocks:
+      self.numberBlock(block.instructions, out)
+
+    if len(self.mapping) > 0:
+      for inst in out:
+        inst.renameRegisters(self.mapping)
+    return out
+
+  def numberBlock(self, instructions, out: InstructionList):
+    self.numbers: Dict[str, int] = {}
+    self.nextNumber = 0
+    # expression key -> (value number, register holding it)
+    self.exprs: Dict[Tuple, Tuple[int, str]] = {}
+    # memory key -> (value number, register holding it)
+    self.memory: Dict[Tuple, Tuple[int, str]] = {}
+
+    for inst in instructions:
+      if isinstance(inst, (Mv, FMv)):
+        self.numbers[inst.dest] = self.number(inst.src1)
+        out.append(inst)
+      elif isinstance(inst, LocalValueNumbering.PURE):
+        self.reuse(inst, self.expressionKey(inst), self.exprs, out)
+      elif isinstance(inst, (Lw, Flw)):
+        self.reuse(inst, self.memoryKey(inst), self.memory, out)
+      elif isinstance(inst, (Sw, Fsw)):
+        self.store(inst)
+        out.append(inst)
+      else:
+        if isinstance(inst, Jr):
+          self.call()
+        for d in inst.getDests():
+          self.numbers[d] = self.fresh()
+        out.append(inst)
+
+  #### numbering ####
+
+  def fresh(self) -> int:
+    self.nextNumber += 1
+    return self.nextNumber
+
+  def number(self, reg: str) -> int:
+    if reg not in self.numbers:
+      self.numbers[reg] = self.fresh()
+    return self.numbers[reg]
+
+  def expressionKey(self, inst) -> Tuple:
+    if isinstance(inst, (Li, La, FImm)):
+      return (str(inst.oc), inst.label)
+    if isinstance(inst, (Addi, Slli, Srai)):
+      return (str(inst.oc), self.number(inst.src1), int(inst.src2))
+    operands = [self.number(r) for r in inst.getSources()]
+    if isinstance(inst, LocalValueNumbering.COMMUTATIVE):
+      operands.sort()
+    return (str(inst.oc),) + tuple(operands)
+
+  def memoryKey(self, inst) -> Tuple:
+    base = 'fp' if inst.src1 == 'fp' else self.number(inst.src1)
+    return (base, int(inst.label), isinstance(inst, (Flw, Fsw)))
+
+  def reuse(self, inst, key: Tuple, table: Dict[Tuple, Tuple[int, str]], out: InstructionList):
+    known = table.get(key)
+    dest = inst.dest
+    if known is not None and self.numbers.get(known[1]) == known[0] and known[1] != dest:
+      number, holder = known
+      if self.isTemp(dest) and self.isTemp(holder) and self.counts.get(dest) == 1 and self.counts.get(holder) == 1:
+        self.mapping[dest] = self.mapping.get(holder, holder)
+      elif isinstance(inst, (Flw, FImm, FAdd, FSub, FMul, FDiv, FNeg)):
+        out.append(FMv(holder, dest))
+      else:
+        out.append(Mv(holder, dest))
+      self.numbers[dest] = number
+      return
+
+    self.numbers[dest] = self.fresh()
+    # an instruction that overwrites one of its own operands cannot be reused
+    if dest not in inst.getSources():
+      table[key] = (self.numbers[dest], dest)
+    out.append(inst)
+
+  #### memory ####
+
+  def store(self, inst):
+    key = self.memoryKey(inst)
+    if key[0] == 'fp':
+      self.memory = {k: v for k, v in self.memory.items() if k[0] == 'fp' and k[1] != key[1]}
+    else:
+      self.memory = {k: v for k, v in self.memory.items() if k[0] == 'fp'}
+    self.memory[key] = (self.number(inst.dest), inst.dest)
+
+  def call(self):
+    # the callee may write any global and the stack below sp, and every register that is not a temp
+    self.memory = {k: v for k, v in self.memory.items() if k[0] == 'fp'}
+    for reg in list(self.numbers):
+      if not self.isTemp(reg):
+        self.numbers[reg] = self.fresh()
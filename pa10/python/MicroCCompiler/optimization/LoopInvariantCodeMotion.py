@@ -0,0 +1,128 @@
+from typing import Callable, Dict, List, Set
+
+from ..analysis import ControlFlowGraph, Dominators, LiveVariables, Loop, NaturalLoops
+from ..assembly.InstructionList import InstructionList
+from ..assembly.instructions import *
+
+class LoopInvariantCodeMotion:
+  # Moves computations whose value does not change while a loop runs to a preheader in front of it.
+  #
+  # An instruction is invariant when its operands are defined outside the loop or by invariant
+  # instructions, it is the loop's only write of its temp, and that temp is not live into the header.
+  # Arithmetic that cannot fault (everything but DIV) and address/immediate loads are hoisted
+  # wherever they are. Loads and divisions only leave blocks that run whenever the loop is entered,
+  # because they may fail in a loop that runs zero times; loads also need memory the loop leaves alone,
+  # with the same model as LocalValueNumbering: stores to fp slots hit one offset, other stores and calls
+  # hit everything that is not an fp slot.
+  #
+  # The preheader is the code right above the header label, so a loop is only touched when it is
+  # entered by falling into its header. Loops rotated by LoopRotation qualify, and since their body
+  # runs whenever they are entered, loads on its straight path to the bottom test can move too. Innermost loops are handled first, and the whole function is
+  # analysed again after each change so that code can keep moving out of enclosing loops.
+
+  SPECULATABLE = (Li, La, FImm, Mv, FMv, Neg, FNeg, Add, Addi, Sub, Mul, Slli, Srai, FAdd, FSub, FMul, Feq, Flt, Fle)
+
+  def __init__(self, isTemp: Callable[[str], bool]):
+    self.isTemp = isTemp
+
+  def run(self, code: InstructionList) -> InstructionList:
+    changed = True
+    while changed:
+      changed = False
+      cfg = ControlFlowGraph(code)
+      if len(cfg.blocks) == 0:
+        break
+      dominators = Dominators(cfg)
+      liveness = LiveVariables(cfg, self.isTemp)
+      for loop in NaturalLoops(cfg, dominators):
+        hoisted = self.hoist(cfg, loop, dominators, liveness)
+        if len(hoisted) > 0:
+          code = self.rewrite(cfg, loop, hoisted)
+          changed = True
+          break
+    return code
+
+  def hasPreheader(self, cfg: ControlFlowGraph, loop: Loop) -> bool:
+    # the only way in from outside is falling into the header label from the code above it;
+    # that code may end in a branch elsewhere (the guard of a rotated loop), since whatever is
+    # placed after the branch only runs on the way into the loop
+    header = loop.header
+    if not isinstance(header.instructions[0], Label) or header.index == 0:
+      return False
+    above = cfg.blocks[header.index - 1]
+    for pred in loop.outsidePredecessors():
+      last = pred.getLast()
+      if pred is not above or isinstance(last, J) or (isinstance(last, InstructionBranch) and last.label == header.getLabel()):
+        return False
+    return above in header.predecessors and above not in loop.blocks
+
+  def hoist(self, cfg: ControlFlowGraph, loop: Loop, dominators: Dominators, liveness: LiveVariables) -> List:
+    if not self.hasPreheader(cfg, loop):
+      return []
+
+    blocks = sorted(loop.blocks, key=lambda b: b.index)
+    defCounts: Dict[str, int] = {}
+    fpStores: Set[int] = set()
+    clobbersMemory = False
+    for block in blocks:
+      for inst in block.instructions:
+        for d in inst.getDests():
+          defCounts[d] = defCounts.get(d, 0) + 1
+        if isinstance(inst, (Sw, Fsw)):
+          if inst.src1 == 'fp':
+            fpStores.add(int(inst.label))
+          else:
+            clobbersMemory = True
+        if isinstance(inst, Jr):
+          clobbersMemory = True
+
+    liveAtHeader = liveness.universe.toSet(liveness.blockIn[loop.header.index])
+    exiting = loop.exiting()
+    alwaysRuns = set(b for b in blocks if all(dominators.dominates(b, e) for e in exiting))
+
+    invariant: List = []
+    marked: Set[int] = set()
+    progress = True
+    while progress:
+      progress = False
+      for block in blocks:
+        for inst in block.instructions:
+          if id(inst) in marked:
+            continue
+          if not self.isCandidate(inst, block in alwaysRuns, fpStores, clobbersMemory):
+            continue
+          dest = inst.dest
+          if not self.isTemp(dest) or defCounts.get(dest) != 1 or dest in liveAtHeader:
+            continue
+          if any(defCounts.get(s, 0) > 0 and not self.definedBy(s, invariant) for s in inst.getSources()):
+            continue
+          marked.add(id(inst))
+          invariant.append(inst)
+          progress = True
+    return invariant
+
+  @staticmethod
+  def definedBy(reg: str, instructions: List) -> bool:
+    return any(reg in inst.getDests() for inst in instructions)
+
+  def isCandidate(self, inst, alwaysRuns: bool, fpStores: Set[int], clobbersMemory: bool) -> bool:
+    if isinstance(inst, LoopInvariantCodeMotion.SPECULATABLE):
+      return True
+    if isinstance(inst, (Div, FDiv)):
+      return alwaysRuns
+    if isinstance(inst, (Lw, Flw)):
+      if not alwaysRuns:
+        return False
+      if inst.src1 == 'fp':
+        return int(inst.label) not in fpStores
+      return not clobbersMemory
+    return False
+
+  def rewrite(self, cfg: ControlFlowGraph, loop: Loop, hoisted: List) -> InstructionList:
+    moved = set(id(inst) for inst in hoisted)
+    code = InstructionList()
+    for block in cfg.blocks:
+      if block is loop.header:
+        code.extend(hoisted)
+      code.extend(inst for inst in block.instructions if id(inst) not in moved)
+    return code
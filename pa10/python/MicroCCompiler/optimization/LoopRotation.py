@@ -0,0 +1,87 @@
+import copy
+from typing import Callable, List
+
+from ..analysis import BasicBlock, ControlFlowGraph, Loop, NaturalLoops
+from ..assembly.InstructionList import InstructionList
+from ..assembly.instructions import *
+
+class LoopRotation:
+  # Turns a top-tested loop into a guarded bottom-tested one:
+  #
+  #   L: cond ; Bcc out ; body ; J L          L: cond ; Bcc out
+  #   out:                              =>    B: body ; cond ; B!cc B
+  #                                           out:
+  #
+  # The test at L now only runs once, as a guard, and each trip takes one branch instead of a
+  # branch and a jump. This applies to loops whose header is a single block of at most MAX_HEADER
+  # instructions ending in a branch that leaves the loop, reached again by a J from one latch.
+  # The copied condition writes the same temps as the original, which is fine after LVN.
+
+  MAX_HEADER = 12
+
+  REVERSED = {Beq: Bne, Bne: Beq, Blt: Bge, Bge: Blt, Bgt: Ble, Ble: Bgt}
+
+  def __init__(self, newLabel: Callable[[], str]):
+    self.newLabel = newLabel
+
+  def run(self, code: InstructionList) -> InstructionList:
+    changed = True
+    while changed:
+      changed = False
+      cfg = ControlFlowGraph(code)
+      if len(cfg.blocks) == 0:
+        break
+      for loop in NaturalLoops(cfg):
+        rotated = self.rotate(cfg, loop)
+        if rotated is not None:
+          code = rotated
+          changed = True
+          break
+    return code
+
+  def rotate(self, cfg: ControlFlowGraph, loop: Loop):
+    header = loop.header
+    branch = header.getLast()
+    label = header.getLabel()
+    if label is None or not isinstance(branch, InstructionBranch) or header.index + 1 >= len(cfg.blocks):
+      return None
+    if len(loop.latches) != 1 or len(header.instructions) > LoopRotation.MAX_HEADER:
+      return None
+    latch = loop.latches[0]
+    if latch is header or not (isinstance(latch.getLast(), J) and latch.getLast().label == label):
+      return None
+
+    taken = cfg.labels.get(branch.label)
+    following = cfg.blocks[header.index + 1]
+    if taken is None or (taken in loop.blocks) == (following in loop.blocks):
+      return None
+
+    # the bottom test branches back into the body and otherwise leaves for the exit
+    newLabels = {}
+    def labelOf(block: BasicBlock) -> str:
+      if block.getLabel() is not None:
+        return block.getLabel()
+      if block.index not in newLabels:
+        newLabels[block.index] = self.newLabel()
+      return newLabels[block.index]
+
+    if following in loop.blocks:
+      body, exit, test = following, taken, LoopRotation.REVERSED[type(branch)]
+    else:
+      body, exit, test = taken, following, type(branch)
+
+    bottom = [copy.deepcopy(inst) for inst in header.instructions[1:-1]]
+    bottom.append(test(branch.src1, branch.src2, labelOf(body)))
+    if latch.index + 1 >= len(cfg.blocks) or cfg.blocks[latch.index + 1] is not exit:
+      bottom.append(J(labelOf(exit)))
+
+    code = InstructionList()
+    for block in cfg.blocks:
+      if block.index in newLabels:
+        code.append(Label(newLabels[block.index]))
+      if block is latch:
+        code.extend(block.instructions[:-1])
+        code.extend(bottom)
+      else:
+        code.extend(block.instructions)
+    return code
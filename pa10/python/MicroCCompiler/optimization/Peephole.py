@@ -0,0 +1,239 @@
+from typing import Dict, List, Tuple, Union
+
+from ..assembly.InstructionList import InstructionList
+from ..assembly.instructions import *
+
+class Peephole:
+  # Rule-driven cleanup of generated code, applied until no rule fires.
+  #
+  # Window rules get `size` consecutive instructions and return their replacement,
+  # or None to leave them alone. Code rules get the whole list and return a rewritten
+  # list, or None if nothing changed. Adding a rule means writing the method and listing it here.
+
+  MAX_IMMEDIATE = 2047
+
+  def __init__(self):
+    self.windowRules = [
+      (1, self.dropZeroAdjust),
+      (2, self.mergeSpAdjust),
+      (2, self.sinkSpAdjust),
+      (2, self.dropJumpToNext),
+      (2, self.dropOverwritten),
+    ]
+    self.codeRules = [
+      self.forwardFrameLoads,
+      self.dropRedundantLa,
+      self.dropDeadLi,
+    ]
+
+  def run(self, code: InstructionList) -> InstructionList:
+    changed = True
+    while changed:
+      changed = False
+      for size, rule in self.windowRules:
+        rewritten = self.applyWindowRule(code, size, rule)
+        if rewritten is not None:
+          code = rewritten
+          changed = True
+      for rule in self.codeRules:
+        rewritten = rule(code)
+        if rewritten is not None:
+          code = rewritten
+          changed = True
+    return code
+
+  def applyWindowRule(self, code: InstructionList, size: int, rule) -> Union[InstructionList, None]:
+    out = InstructionList()
+    changed = False
+    i = 0
+    while i < len(code):
+      replacement = rule(code[i:i + size]) if i + size <= len(code) else None
+      if replacement is None:
+        out.append(code[i])
+        i += 1
+      else:
+        out.extend(replacement)
+        i += size
+        changed = True
+    return out if changed else None
+
+  #### helpers ####
+
+  @staticmethod
+  def isSpAdjust(inst) -> bool:
+    return isinstance(inst, Addi) and inst.src1 == "sp" and inst.dest == "sp"
+
+  @staticmethod
+  def endsFacts(inst) -> bool:
+    # points where values known to be in registers can no longer be trusted:
+    # a label can be reached from elsewhere, and a call or jump leaves the straight-line code
+    return isinstance(inst, (Label, Blank, J, Jr, Ret, Halt))
+
+  @staticmethod
+  def defCounts(code: InstructionList) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for inst in code:
+      for d in inst.getDests():
+        counts[d] = counts.get(d, 0) + 1
+    return counts
+
+  #### window rules ####
+
+  def dropZeroAdjust(self, window):
+    # ADDI r, r, 0
+    inst = window[0]
+    if isinstance(inst, Addi) and inst.src1 == inst.dest and int(inst.src2) == 0:
+      return []
+    return None
+
+  def mergeSpAdjust(self, window):
+    # ADDI sp, sp, a ; ADDI sp, sp, b  =>  ADDI sp, sp, a+b
+    first, second = window
+    if not (self.isSpAdjust(first) and self.isSpAdjust(second)):
+      return None
+    total = int(first.src2) + int(second.src2)
+    if abs(total) > Peephole.MAX_IMMEDIATE:
+      return None
+    return [Addi("sp", str(total), "sp")] if total != 0 else []
+
+  def sinkSpAdjust(self, window):
+    # ADDI sp, sp, k ; SW r, o(sp)  =>  SW r, o+k(sp) ; ADDI sp, sp, k
+    # moves pushes and pops together so their sp adjustments can merge
+    adjust, mem = window
+    if not (self.isSpAdjust(adjust) and isinstance(mem, InstructionLS) and mem.src1 == "sp" and mem.dest != "sp"):
+      return None
+    offset = int(mem.label) + int(adjust.src2)
+    if abs(offset) > Peephole.MAX_IMMEDIATE:
+      return None
+    return [type(mem)(mem.dest, "sp", str(offset)), adjust]
+
+  def dropJumpToNext(self, window):
+    # J L ; L:  =>  L:
+    jump, label = window
+    if isinstance(jump, J) and isinstance(label, Label) and jump.label == label.label:
+      return [label]
+    return None
+
+  def dropOverwritten(self, window):
+    # ADDI sp, sp, 8 ; MV sp, fp  =>  MV sp, fp
+    # a side-effect-free write whose register is overwritten by the next instruction without being read
+    first, second = window
+    if not isinstance(first, (Addi, Li, La, Mv, FMv, FImm)):
+      return None
+    dests = first.getDests()
+    if len(dests) == 1 and dests[0] in second.getDests() and dests[0] not in second.getSources() and not isinstance(second, Jr):
+      return [second]
+    return None
+
+  #### code rules ####
+
+  def forwardFrameLoads(self, code: InstructionList) -> Union[InstructionList, None]:
+    # SW r, o(fp) ... LW r2, o(fp)  =>  SW r, o(fp) ... MV r2, r
+    # as long as r and the slot are unchanged in between; the same goes for a repeated load
+    out = InstructionList()
+    changed = False
+    slots: Dict[int, Tuple[str, bool]] = {} # fp offset -> (register holding it, is float)
+
+    for inst in code:
+      if self.endsFacts(inst):
+        slots = {}
+        out.append(inst)
+        continue
+
+      if isinstance(inst, (Lw, Flw)) and inst.src1 == "fp" and inst.dest != "fp":
+        isFloat = isinstance(inst, Flw)
+        known = slots.get(int(inst.label))
+        if known is not None and known[1] == isFloat:
+          changed = True
+          if known[0] != inst.dest:
+            inst = FMv(known[0], inst.dest) if isFloat else Mv(known[0], inst.dest)
+            out.append(inst)
+          self.forgetRegister(slots, inst.dest, known[0])
+          continue
+
+      if isinstance(inst, (Sw, Fsw)):
+        if inst.src1 == "fp":
+          slots.pop(int(inst.label), None)
+        else:
+          # a store through another base could reach any slot
+          slots = {}
+
+      for d in inst.getDests():
+        self.forgetRegister(slots, d)
+        if d == "fp":
+          slots = {}
+
+      if isinstance(inst, (Sw, Fsw, Lw, Flw)) and inst.src1 == "fp" and inst.dest != "fp":
+        slots[int(inst.label)] = (inst.dest, isinstance(inst, (Fsw, Flw)))
+
+      out.append(inst)
+
+    return out if changed else None
+
+  @staticmethod
+  def forgetRegister(slots, reg: str, keep: str = None):
+    # reg was overwritten: slots it held are no longer known, unless it was just given the same value
+    for offset in [o for o, (r, _) in slots.items() if r == reg and r != keep]:
+      del slots[offset]
+
+  def dropRedundantLa(self, code: InstructionList) -> Union[InstructionList, None]:
+    # LA r, X ... LA r, X  =>  LA r, X  when r still holds X.
+    # When another register still holds X and both registers are written exactly once,
+    # the second LA goes away and its register is renamed to the first.
+    counts = self.defCounts(code)
+    addresses: Dict[str, str] = {} # address -> register holding it
+    out = InstructionList()
+    changed = False
+
+    for inst in code:
+      if self.endsFacts(inst):
+        addresses = {}
+        out.append(inst)
+        continue
+
+      if isinstance(inst, La):
+        holder = addresses.get(inst.label)
+        if holder == inst.dest:
+          changed = True
+          continue
+        if holder is not None and counts.get(holder) == 1 and counts.get(inst.dest) == 1:
+          mapping = {inst.dest: holder}
+          for other in code:
+            other.renameRegisters(mapping)
+          changed = True
+          continue
+
+      for d in inst.getDests():
+        for addr in [a for a, r in addresses.items() if r == d]:
+          del addresses[addr]
+
+      if isinstance(inst, La):
+        addresses[inst.label] = inst.dest
+
+      out.append(inst)
+
+    return out if changed else None
+
+  def dropDeadLi(self, code: InstructionList) -> Union[InstructionList, None]:
+    # LI r, k whose value is never read: r is read nowhere, or is overwritten before any read
+    read = set()
+    for inst in code:
+      read.update(inst.getSources())
+
+    out = InstructionList()
+    changed = False
+    for i, inst in enumerate(code):
+      if isinstance(inst, Li) and (inst.dest not in read or self.overwrittenBeforeRead(code, i)):
+        changed = True
+        continue
+      out.append(inst)
+    return out if changed else None
+
+  def overwrittenBeforeRead(self, code: InstructionList, i: int) -> bool:
+    reg = code[i].dest
+    for inst in code[i + 1:]:
+      if reg in inst.getSources() or isinstance(inst, (Label, InstructionBranch, J, Jr, Ret, Halt, Blank)):
+        return False
+      if reg in inst.getDests():
+        return True
+    return False
@@ -0,0 +1,146 @@
+from typing import Dict, List, Set, Tuple
+
+from ..ir import *
+from .Arithmetic import Arithmetic
+
+class SparseConstantPropagation:
+  # Sparse conditional constant propagation (Wegman and Zadeck) over an IRFunction.
+  # Values start at TOP (no information yet) and only move down to a constant and then to BOTTOM;
+  # blocks start unreachable and only become reachable along edges whose branch can go that way.
+  # Afterwards constant values are replaced by Constants, decided branches become jumps and
+  # blocks that were never reached are deleted.
+
+  TOP = 'top'
+  BOTTOM = 'bottom'
+
+  def __init__(self):
+    self.lattice: Dict[Value, object] = {}
+    self.executableEdges: Set[Tuple[IRBlock, IRBlock]] = set()
+    self.executableBlocks: Set[IRBlock] = set()
+
+  def run(self, function: IRFunction) -> IRFunction:
+    self.solve(function)
+    self.rewrite(function)
+    return function
+
+  #### lattice ####
+
+  def get(self, value: Value):
+    if value.isConstant():
+      return value
+    return self.lattice.get(value, SparseConstantPropagation.TOP)
+
+  @staticmethod
+  def isConstant(state) -> bool:
+    return isinstance(state, Constant)
+
+  @staticmethod
+  def same(a, b) -> bool:
+    if isinstance(a, Constant) and isinstance(b, Constant):
+      return a.type == b.type and type(a.value) is type(b.value) and a.value == b.value
+    return a is b
+
+  def meet(self, a, b):
+    if a is SparseConstantPropagation.TOP:
+      return b
+    if b is SparseConstantPropagation.TOP:
+      return a
+    return a if self.same(a, b) else SparseConstantPropagation.BOTTOM
+
+  #### solving ####
+
+  def solve(self, function: IRFunction):
+    flowWork: List[Tuple[IRBlock, IRBlock]] = [(None, function.getEntry())]
+    ssaWork: List[IRInstruction] = []
+
+    while len(flowWork) > 0 or len(ssaWork) > 0:
+      while len(flowWork) > 0:
+        edge = flowWork.pop()
+        if edge in self.executableEdges:
+          continue
+        self.executableEdges.add(edge)
+        block = edge[1]
+        firstVisit = block not in self.executableBlocks
+        self.executableBlocks.add(block)
+        for inst in (block.phis + block.instructions) if firstVisit else block.phis:
+          self.visit(inst, flowWork, ssaWork)
+
+      while len(ssaWork) > 0:
+        inst = ssaWork.pop()
+        if inst.block in self.executableBlocks:
+          self.visit(inst, flowWork, ssaWork)
+
+  def visit(self, inst: IRInstruction, flowWork, ssaWork):
+    if isinstance(inst, Jump):
+      flowWork.append((inst.block, inst.target))
+      return
+    if isinstance(inst, Branch):
+      for target in self.branchTargets(inst):
+        flowWork.append((inst.block, target))
+      return
+
+    new = self.evaluate(inst)
+    old = self.get(inst)
+    if not self.same(old, new):
+      self.lattice[inst] = new
+      ssaWork.extend(inst.users)
+
+  def evaluate(self, inst: IRInstruction):
+    TOP, BOTTOM = SparseConstantPropagation.TOP, SparseConstantPropagation.BOTTOM
+    if isinstance(inst, Phi):
+      state = TOP
+      for value, pred in zip(inst.operands, inst.incoming):
+        if (pred, inst.block) in self.executableEdges:
+          state = self.meet(state, self.get(value))
+      return state
+
+    if isinstance(inst, (BinaryOp, Neg)):
+      states = [self.get(op) for op in inst.operands]
+      if any(s is BOTTOM for s in states):
+        return BOTTOM
+      if any(s is TOP for s in states):
+        return TOP
+      if isinstance(inst, Neg):
+        result = Arithmetic.negate(inst.type, states[0].value)
+      else:
+        result = Arithmetic.binary(inst.op, inst.type, states[0].value, states[1].value)
+      return BOTTOM if result is None else Constant(result, inst.type)
+
+    # parameters, loads, reads and calls are only known at run time
+    return BOTTOM
+
+  def branchTargets(self, inst: Branch) -> List[IRBlock]:
+    left, right = self.get(inst.operands[0]), self.get(inst.operands[1])
+    if left is SparseConstantPropagation.TOP or right is SparseConstantPropagation.TOP:
+      return []
+    if self.isConstant(left) and self.isConstant(right):
+      return [inst.ifTrue if Arithmetic.compare(inst.op, left.value, right.value) else inst.ifFalse]
+    return [inst.ifTrue, inst.ifFalse]
+
+  #### rewriting ####
+
+  def rewrite(self, function: IRFunction):
+    for block in function.blocks:
+      if block not in self.executableBlocks:
+        continue
+      for inst in list(block.phis + block.instructions):
+        state = self.get(inst)
+        if self.isConstant(state) and not inst.hasSideEffects():
+          inst.replaceAllUsesWith(Constant(state.value, state.type))
+          block.remove(inst)
+
+      term = block.getTerminator()
+      if isinstance(term, Branch):
+        taken = [t for t in term.getTargets() if (block, t) in self.executableEdges]
+        if len(taken) == 1:
+          block.replaceTerminator(Jump(taken[0]))
+
+    # phis lose the incoming edges that can never be taken
+    for block in function.blocks:
+      for phi in block.phis:
+        for pred in list(phi.incoming):
+          if (pred, block) not in self.executableEdges:
+            phi.removeIncoming(pred)
+
+    function.removeUnreachable()
+    function.simplifyPhis()
@@ -0,0 +1,108 @@
+from typing import Callable, Dict, List, Union
+
+from ..assembly.InstructionList import InstructionList
+from ..assembly.instructions import *
+from ..compiler import *
+from ..ir.Constant import Constant
+from .Peephole import Peephole
+
+class StrengthReduction:
+  # Instruction selection for integer MUL and DIV by a constant, before register allocation.
+  # A constant operand is a temp written once, by an LI.
+  #
+  #   x * 2^n      =>  SLLI d, x, n
+  #   x * (2^n+1)  =>  SLLI s, x, n ; ADD d, s, x
+  #   x * (2^n-1)  =>  SLLI s, x, n ; SUB d, s, x
+  #   x / 2^n      =>  SRAI d, x, n
+  #
+  # with a NEG for negative constants. DIV floors in the simulator, like an arithmetic shift,
+  # so division by a power of two needs no rounding fixup. MUL costs 3 cycles and DIV 4 against
+  # 1 for each of these, so a MUL is only replaced by at most MAX_SEQUENCE instructions.
+  # The LI of a constant that is no longer read goes away.
+  #
+  # The simulator takes shift amounts mod 32 while its registers hold any integer, so a constant
+  # that would need a shift by more than MAX_SHIFT keeps its MUL or DIV.
+
+  MAX_SEQUENCE = 2
+  MAX_SHIFT = 31
+
+  def __init__(self, isTemp: Callable[[str], bool], newTemp: Callable[[Scope.Type], str]):
+    self.isTemp = isTemp
+    self.newTemp = newTemp
+
+  def run(self, code: InstructionList) -> InstructionList:
+    constants = self.constants(code)
+    out = InstructionList()
+    replaced = set()
+    for inst in code:
+      sequence = None
+      if isinstance(inst, Mul):
+        if inst.src2 in constants:
+          sequence = self.multiply(inst.src1, constants[inst.src2], inst.dest)
+        if sequence is None and inst.src1 in constants:
+          sequence = self.multiply(inst.src2, constants[inst.src1], inst.dest)
+      elif isinstance(inst, Div) and inst.src2 in constants:
+        sequence = self.divide(inst.src1, constants[inst.src2], inst.dest)
+
+      if sequence is None:
+        out.append(inst)
+      else:
+        out.extend(sequence)
+        replaced.add(inst.dest)
+
+    if len(replaced) == 0:
+      return code
+
+    read = set()
+    for inst in out:
+      read.update(inst.getSources())
+    return InstructionList([inst for inst in out if not (isinstance(inst, Li) and inst.dest in constants and inst.dest not in read)])
+
+  def constants(self, code: InstructionList) -> Dict[str, int]:
+    counts = Peephole.defCounts(code)
+    return {inst.dest: Constant.fromLiteral(inst.label, Scope.Type.INT).value
+            for inst in code if isinstance(inst, Li) and self.isTemp(inst.dest) and counts[inst.dest] == 1}
+
+  @staticmethod
+  def log2(k: int) -> Union[int, None]:
+    # n <= MAX_SHIFT with 2^n == k, or None
+    if k > 0 and k & (k - 1) == 0 and k.bit_length() - 1 <= StrengthReduction.MAX_SHIFT:
+      return k.bit_length() - 1
+    return None
+
+  def multiply(self, x: str, k: int, dest: str) -> Union[List[Instruction], None]:
+    if k == 0:
+      return [Li(dest, "0")]
+    m = abs(k)
+    target = dest if k > 0 else self.newTemp(Scope.Type.INT)
+    if m == 1:
+      sequence = [Mv(x, target)]
+    elif self.log2(m) is not None:
+      sequence = [Slli(x, str(self.log2(m)), target)]
+    elif self.log2(m - 1) is not None:
+      shifted = self.newTemp(Scope.Type.INT)
+      sequence = [Slli(x, str(self.log2(m - 1)), shifted), Add(shifted, x, target)]
+    elif self.log2(m + 1) is not None:
+      shifted = self.newTemp(Scope.Type.INT)
+      sequence = [Slli(x, str(self.log2(m + 1)), shifted), Sub(shifted, x, target)]
+    else:
+      return None
+    if k < 0:
+      sequence.append(Neg(target, dest))
+    return sequence if len(sequence) <= StrengthReduction.MAX_SEQUENCE else None
+
+  def divide(self, x: str, k: int, dest: str) -> Union[List[Instruction], None]:
+    # floor(x / -m) == floor(-x / m)
+    n = self.log2(abs(k))
+    if n is None:
+      return None
+    sequence = []
+    if k < 0:
+      negated = self.newTemp(Scope.Type.INT) if n > 0 else dest
+      sequence.append(Neg(x, negated))
+      x = negated
+    if n > 0:
+      sequence.append(Srai(x, str(n), dest))
+    elif k > 0:
+      sequence.append(Mv(x, dest))
+    return sequence
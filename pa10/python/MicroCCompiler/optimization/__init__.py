@@ -0,0 +1,11 @@
+from .Peephole import Peephole
+from .Arithmetic import Arithmetic
+from .SparseConstantPropagation import SparseConstantPropagation
+from .AggressiveDeadCodeElimination import AggressiveDeadCodeElimination
+from .LocalValueNumbering import LocalValueNumbering
+from .LoopInvariantCodeMotion import LoopInvariantCodeMotion
+from .LoopRotation import LoopRotation
+from .InductionVariables import InductionVariables
+from .StrengthReduction import StrengthReduction
+from .ListScheduler import ListScheduler
+from .DeadStoreElimination import DeadStoreElimination
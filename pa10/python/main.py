@@ -1,4 +1,7 @@
 import MicroCCompiler.compiler.Compiler
+from MicroCCompiler.compiler.Options import Options
 import sys
 
-MicroCCompiler.compiler.Compiler.main(sys.argv[1])
+# usage: main.py [-O] [-f<flag> | -fno-<flag>]... file.uC
+options, args = Options.parse(sys.argv[1:])
+MicroCCompiler.compiler.Compiler.main(args[0], options)